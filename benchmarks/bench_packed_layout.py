@@ -0,0 +1,79 @@
+"""
+Compare the per-cell and the packed layouts of `encrypt_csv_file` on a wide
+table: encryption and decryption rows/s and encrypted bytes per row.
+
+    python benchmarks/bench_packed_layout.py --rows 20000 --pii-columns 12
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+
+
+def make_inputs(directory: str, rows: int, pii_columns: int):
+    names = [f"pii_{i:02d}" for i in range(pii_columns)]
+    config = os.path.join(directory, "provider.json")
+    with open(config, "w") as f:
+        json.dump(
+            {
+                "key_source": os.path.join(directory, "keys.json"),
+                "fields": {name: {"alias": [name]} for name in names},
+            },
+            f,
+        )
+    source = os.path.join(directory, "input.csv")
+    with open(source, "w") as f:
+        f.write(",".join(["id", *names, "notes"]) + "\n")
+        for i in range(rows):
+            cells = [f"value {j} of row {i}" for j in range(pii_columns)]
+            f.write(",".join([str(i), *cells, "x" * 20]) + "\n")
+    return config, source
+
+
+def bytes_per_row(path: str, rows: int) -> float:
+    with open(path, "rb") as f:
+        header = len(f.readline())
+    return (os.path.getsize(path) - header) / rows
+
+
+def run(source, directory, config, rows, packed):
+    encrypted = os.path.join(directory, "output.enc.csv")
+    decrypted = os.path.join(directory, "output.dec.csv")
+    start = time.perf_counter()
+    encrypt_csv_file(source, encrypted, "local", config, packed=packed)
+    encrypt_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    decrypt_csv_file(encrypted, decrypted, "local", config)
+    decrypt_seconds = time.perf_counter() - start
+    return {
+        "encrypt rows/s": rows / encrypt_seconds,
+        "decrypt rows/s": rows / decrypt_seconds,
+        "bytes/row": bytes_per_row(encrypted, rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--pii-columns", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config, source = make_inputs(directory, args.rows, args.pii_columns)
+        print(f"  input: {bytes_per_row(source, args.rows):8.1f} bytes/row")
+        for name, packed in (("cell", False), ("packed", True)):
+            result = run(source, directory, config, args.rows, packed)
+            print(
+                f"{name:>7}: {result['encrypt rows/s']:10.0f} encrypt rows/s"
+                f"  {result['decrypt rows/s']:10.0f} decrypt rows/s"
+                f"  {result['bytes/row']:8.1f} bytes/row"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Compare the row loop and the pipelined mode of `encrypt_csv_file` on
+simulated slow storage.
+
+Reads and writes go through a file wrapper that sleeps for a fixed latency
+plus size / bandwidth per 64 KiB chunk, like a network filesystem would.
+
+    python benchmarks/bench_pipeline.py --rows 200000 --bandwidth-mb 20
+"""
+
+import argparse
+import builtins
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from piicrypto.encrypt_decrypt import encryptor
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ThrottledFile:
+    """
+    Binary file wrapper charging latency + size / bandwidth per 64 KiB chunk.
+    Reads go through a chunk buffer, like a network filesystem client.
+    """
+
+    def __init__(self, raw, latency: float, bandwidth: float):
+        self.raw = raw
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.pending = 0
+        self.buffer = b""
+
+    def _charge(self, size: int):
+        time.sleep(self.latency + size / self.bandwidth)
+
+    def _fill(self) -> bool:
+        chunk = self.raw.read(CHUNK_SIZE)
+        if chunk:
+            self._charge(len(chunk))
+            self.buffer += chunk
+        return bool(chunk)
+
+    def read(self, size: int = -1) -> bytes:
+        while (size < 0 or len(self.buffer) < size) and self._fill():
+            pass
+        size = len(self.buffer) if size < 0 else size
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def readline(self) -> bytes:
+        while b"\n" not in self.buffer and self._fill():
+            pass
+        end = self.buffer.find(b"\n") + 1 or len(self.buffer)
+        line, self.buffer = self.buffer[:end], self.buffer[end:]
+        return line
+
+    def tell(self) -> int:
+        return self.raw.tell() - len(self.buffer)
+
+    def seek(self, offset: int):
+        self.buffer = b""
+        return self.raw.seek(offset)
+
+    def write(self, data: bytes):
+        self.pending += len(data)
+        while self.pending >= CHUNK_SIZE:
+            self._charge(CHUNK_SIZE)
+            self.pending -= CHUNK_SIZE
+        return self.raw.write(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.pending:
+            self._charge(self.pending)
+        self.raw.close()
+
+
+def make_inputs(directory: str, rows: int):
+    config = os.path.join(directory, "provider.json")
+    with open(config, "w") as f:
+        json.dump(
+            {
+                "key_source": os.path.join(directory, "keys.json"),
+                "fields": {
+                    "name": {"alias": ["name"], "encrypt": True},
+                    "ssn": {"alias": ["ssn"], "encrypt": True},
+                    "address": {"alias": ["address"], "encrypt": True},
+                },
+            },
+            f,
+        )
+    source = os.path.join(directory, "input.csv")
+    with open(source, "w") as f:
+        f.write("id,name,ssn,address,notes\n")
+        for i in range(rows):
+            f.write(f"{i},Person {i},{i % 1000:03d}-12-3456,{i} Main St,{'x' * 40}\n")
+    return config, source
+
+
+def run(source, output, config, latency, bandwidth, **options):
+    real_open = builtins.open
+
+    def throttled_open(path, *args, **kwargs):
+        raw = real_open(path, *args, **kwargs)
+        if path in (source, output):
+            return ThrottledFile(raw, latency, bandwidth)
+        return raw
+
+    with mock.patch.object(builtins, "open", throttled_open):
+        start = time.perf_counter()
+        encryptor.encrypt_csv_file(source, output, "local", config, **options)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--bandwidth-mb", type=float, default=20.0)
+    parser.add_argument("--block-size", type=int, default=1024)
+    parser.add_argument("--queue-depth", type=int, default=4)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    bandwidth = args.bandwidth_mb * 1024 * 1024
+    with tempfile.TemporaryDirectory() as directory:
+        config, source = make_inputs(directory, args.rows)
+        output = os.path.join(directory, "output.csv")
+        results = {
+            "loop": run(source, output, config, latency, bandwidth),
+            "pipeline": run(
+                source,
+                output,
+                config,
+                latency,
+                bandwidth,
+                pipeline=True,
+                block_size=args.block_size,
+                queue_depth=args.queue_depth,
+            ),
+        }
+    for name, seconds in results.items():
+        print(f"{name:>10}: {seconds:8.2f}s  {args.rows / seconds:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
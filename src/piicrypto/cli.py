@@ -1,7 +1,30 @@
+from typing import List
+
 import typer
 
-from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file, decrypt_data
+from piicrypto.encrypt_decrypt.arrow_crypto import (
+    decrypt_arrow_file,
+    decrypt_parquet_file,
+    encrypt_arrow_file,
+    encrypt_parquet_file,
+)
+from piicrypto.encrypt_decrypt.decryptor import (
+    decrypt_csv_file,
+    decrypt_csv_rows,
+    decrypt_data,
+)
 from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file, encrypt_data
+from piicrypto.encrypt_decrypt.json_crypto import (
+    decrypt_jsonl_file,
+    encrypt_jsonl_file,
+)
+from piicrypto.encrypt_decrypt.sqlite_crypto import (
+    decrypt_sqlite_table,
+    encrypt_sqlite_table,
+)
+from piicrypto.encrypt_decrypt.searcher import search_csv_file
+from piicrypto.encrypt_decrypt.verifier import verify_csv_file
+from piicrypto.helpers.integrity import compare_metadata
 from piicrypto.helpers.logger_helper import setup_logger
 from piicrypto.key_provider.key_manager import KeyManager
 
@@ -12,6 +35,16 @@ csv_app = typer.Typer()
 app.add_typer(csv_app, name="csv")
 data_app = typer.Typer()
 app.add_typer(data_app, name="data")
+parquet_app = typer.Typer()
+app.add_typer(parquet_app, name="parquet")
+arrow_app = typer.Typer()
+app.add_typer(arrow_app, name="arrow")
+metadata_app = typer.Typer()
+app.add_typer(metadata_app, name="metadata")
+jsonl_app = typer.Typer()
+app.add_typer(jsonl_app, name="jsonl")
+sqlite_app = typer.Typer()
+app.add_typer(sqlite_app, name="sqlite")
 
 logger = None
 
@@ -92,6 +125,60 @@ def encrypt_csv_command(
     validate_json: str = typer.Option(
         None, help="Generate metadata for the keys and output file."
     ),
+    nonce_scheme: str = typer.Option(
+        "random", help="Per-row nonce scheme: 'random' or 'counter'."
+    ),
+    quarantine_file: str = typer.Option(
+        None,
+        help="Write rows failing validation to this CSV or JSONL sidecar.",
+    ),
+    quarantine_rows: bool = typer.Option(
+        False,
+        help="Also copy the rejected rows, unencrypted, into the quarantine file.",
+    ),
+    pipeline: bool = typer.Option(
+        False, help="Overlap reading, encryption and writing in separate stages."
+    ),
+    block_size: int = typer.Option(
+        1024, help="Rows per block for validation and the pipeline stages."
+    ),
+    queue_depth: int = typer.Option(
+        4, help="Maximum blocks buffered between pipeline stages."
+    ),
+    incremental: bool = typer.Option(
+        False, help="Only encrypt rows appended since the last incremental run."
+    ),
+    shards: int = typer.Option(
+        None, help="Split the output into this many shards of similar input size."
+    ),
+    max_rows_per_shard: int = typer.Option(
+        None, help="Start a new output shard after this many rows."
+    ),
+    max_bytes_per_shard: int = typer.Option(
+        None, help="Start a new output shard before exceeding this many bytes."
+    ),
+    dialect: str = typer.Option(
+        "auto",
+        help="'auto' (detect), 'csv', 'tsv', 'pipe', 'semicolon' or a delimiter.",
+    ),
+    fixed_width_spec: str = typer.Option(
+        None, help="JSON column layout of a fixed-width input file."
+    ),
+    profile_memory: bool = typer.Option(
+        False, help="Record tracemalloc samples and peak RSS in the metadata."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+    packed: bool = typer.Option(
+        False, help="Seal the fields of each key group together, once per row."
+    ),
+    index: bool = typer.Option(
+        False, help="Write a row index sidecar (<output>.index.sqlite)."
+    ),
+    index_id_column: str = typer.Option(
+        None, help="Also index rows by this plain column (implies --index)."
+    ),
 ):
     """
     Encrypt specified fields in a CSV file using AES encryption.
@@ -104,6 +191,23 @@ def encrypt_csv_command(
         config_file,
         create_metadata,
         validate_json=validate_json,
+        nonce_scheme=nonce_scheme,
+        quarantine_file=quarantine_file,
+        quarantine_rows=quarantine_rows,
+        pipeline=pipeline,
+        block_size=block_size,
+        queue_depth=queue_depth,
+        incremental=incremental,
+        shards=shards,
+        max_rows_per_shard=max_rows_per_shard,
+        max_bytes_per_shard=max_bytes_per_shard,
+        dialect=dialect,
+        fixed_width_spec=fixed_width_spec,
+        profile_memory=profile_memory,
+        cipher_backend=cipher_backend,
+        packed=packed,
+        index=index,
+        index_id_column=index_id_column,
     )
 
 
@@ -116,12 +220,396 @@ def decrypt_csv_command(
     create_metadata: bool = typer.Option(
         False, help="Generate metadata for the keys and output file."
     ),
+    dialect: str = typer.Option(
+        "auto",
+        help="'auto' (detect), 'csv', 'tsv', 'pipe', 'semicolon' or a delimiter.",
+    ),
+    fixed_width_spec: str = typer.Option(
+        None, help="Layout file (<output>.layout.json) of a fixed-width input."
+    ),
+    profile_memory: bool = typer.Option(
+        False, help="Record tracemalloc samples and peak RSS in the metadata."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+    rows: List[int] = typer.Option(
+        None, help="Only decrypt these 0-based input rows, using the row index."
+    ),
+    ids: List[str] = typer.Option(
+        None, help="Only decrypt the rows with these IDs, using the row index."
+    ),
+    index_file: str = typer.Option(
+        None, help="Row index to use (default: <input>.index.sqlite)."
+    ),
 ):
     """
     Decrypt specified fields in a CSV file using AES decryption.
     """
 
-    decrypt_csv_file(input_file, output_file, mode, config_file, create_metadata)
+    if rows or ids:
+        decrypt_csv_rows(
+            input_file,
+            output_file,
+            mode,
+            config_file,
+            rows=rows,
+            ids=ids,
+            index_file=index_file,
+            dialect=dialect,
+            fixed_width_spec=fixed_width_spec,
+            cipher_backend=cipher_backend,
+        )
+        return
+    decrypt_csv_file(
+        input_file,
+        output_file,
+        mode,
+        config_file,
+        create_metadata,
+        dialect=dialect,
+        fixed_width_spec=fixed_width_spec,
+        profile_memory=profile_memory,
+        cipher_backend=cipher_backend,
+    )
+
+
+@csv_app.command("verify")
+def verify_csv_command(
+    input_file: str = typer.Option(..., help="Path to the encrypted CSV file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    report_file: str = typer.Option(
+        None, help="Write failures (row, column, key version, error) to this CSV."
+    ),
+    workers: int = typer.Option(1, help="Number of worker processes."),
+    block_size: int = typer.Option(1024, help="Rows per verification task."),
+    dialect: str = typer.Option(
+        "auto",
+        help="'auto' (detect), 'csv', 'tsv', 'pipe', 'semicolon' or a delimiter.",
+    ),
+    fixed_width_spec: str = typer.Option(
+        None, help="Layout file (<output>.layout.json) of a fixed-width input."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+):
+    """
+    Verify the AES-GCM tags of every encrypted cell without writing plaintext.
+    """
+    summary = verify_csv_file(
+        input_file,
+        mode,
+        config_file,
+        report_file=report_file,
+        workers=workers,
+        block_size=block_size,
+        dialect=dialect,
+        fixed_width_spec=fixed_width_spec,
+        cipher_backend=cipher_backend,
+    )
+    typer.echo(
+        f"Verified {summary['cells']} cells in {summary['rows']} rows: "
+        f"{summary['failures']} failures"
+    )
+    if summary["failures"]:
+        raise typer.Exit(code=1)
+
+
+@csv_app.command("search")
+def search_csv_command(
+    input_file: str = typer.Option(..., help="Path to the encrypted CSV file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    column: str = typer.Option(..., help="Encrypted column with a blind index."),
+    value: str = typer.Option(..., help="Plaintext value to look for."),
+    output_file: str = typer.Option(
+        None, help="Decrypt the matching rows into this CSV file."
+    ),
+    dialect: str = typer.Option(
+        "auto",
+        help="'auto' (detect), 'csv', 'tsv', 'pipe', 'semicolon' or a delimiter.",
+    ),
+    fixed_width_spec: str = typer.Option(
+        None, help="Layout file (<output>.layout.json) of a fixed-width input."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+):
+    """
+    Find rows by the value of an encrypted column through its blind index.
+    """
+    matches = search_csv_file(
+        input_file,
+        mode,
+        config_file,
+        column,
+        value,
+        output_file=output_file,
+        dialect=dialect,
+        fixed_width_spec=fixed_width_spec,
+        cipher_backend=cipher_backend,
+    )
+    typer.echo(f"{len(matches)} matching rows: {' '.join(map(str, matches))}")
+
+
+@parquet_app.command("encrypt")
+def encrypt_parquet_command(
+    input_file: str = typer.Option(..., help="Path to the input Parquet file."),
+    output_file: str = typer.Option(..., help="Path to the output Parquet file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output file."
+    ),
+    batch_size: int = typer.Option(
+        65536, help="Maximum number of rows encrypted per record batch."
+    ),
+    nonce_scheme: str = typer.Option(
+        "random", help="Per-row nonce scheme: 'random' or 'counter'."
+    ),
+):
+    """
+    Encrypt specified columns in a Parquet file using AES encryption.
+    """
+
+    encrypt_parquet_file(
+        input_file,
+        output_file,
+        mode,
+        config_file,
+        create_metadata,
+        batch_size=batch_size,
+        nonce_scheme=nonce_scheme,
+    )
+
+
+@parquet_app.command("decrypt")
+def decrypt_parquet_command(
+    input_file: str = typer.Option(..., help="Path to the input Parquet file."),
+    output_file: str = typer.Option(..., help="Path to the output Parquet file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output file."
+    ),
+    batch_size: int = typer.Option(
+        65536, help="Maximum number of rows decrypted per record batch."
+    ),
+):
+    """
+    Decrypt specified columns in a Parquet file using AES decryption.
+    """
+
+    decrypt_parquet_file(
+        input_file,
+        output_file,
+        mode,
+        config_file,
+        create_metadata,
+        batch_size=batch_size,
+    )
+
+
+@arrow_app.command("encrypt")
+def encrypt_arrow_command(
+    input_file: str = typer.Option(..., help="Path to the input Arrow IPC file."),
+    output_file: str = typer.Option(..., help="Path to the output Arrow IPC file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output file."
+    ),
+    nonce_scheme: str = typer.Option(
+        "random", help="Per-row nonce scheme: 'random' or 'counter'."
+    ),
+):
+    """
+    Encrypt specified columns in an Arrow IPC file using AES encryption.
+    """
+
+    encrypt_arrow_file(
+        input_file,
+        output_file,
+        mode,
+        config_file,
+        create_metadata,
+        nonce_scheme=nonce_scheme,
+    )
+
+
+@arrow_app.command("decrypt")
+def decrypt_arrow_command(
+    input_file: str = typer.Option(..., help="Path to the input Arrow IPC file."),
+    output_file: str = typer.Option(..., help="Path to the output Arrow IPC file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output file."
+    ),
+):
+    """
+    Decrypt specified columns in an Arrow IPC file using AES decryption.
+    """
+
+    decrypt_arrow_file(input_file, output_file, mode, config_file, create_metadata)
+
+
+@jsonl_app.command("encrypt")
+def encrypt_jsonl_command(
+    input_file: str = typer.Option(..., help="Path to the input JSON Lines file."),
+    output_file: str = typer.Option(..., help="Path to the output JSON Lines file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output file."
+    ),
+    nonce_scheme: str = typer.Option(
+        "random", help="Per-value nonce scheme: 'random' or 'counter'."
+    ),
+    path: List[str] = typer.Option(
+        None, help="Only encrypt these configured paths (repeatable)."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+):
+    """
+    Encrypt the configured paths of every document in a JSON Lines file.
+    """
+
+    encrypt_jsonl_file(
+        input_file,
+        output_file,
+        mode,
+        config_file,
+        create_metadata,
+        nonce_scheme=nonce_scheme,
+        paths=path,
+        cipher_backend=cipher_backend,
+    )
+
+
+@jsonl_app.command("decrypt")
+def decrypt_jsonl_command(
+    input_file: str = typer.Option(..., help="Path to the input JSON Lines file."),
+    output_file: str = typer.Option(..., help="Path to the output JSON Lines file."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output file."
+    ),
+    path: List[str] = typer.Option(
+        None, help="Only decrypt these configured paths (repeatable)."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+):
+    """
+    Decrypt the configured paths of every document in a JSON Lines file.
+    """
+
+    decrypt_jsonl_file(
+        input_file,
+        output_file,
+        mode,
+        config_file,
+        create_metadata,
+        paths=path,
+        cipher_backend=cipher_backend,
+    )
+
+
+@sqlite_app.command("encrypt")
+def encrypt_sqlite_command(
+    database: str = typer.Option(..., help="Path to the SQLite database."),
+    table: str = typer.Option(..., help="Table to encrypt."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    output_table: str = typer.Option(
+        None, help="Write to this table instead of encrypting in place."
+    ),
+    batch_size: int = typer.Option(1000, help="Rows read and written per batch."),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output table."
+    ),
+    nonce_scheme: str = typer.Option(
+        "random", help="Per-row nonce scheme: 'random' or 'counter'."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+):
+    """
+    Encrypt the configured columns of a SQLite table in resumable batches.
+    """
+
+    encrypt_sqlite_table(
+        database,
+        table,
+        mode,
+        config_file,
+        output_table=output_table,
+        batch_size=batch_size,
+        create_metadata=create_metadata,
+        nonce_scheme=nonce_scheme,
+        cipher_backend=cipher_backend,
+    )
+
+
+@sqlite_app.command("decrypt")
+def decrypt_sqlite_command(
+    database: str = typer.Option(..., help="Path to the SQLite database."),
+    table: str = typer.Option(..., help="Table to decrypt."),
+    config_file: str = typer.Option(..., help="Path to key provider config JSON file."),
+    mode: str = typer.Option(..., help="Key provider mode: 'local', 'vault', etc"),
+    output_table: str = typer.Option(
+        None, help="Write to this table instead of decrypting in place."
+    ),
+    batch_size: int = typer.Option(1000, help="Rows read and written per batch."),
+    create_metadata: bool = typer.Option(
+        False, help="Generate metadata for the keys and output table."
+    ),
+    cipher_backend: str = typer.Option(
+        "auto", help="AES-GCM backend: 'auto', 'pycryptodome' or 'cryptography'."
+    ),
+):
+    """
+    Decrypt a SQLite table encrypted by 'sqlite encrypt' in resumable batches.
+    """
+
+    decrypt_sqlite_table(
+        database,
+        table,
+        mode,
+        config_file,
+        output_table=output_table,
+        batch_size=batch_size,
+        create_metadata=create_metadata,
+        cipher_backend=cipher_backend,
+    )
+
+
+@metadata_app.command("verify")
+def verify_metadata_command(
+    first: str = typer.Option(..., help="Metadata file of the first run."),
+    second: str = typer.Option(
+        ..., help="Metadata file of the second run (e.g. decrypt after transfer)."
+    ),
+):
+    """
+    Compare checksums and counts of two metadata files without rescanning data.
+    """
+    mismatches = compare_metadata(first, second)
+    for mismatch in mismatches:
+        typer.echo(mismatch)
+    if mismatches:
+        raise typer.Exit(code=1)
+    typer.echo("Metadata files match.")
+    logger.info(f"Metadata {first} and {second} match.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,347 @@
+import base64
+import json
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_data
+from piicrypto.encrypt_decrypt.encryptor import encrypt_data, resolve_encrypted_columns
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.helpers.nonce_source import BaseNonceSource, create_nonce_source
+from piicrypto.helpers.utils import find_best_match, generate_metadata, skip_id_column
+from piicrypto.key_provider.key_manager import KeyManager
+
+# pyarrow is optional and slow to import, so it is loaded by _require_pyarrow
+pa = pc = pq = None
+
+logger = setup_logger(name=__name__)
+
+ORIGINAL_SCHEMA_KEY = b"piicrypto.original_schema"
+ENCRYPTED_COLUMNS_KEY = b"piicrypto.encrypted_columns"
+DEFAULT_BATCH_SIZE = 65536
+
+
+def _require_pyarrow():
+    """
+    Import the optional pyarrow dependency on first use, raising a helpful
+    error when it is missing.
+    """
+    global pa, pc, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        logger.error("pyarrow is required for Parquet and Arrow IPC support.")
+        raise ImportError(
+            "pyarrow is required for Parquet and Arrow IPC support. "
+            "Install it with `pip install pii-crypto[arrow]`."
+        )
+    pa, pc, pq = pyarrow, pyarrow.compute, pyarrow.parquet
+
+
+def _offset_batches(table, batch_size: int):
+    """
+    Yield (row offset, record batch) pairs for a table.
+    """
+    offset = 0
+    for batch in table.to_batches(max_chunksize=batch_size):
+        yield offset, batch
+        offset += batch.num_rows
+
+
+def _encrypted_schema(schema, plan: dict):
+    """
+    Build the output schema: encrypted columns become strings, a binary
+    row_iv column is appended and the original schema is kept in the metadata.
+    """
+    fields = [
+        (
+            pa.field(field.name, pa.string(), nullable=True)
+            if field.name in plan
+            else field
+        )
+        for field in schema
+    ]
+    fields.append(pa.field("row_iv", pa.binary(), nullable=False))
+    metadata = dict(schema.metadata or {})
+    metadata[ORIGINAL_SCHEMA_KEY] = base64.b64encode(
+        schema.remove_metadata().serialize().to_pybytes()
+    )
+    metadata[ENCRYPTED_COLUMNS_KEY] = json.dumps(list(plan)).encode()
+    return pa.schema(fields, metadata=metadata)
+
+
+def _original_schema(schema):
+    """
+    Recover the pre-encryption schema stored by `_encrypted_schema`.
+    """
+    metadata = dict(schema.metadata or {})
+    if ORIGINAL_SCHEMA_KEY not in metadata or "row_iv" not in schema.names:
+        logger.error("Input file was not encrypted by piicrypto.")
+        raise ValueError("Input file was not encrypted by piicrypto.")
+    original = pa.ipc.read_schema(
+        pa.py_buffer(base64.b64decode(metadata.pop(ORIGINAL_SCHEMA_KEY)))
+    )
+    encrypted_columns = json.loads(metadata.pop(ENCRYPTED_COLUMNS_KEY, b"[]"))
+    return original.with_metadata(metadata or None), encrypted_columns
+
+
+def _encrypt_batch(
+    batch, plan: dict, out_schema, row_offset: int, nonce_source: BaseNonceSource
+):
+    """
+    Encrypt the planned columns of a record batch, one nonce per row.
+    """
+    nonces = nonce_source.take(batch.num_rows)
+    columns = []
+    for index, name in enumerate(batch.schema.names):
+        column = batch.column(index)
+        if name not in plan:
+            columns.append(column)
+            continue
+        version, key_material = plan[name]
+        values = pc.cast(column, pa.string()).to_pylist()
+        encrypted = []
+        for row_num, (value, nonce) in enumerate(zip(values, nonces), row_offset):
+            if not value or skip_id_column(row_num, value, name):
+                encrypted.append(value)
+                continue
+            encrypted.append(f"{version}:" + encrypt_data(key_material, value, nonce))
+        columns.append(pa.array(encrypted, type=pa.string()))
+    columns.append(pa.array(nonces, type=pa.binary()))
+    return pa.RecordBatch.from_arrays(columns, schema=out_schema)
+
+
+def _decrypt_batch(batch, original_schema, encrypted_columns, key_lookup):
+    """
+    Decrypt the encrypted columns of a record batch and restore their types.
+    """
+    nonces = [
+        base64.b64encode(nonce).decode()
+        for nonce in batch.column(batch.schema.get_field_index("row_iv")).to_pylist()
+    ]
+    columns = []
+    for field in original_schema:
+        column = batch.column(batch.schema.get_field_index(field.name))
+        if field.name not in encrypted_columns:
+            columns.append(column)
+            continue
+        decrypted = []
+        for value, nonce in zip(column.to_pylist(), nonces):
+            if not value or ":" not in value:
+                decrypted.append(value)
+                continue
+            version, encrypted_data = value.split(":")
+            try:
+                decrypted.append(
+                    decrypt_data(
+                        key_lookup(version, field.name), encrypted_data, nonce=nonce
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Error decrypting column '{field.name}': {e}")
+                raise ValueError(f"Error decrypting column '{field.name}': {e}") from e
+        columns.append(pa.array(decrypted, type=pa.string()).cast(field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=original_schema)
+
+
+def _version_key_lookup(key_manager: KeyManager):
+    """
+    Return a callable resolving (version, column) to a key, caching each
+    version's keys so the key source is read once per version.
+    """
+    fields_to_alias = key_manager.field_to_alias
+    keys_by_version = {}
+    aliases = {}
+
+    def lookup(version: str, column: str) -> str:
+        if version not in keys_by_version:
+            keys = key_manager.get_keys_by_version(version)
+            if not keys:
+                logger.error(f"No keys found for version {version}")
+                raise ValueError(f"No keys found for version {version}")
+            keys_by_version[version] = keys
+        if column not in aliases:
+            aliases[column] = (
+                find_best_match(column, fields_to_alias) if fields_to_alias else column
+            )
+        return keys_by_version[version][aliases[column]]
+
+    return lookup
+
+
+def _save_metadata(
+    output_file: str, mode: str, operation: str, fields, extra: dict = None
+):
+    metadata = generate_metadata(
+        out_file=output_file,
+        mode=mode,
+        operation=operation,
+        operation_fields=fields,
+        extra=extra,
+    )
+    with open(f"{output_file}.metadata.json", "w") as meta_file:
+        json.dump(metadata, meta_file, indent=4)
+    logger.info(f"Metadata saved to {output_file}.metadata.json")
+
+
+def encrypt_parquet_file(
+    input_file: str,
+    output_file: str,
+    mode: str,
+    key_provider_config: str,
+    create_metadata: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    nonce_scheme: str = "random",
+):
+    """
+    Encrypt specified columns of a Parquet file using AES encryption.
+    Row groups are processed one at a time and written back as row groups of
+    the same size, so memory is bounded by the largest row group.
+    """
+    _require_pyarrow()
+    logger.info(f"Starting Parquet encryption for {input_file} to {output_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    keys = key_manager.load_keys()
+    nonce_source = create_nonce_source(nonce_scheme)
+    parquet_file = pq.ParquetFile(input_file)
+    plan = resolve_encrypted_columns(parquet_file.schema_arrow.names, key_manager, keys)
+    out_schema = _encrypted_schema(parquet_file.schema_arrow, plan)
+    row_offset = 0
+    with pq.ParquetWriter(output_file, out_schema) as writer:
+        for group in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(group)
+            batches = [
+                _encrypt_batch(
+                    batch, plan, out_schema, row_offset + offset, nonce_source
+                )
+                for offset, batch in _offset_batches(table, batch_size)
+            ]
+            row_offset += table.num_rows
+            writer.write_table(
+                pa.Table.from_batches(batches, schema=out_schema),
+                row_group_size=max(table.num_rows, 1),
+            )
+            logger.info(f"Encrypted row group {group} ({table.num_rows} rows)")
+    if create_metadata:
+        _save_metadata(
+            output_file,
+            mode,
+            "encrypt",
+            plan,
+            extra={"nonce_scheme": nonce_source.describe()},
+        )
+    logger.info(f"Parquet file encrypted successfully at {output_file}.")
+
+
+def decrypt_parquet_file(
+    input_file: str,
+    output_file: str,
+    mode: str,
+    key_provider_config: str,
+    create_metadata: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """
+    Decrypt a Parquet file produced by `encrypt_parquet_file`, restoring the
+    original schema and row groups.
+    """
+    _require_pyarrow()
+    logger.info(f"Starting Parquet decryption for {input_file} to {output_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    key_lookup = _version_key_lookup(key_manager)
+    parquet_file = pq.ParquetFile(input_file)
+    original_schema, encrypted_columns = _original_schema(parquet_file.schema_arrow)
+    with pq.ParquetWriter(output_file, original_schema) as writer:
+        for group in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(group)
+            batches = [
+                _decrypt_batch(batch, original_schema, encrypted_columns, key_lookup)
+                for _, batch in _offset_batches(table, batch_size)
+            ]
+            writer.write_table(
+                pa.Table.from_batches(batches, schema=original_schema),
+                row_group_size=max(table.num_rows, 1),
+            )
+            logger.info(f"Decrypted row group {group} ({table.num_rows} rows)")
+    if create_metadata:
+        _save_metadata(output_file, mode, "decrypt", encrypted_columns)
+    logger.info(f"Parquet file decrypted successfully at {output_file}.")
+
+
+def encrypt_arrow_file(
+    input_file: str,
+    output_file: str,
+    mode: str,
+    key_provider_config: str,
+    create_metadata: bool = False,
+    nonce_scheme: str = "random",
+):
+    """
+    Encrypt specified columns of an Arrow IPC file using AES encryption.
+    The input is memory mapped and streamed one record batch at a time.
+    """
+    _require_pyarrow()
+    logger.info(f"Starting Arrow encryption for {input_file} to {output_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    keys = key_manager.load_keys()
+    nonce_source = create_nonce_source(nonce_scheme)
+    with pa.memory_map(input_file, "r") as source:
+        reader = pa.ipc.open_file(source)
+        plan = resolve_encrypted_columns(reader.schema.names, key_manager, keys)
+        out_schema = _encrypted_schema(reader.schema, plan)
+        row_offset = 0
+        with (
+            pa.OSFile(output_file, "wb") as sink,
+            pa.ipc.new_file(sink, out_schema) as writer,
+        ):
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                writer.write_batch(
+                    _encrypt_batch(batch, plan, out_schema, row_offset, nonce_source)
+                )
+                row_offset += batch.num_rows
+    if create_metadata:
+        _save_metadata(
+            output_file,
+            mode,
+            "encrypt",
+            plan,
+            extra={"nonce_scheme": nonce_source.describe()},
+        )
+    logger.info(f"Arrow file encrypted successfully at {output_file}.")
+
+
+def decrypt_arrow_file(
+    input_file: str,
+    output_file: str,
+    mode: str,
+    key_provider_config: str,
+    create_metadata: bool = False,
+):
+    """
+    Decrypt an Arrow IPC file produced by `encrypt_arrow_file`.
+    """
+    _require_pyarrow()
+    logger.info(f"Starting Arrow decryption for {input_file} to {output_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    key_lookup = _version_key_lookup(key_manager)
+    with pa.memory_map(input_file, "r") as source:
+        reader = pa.ipc.open_file(source)
+        original_schema, encrypted_columns = _original_schema(reader.schema)
+        with (
+            pa.OSFile(output_file, "wb") as sink,
+            pa.ipc.new_file(sink, original_schema) as writer,
+        ):
+            for index in range(reader.num_record_batches):
+                writer.write_batch(
+                    _decrypt_batch(
+                        reader.get_batch(index),
+                        original_schema,
+                        encrypted_columns,
+                        key_lookup,
+                    )
+                )
+    if create_metadata:
+        _save_metadata(output_file, mode, "decrypt", encrypted_columns)
+    logger.info(f"Arrow file decrypted successfully at {output_file}.")
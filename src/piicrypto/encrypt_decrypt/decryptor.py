@@ -1,85 +1,294 @@
 import base64
-import csv
+import io
 import json
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import List
 
-from Crypto.Cipher import AES
-
+from piicrypto.helpers.blind_index import blind_index_columns
+from piicrypto.helpers.cipher_backend import decode_key, get_cipher_backend
+from piicrypto.helpers.dialects import (
+    FixedWidthSpec,
+    describe_dialect,
+    read_header,
+    resolve_dialect,
+    row_reader,
+    row_writer,
+)
+from piicrypto.helpers.integrity import ColumnStats
 from piicrypto.helpers.logger_helper import setup_logger
-from piicrypto.helpers.utils import find_best_match, generate_metadata
+from piicrypto.helpers.memory_profile import MemoryProfiler
+from piicrypto.helpers.row_index import RowIndex, index_path
+from piicrypto.helpers.stream_io import HashingWriter, TrackedLineReader
+from piicrypto.helpers.utils import (
+    PACKED_COLUMN_PREFIX,
+    find_best_match,
+    generate_metadata,
+    packed_key_field,
+)
 from piicrypto.key_provider.key_manager import KeyManager
 
 logger = setup_logger(name=__name__)
 
 
-def decrypt_data(key: str, data: str, nonce: str) -> str:
+def decrypt_data(key: str, data: str, nonce: str, backend: str = "auto") -> str:
     """
     Decrypt data using AES decryption for the specified field.
+    `backend` selects the AES-GCM implementation, as for `encrypt_data`.
     """
-    key = base64.b64decode(key.encode())
     data = base64.b64decode(data.encode())
     nonce = base64.b64decode(nonce.encode())
-    tag = data[:16]
-    ciphertext = data[16:]
-
-    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-    decrypted_data = cipher.decrypt_and_verify(ciphertext, tag)
+    decrypted_data = get_cipher_backend(backend).decrypt(decode_key(key), nonce, data)
 
     return decrypted_data.decode()
 
 
+def unpack_group(
+    column: str,
+    encrypted_data: str,
+    nonce: str,
+    keys: dict,
+    key_groups: dict,
+    backend: str = "auto",
+) -> dict:
+    """
+    Decrypt a packed column into the member values it seals, {column: value}.
+    `keys` are the keys of the column's version and `key_groups` those of the
+    provider config, which name the field whose key sealed the group.
+    """
+    key_field = packed_key_field(column, key_groups)
+    if key_field not in keys:
+        raise ValueError(f"No key found for packed column '{column}'")
+    return json.loads(decrypt_data(keys[key_field], encrypted_data, nonce, backend))
+
+
+@dataclass
+class RowDecryptionContext:
+    """
+    Per-file state shared by the row decryption loop.
+    """
+
+    fieldnames: List[str]
+    key_manager: KeyManager
+    stats: ColumnStats
+    decrypted_fields: set = field(default_factory=set)
+    cipher_backend: str = "auto"
+    blind_index_columns: set = field(init=False)
+
+    def __post_init__(self):
+        self.blind_index_columns = blind_index_columns(
+            self.fieldnames,
+            self.key_manager.field_to_alias,
+            self.key_manager.blind_index_fields,
+        )
+
+
+def decrypt_row(row: dict, context: RowDecryptionContext):
+    """
+    Decrypt the encrypted cells and unpack the packed columns of a row in
+    place. Cells failing authentication are flagged with 'Decryption Error'.
+    """
+    key_manager = context.key_manager
+    fields_to_alias = key_manager.field_to_alias
+    stats = context.stats
+    stats.count_row()
+    for field_name in context.fieldnames:
+        if not row[field_name]:
+            stats.count_empty(field_name)
+        if (
+            field_name == "row_iv"
+            or not row[field_name]
+            or ":" not in row[field_name]
+            or field_name in context.blind_index_columns
+        ):
+            logger.info(f"Skipping field: {field_name} in row {row}")
+            continue
+        field_alias = (
+            find_best_match(field_name, fields_to_alias)
+            if fields_to_alias
+            else field_name
+        )
+        version, encrypted_data = row[field_name].split(":")
+        keys = key_manager.get_keys_by_version(version)
+        if not keys:
+            logger.error(f"No keys found for version {version}")
+            raise ValueError(f"No keys found for version {version}")
+        if field_name.startswith(PACKED_COLUMN_PREFIX):
+            try:
+                values = unpack_group(
+                    field_name,
+                    encrypted_data,
+                    row["row_iv"],
+                    keys,
+                    key_manager.key_groups,
+                    backend=context.cipher_backend,
+                )
+            except Exception as e:
+                logger.error(f"Error unpacking column '{field_name}': {e}")
+                row[field_name] = f"{row[field_name]} Decryption Error"
+                stats.count_error()
+                continue
+            row.update(values)
+            row[field_name] = ""
+            for name in values:
+                context.decrypted_fields.add(name)
+                stats.count_processed(name, version)
+            logger.info(f"Unpacked column: {field_name} in row {row}")
+            continue
+        if field_alias in keys:
+            try:
+                row[field_name] = decrypt_data(
+                    keys[field_alias],
+                    encrypted_data,
+                    nonce=row["row_iv"],
+                    backend=context.cipher_backend,
+                )
+                context.decrypted_fields.add(field_name)
+                stats.count_processed(field_name, version)
+                logger.info(f"Decrypted field: {field_alias} in row {row}")
+            except Exception as e:
+                logger.error(f"Error decrypting field '{field_name}': {e}")
+                row[field_name] = f"{row[field_name]} Decryption Error"
+                stats.count_error()
+
+
 def decrypt_csv_file(
     input_file: str,
     output_file: str,
     mode: str,
     key_provider_config: str,
     create_metadata: bool = False,
+    dialect: str = "auto",
+    fixed_width_spec: str = None,
+    profile_memory: bool = False,
+    cipher_backend: str = "auto",
 ):
     """
     Decrypt specified fields in a CSV file using AES decryption.
+    The dialect is detected or given as for `encrypt_csv_file`; for
+    fixed-width files, `fixed_width_spec` is the '<output>.layout.json'
+    written by the encryption and the output uses the original widths.
+    With `profile_memory`, a memory profile is recorded in the metadata as
+    for `encrypt_csv_file`. `cipher_backend` selects the AES-GCM
+    implementation, as for `encrypt_csv_file`. Packed columns written by
+    `encrypt_csv_file(packed=True)` are unpacked into their member columns
+    and left empty.
     """
     logger.info(f"Starting decryption process for {input_file} to {output_file}")
     key_manager = KeyManager(mode, key_provider_config)
-    fields_to_alias = key_manager.field_to_alias
-    with open(input_file, "r") as infile, open(output_file, "w") as outfile:
-        reader = csv.DictReader(infile)
-        fieldnames = reader.fieldnames
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
+    backend = get_cipher_backend(cipher_backend)
+    logger.info(f"Using cipher backend: {backend.name}")
+    profiler = MemoryProfiler() if profile_memory else None
+    with ExitStack() as stack:
+        if profiler:
+            stack.enter_context(profiler)
+        infile = stack.enter_context(open(input_file, "rb"))
+        raw_output = stack.enter_context(open(output_file, "wb"))
+        input_dialect = resolve_dialect(infile, dialect, fixed_width_spec)
+        lines = TrackedLineReader(infile)
+        outfile = HashingWriter(raw_output)
+        header_line, fieldnames = read_header(lines, input_dialect)
+        if header_line is None:
+            logger.error(f"Input file {input_file} has no header.")
+            raise ValueError(f"Input file {input_file} has no header.")
+        reader = row_reader(lines, fieldnames, input_dialect)
+        output_dialect = input_dialect
+        if isinstance(input_dialect, FixedWidthSpec):
+            output_dialect = input_dialect.decrypted()
+        writer = row_writer(outfile, fieldnames, output_dialect)
         writer.writeheader()
-        decrypted_fields = set()
+        context = RowDecryptionContext(
+            fieldnames=fieldnames,
+            key_manager=key_manager,
+            stats=ColumnStats(fieldnames),
+            cipher_backend=backend.name,
+        )
+        stats = context.stats
         for row in reader:
-            for field in fieldnames:
-                if field == "row_iv" or not row[field] or ":" not in row[field]:
-                    logger.info(f"Skipping field: {field} in row {row}")
-                    continue
-                field_alias = (
-                    find_best_match(field, fields_to_alias)
-                    if fields_to_alias
-                    else field
-                )
-                version, encrypted_data = row[field].split(":")
-                keys = key_manager.get_keys_by_version(version)
-                if not keys:
-                    logger.error(f"No keys found for version {version}")
-                    raise ValueError(f"No keys found for version {version}")
-                if field_alias in keys:
-                    try:
-                        row[field] = decrypt_data(
-                            keys[field_alias], encrypted_data, nonce=row["row_iv"]
-                        )
-                        decrypted_fields.add(field)
-                        logger.info(f"Decrypted field: {field_alias} in row {row}")
-                    except Exception as e:
-                        logger.error(f"Error decrypting field '{field}': {e}")
-                        row[field] = f"{row[field]} Decryption Error"
+            decrypt_row(row, context)
             writer.writerow(row)
-    if create_metadata:
+            if profiler:
+                profiler.sample(stats.rows)
+    if create_metadata or profile_memory:
+        extra = {
+            "integrity": {
+                "input": lines.describe(),
+                "output": outfile.describe(),
+            },
+            "stats": stats.describe(),
+            "dialect": describe_dialect(input_dialect),
+            "cipher_backend": backend.name,
+        }
+        if profiler:
+            extra["memory_profile"] = profiler.describe()
         metadata = generate_metadata(
             out_file=output_file,
             mode=mode,
             operation="decrypt",
-            operation_fields=decrypted_fields,
+            operation_fields=context.decrypted_fields,
+            extra=extra,
         )
         with open(f"{output_file}.metadata.json", "w") as meta_file:
             json.dump(metadata, meta_file, indent=4)
         logger.info(f"Metadata saved to {output_file}.metadata.json")
     logger.info(f"CSV file decrypted successfully at {output_file}.")
+
+
+def decrypt_csv_rows(
+    input_file: str,
+    output_file: str,
+    mode: str,
+    key_provider_config: str,
+    rows: List[int] = None,
+    ids: List[str] = None,
+    index_file: str = None,
+    dialect: str = "auto",
+    fixed_width_spec: str = None,
+    cipher_backend: str = "auto",
+) -> int:
+    """
+    Decrypt only some rows of an encrypted file, located through the row
+    index written with `encrypt_csv_file(index=True)` instead of a scan.
+    `rows` are 0-based input row numbers and `ids` values of the index ID
+    column; `index_file` defaults to '<input>.index.sqlite'. Each record is
+    read with a single seek, from the shard holding it for sharded output.
+    The rows are written in the order requested and their count is returned.
+    """
+    logger.info(f"Starting indexed decryption of {input_file} to {output_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    backend = get_cipher_backend(cipher_backend)
+    with ExitStack() as stack:
+        row_index = stack.enter_context(RowIndex(index_file or index_path(input_file)))
+        locations = row_index.locate_rows(rows or [])
+        if ids:
+            locations += row_index.locate_ids(ids)
+        outfile = HashingWriter(stack.enter_context(open(output_file, "wb")))
+        files = {}
+        writer = None
+        for row_num, path, offset, length in locations:
+            if path not in files:
+                raw = stack.enter_context(open(path, "rb"))
+                file_dialect = resolve_dialect(raw, dialect, fixed_width_spec)
+                _, fieldnames = read_header(TrackedLineReader(raw), file_dialect)
+                files[path] = (raw, file_dialect, fieldnames)
+            raw, file_dialect, fieldnames = files[path]
+            if writer is None:
+                output_dialect = file_dialect
+                if isinstance(file_dialect, FixedWidthSpec):
+                    output_dialect = file_dialect.decrypted()
+                writer = row_writer(outfile, fieldnames, output_dialect)
+                writer.writeheader()
+                context = RowDecryptionContext(
+                    fieldnames=fieldnames,
+                    key_manager=key_manager,
+                    stats=ColumnStats(fieldnames),
+                    cipher_backend=backend.name,
+                )
+            raw.seek(offset)
+            record = raw.read(length).decode()
+            row = next(row_reader(io.StringIO(record), fieldnames, file_dialect))
+            decrypt_row(row, context)
+            writer.writerow(row)
+            logger.info(f"Decrypted row {row_num} at byte {offset} of {path}")
+    logger.info(f"Decrypted {len(locations)} indexed rows to {output_file}.")
+    return len(locations)
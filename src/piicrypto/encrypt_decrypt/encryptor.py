@@ -1,34 +1,313 @@
 import base64
 import csv
+import io
 import json
+import os
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
-from Crypto.Cipher import AES
-
-from piicrypto.helpers.create_dynamic_model import create_dynamic_model
+from piicrypto.helpers.blind_index import (
+    BLIND_INDEX_WIDTH,
+    blind_index,
+    blind_index_column,
+)
+from piicrypto.helpers.cipher_backend import decode_key, get_cipher_backend
+from piicrypto.helpers.dialects import (
+    FixedWidthSpec,
+    describe_dialect,
+    format_rows,
+    read_header,
+    resolve_dialect,
+    row_reader,
+    row_writer,
+)
+from piicrypto.helpers.integrity import ColumnStats
 from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.helpers.memory_profile import MemoryProfiler
+from piicrypto.helpers.nonce_source import BaseNonceSource, create_nonce_source
+from piicrypto.helpers.pipeline import run_pipeline
+from piicrypto.helpers.quarantine import QuarantineWriter
+from piicrypto.helpers.row_index import RowIndexWriter, index_path
+from piicrypto.helpers.row_validator import CompiledRowValidator
+from piicrypto.helpers.shard_writer import ShardedWriter
+from piicrypto.helpers.stream_io import HashingWriter, TrackedLineReader
 from piicrypto.helpers.utils import (
+    PACKED_COLUMN_PREFIX,
     find_best_match,
     generate_metadata,
-    generate_nonce,
+    iter_blocks,
     skip_id_column,
-    validate_row,
+)
+from piicrypto.helpers.watermark import (
+    build_watermark,
+    load_metadata,
+    resume_watermark,
 )
 from piicrypto.key_provider.key_manager import KeyManager
 
 logger = setup_logger(name=__name__)
 
+DEFAULT_BLOCK_SIZE = 1024
+DEFAULT_QUEUE_DEPTH = 4
+
 
-def encrypt_data(key: str, data: str, nonce: bytes) -> str:
+def encrypt_data(key: str, data: str, nonce: bytes, backend: str = "auto") -> str:
     """
     Encrypt data using AES encryption for the specified field.
+    `backend` selects the AES-GCM implementation (see
+    `piicrypto.helpers.cipher_backend`); all produce the same ciphertext.
     """
-    key = base64.b64decode(key.encode())
-    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-    ciphertext, tag = cipher.encrypt_and_digest(data.encode())
-    combined = base64.b64encode(tag + ciphertext).decode()
+    sealed = get_cipher_backend(backend).encrypt(decode_key(key), nonce, data.encode())
+    combined = base64.b64encode(sealed).decode()
     return combined
 
 
+@dataclass
+class PackedGroup:
+    """
+    Columns of a key group sealed together into one packed column.
+    """
+
+    column: str
+    version: str
+    key: str
+    members: List[str]
+
+
+@dataclass
+class RowEncryptionContext:
+    """
+    Per-file state shared by the row encryption loop.
+    """
+
+    fieldnames: List[str]
+    columns: Dict[str, Tuple[str, str]]
+    nonce_source: BaseNonceSource
+    stats: ColumnStats
+    validator: Optional[CompiledRowValidator] = None
+    quarantine: Optional[QuarantineWriter] = None
+    encrypted_fields: set = field(default_factory=set)
+    rows_read: int = 0
+    cipher_backend: str = "auto"
+    packed_groups: List[PackedGroup] = field(default_factory=list)
+    blind_indexes: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+
+def resolve_encrypted_columns(
+    fieldnames: List[str], key_manager: KeyManager, keys: dict
+) -> Dict[str, Tuple[str, str]]:
+    """
+    Map each column that should be encrypted to its (version, key) pair.
+    Column names are matched against the aliases once per file.
+    """
+    fields_to_alias = key_manager.field_to_alias
+    columns = {}
+    for name in fieldnames:
+        field_alias = (
+            find_best_match(name, fields_to_alias) if fields_to_alias else name
+        )
+        if field_alias not in key_manager.fields_to_encrypt or field_alias not in keys:
+            logger.info(f"Skipping column: {name}")
+            continue
+        columns[name] = keys[field_alias]
+    return columns
+
+
+def resolve_blind_index_columns(
+    fieldnames: List[str], key_manager: KeyManager, keys: dict
+) -> Dict[str, Tuple[str, str]]:
+    """
+    Map each column that gets a blind index to the (version, key) pair its
+    blind index key is derived from.
+    """
+    fields_to_alias = key_manager.field_to_alias
+    return {
+        name: key
+        for name, key in resolve_encrypted_columns(
+            fieldnames, key_manager, keys
+        ).items()
+        if (find_best_match(name, fields_to_alias) if fields_to_alias else name)
+        in key_manager.blind_index_fields
+    }
+
+
+def resolve_packed_groups(
+    fieldnames: List[str], key_manager: KeyManager, keys: dict
+) -> List[PackedGroup]:
+    """
+    Group the columns that should be encrypted by the key group of their
+    field, for the packed layout. Each group is sealed with the current key
+    of the first field of the group in the provider config.
+    """
+    field_to_group = {
+        field_name: group
+        for group, fields in key_manager.key_groups.items()
+        for field_name in fields
+    }
+    members = {}
+    for name in resolve_encrypted_columns(fieldnames, key_manager, keys):
+        field_alias = (
+            find_best_match(name, key_manager.field_to_alias)
+            if key_manager.field_to_alias
+            else name
+        )
+        if field_alias not in field_to_group:
+            logger.error(f"Field '{field_alias}' has no key group.")
+            raise ValueError(f"Field '{field_alias}' has no key group.")
+        members.setdefault(field_to_group[field_alias], []).append(name)
+    groups = []
+    for group, names in members.items():
+        key_field = key_manager.key_groups[group][0]
+        if key_field not in keys:
+            logger.error(f"No key found for key group '{group}'.")
+            raise ValueError(f"No key found for key group '{group}'.")
+        version, key_material = keys[key_field]
+        groups.append(
+            PackedGroup(f"{PACKED_COLUMN_PREFIX}{group}", version, key_material, names)
+        )
+    return groups
+
+
+def _rejected_rows(
+    block: list, validator: CompiledRowValidator, quarantine: QuarantineWriter
+) -> dict:
+    """
+    Return {block index: error codes} for the rows of a block that fail
+    validation. Error codes are only collected when quarantining.
+    """
+    if not validator:
+        return {}
+    rows = [row for _, row in block]
+    if quarantine:
+        return validator.reject_block(rows)
+    return {
+        index: None
+        for index, valid in enumerate(validator.validate_block(rows))
+        if not valid
+    }
+
+
+def encrypt_row(row: dict, row_num: int, nonce: bytes, context: RowEncryptionContext):
+    """
+    Encrypt the configured fields of a row in place and set its row_iv.
+    """
+    logger.info(f"Processing row {row_num}")
+    context.stats.count_row()
+    for name, (version, key_material) in context.blind_indexes.items():
+        value = row[name]
+        row[blind_index_column(name)] = (
+            f"{version}:{blind_index(key_material, value)}"
+            if value and not skip_id_column(row_num, value, name)
+            else ""
+        )
+    for field_name in context.fieldnames:
+        value = row[field_name]
+        if not value:
+            context.stats.count_empty(field_name)
+        if not value or skip_id_column(row_num, value, field_name):
+            logger.info(f"Skipping field: {field_name} in row {row_num}")
+            continue
+        if field_name not in context.columns:
+            logger.info(f"Skipping field: {field_name} in row {row_num}")
+            continue
+        version, key_material = context.columns[field_name]
+        row[field_name] = f"{version}:" + encrypt_data(
+            key_material, value, nonce, context.cipher_backend
+        )
+        context.encrypted_fields.add(field_name)
+        context.stats.count_processed(field_name, version)
+        logger.info(f"Encrypted field: {field_name} in row {row_num}")
+    for group in context.packed_groups:
+        pack_group(row, row_num, nonce, group, context)
+    row["row_iv"] = base64.b64encode(nonce).decode()
+    logger.info(f"Processing completed for row {row_num}, writing to output")
+
+
+def pack_group(
+    row: dict,
+    row_num: int,
+    nonce: bytes,
+    group: PackedGroup,
+    context: RowEncryptionContext,
+):
+    """
+    Seal the non-empty member cells of a key group as one JSON object in
+    its packed column, with a single AES-GCM operation, and empty them.
+    """
+    values = {}
+    for name in group.members:
+        value = row[name]
+        if not value or skip_id_column(row_num, value, name):
+            continue
+        values[name] = value
+        row[name] = ""
+    if not values:
+        row[group.column] = ""
+        return
+    row[group.column] = f"{group.version}:" + encrypt_data(
+        group.key,
+        json.dumps(values, separators=(",", ":")),
+        nonce,
+        context.cipher_backend,
+    )
+    for name in values:
+        context.encrypted_fields.add(name)
+        context.stats.count_processed(name, group.version)
+    logger.info(f"Encrypted key group: {group.column} in row {row_num}")
+
+
+def encrypt_block(block: list, context: RowEncryptionContext) -> list:
+    """
+    Validate and encrypt a block of (row number, row) pairs, returning the
+    pairs to write. Rejected rows are quarantined or logged and dropped.
+    """
+    context.rows_read += len(block)
+    rejected = _rejected_rows(block, context.validator, context.quarantine)
+    rows = []
+    for index, (row_num, row) in enumerate(block):
+        if index in rejected:
+            if context.quarantine:
+                context.quarantine.add(row_num, rejected[index], row)
+            else:
+                logger.warning(f"Skipping row {row_num} due to validation errors")
+            continue
+        encrypt_row(row, row_num, context.nonce_source.next_nonce(), context)
+        rows.append((row_num, row))
+    return rows
+
+
+def _write_block(outfile, fieldnames: List[str], rows: list, dialect=csv.excel):
+    """
+    Format a block of rows in memory and write it with a single call.
+    """
+    buffer = io.StringIO()
+    row_writer(buffer, fieldnames, dialect).writerows(rows)
+    outfile.write(buffer.getvalue())
+
+
+def _write_indexed_block(
+    outfile: HashingWriter,
+    fieldnames: List[str],
+    block: list,
+    dialect,
+    row_index: RowIndexWriter,
+    output_file: str,
+):
+    """
+    Write a block of (row number, row) pairs with a single call and add the
+    byte offset and length of each record to the row index.
+    """
+    records = format_rows([row for _, row in block], fieldnames, dialect)
+    entries = []
+    offset = outfile.offset
+    for (row_num, row), record in zip(block, records):
+        entries.append((row_num, row, output_file, offset, len(record)))
+        offset += len(record)
+    outfile.write_bytes(b"".join(records))
+    row_index.add(entries)
+
+
 def encrypt_csv_file(
     input_file: str,
     output_file: str,
@@ -36,63 +315,307 @@ def encrypt_csv_file(
     key_provider_config: str,
     create_metadata: bool = False,
     validate_json: str = None,
+    nonce_scheme: str = "random",
+    quarantine_file: str = None,
+    quarantine_rows: bool = False,
+    pipeline: bool = False,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    queue_depth: int = DEFAULT_QUEUE_DEPTH,
+    incremental: bool = False,
+    shards: int = None,
+    max_rows_per_shard: int = None,
+    max_bytes_per_shard: int = None,
+    dialect: str = "auto",
+    fixed_width_spec: str = None,
+    profile_memory: bool = False,
+    cipher_backend: str = "auto",
+    packed: bool = False,
+    index: bool = False,
+    index_id_column: str = None,
 ):
     """
     Encrypt specified fields in a CSV file using AES encryption.
+    `nonce_scheme` selects how the per-row nonces are generated ('random' or
+    'counter', see `piicrypto.helpers.nonce_source`).
+    With `validate_json` and `quarantine_file`, rejected rows are written to
+    the quarantine sidecar with their error codes instead of being logged.
+    The rejected rows themselves are only copied there, unencrypted, with
+    `quarantine_rows`.
+    With `pipeline`, reading, encryption and writing run as separate stages
+    exchanging blocks of `block_size` rows through queues of `queue_depth`
+    blocks, so file I/O overlaps with encryption.
+    With `incremental`, a watermark (input byte offset, row count, header
+    hash) is kept in the metadata file and a rerun only encrypts the rows
+    appended since, appending them to the existing output. A truncated or
+    rewritten input, a changed header or a different output layout (packed,
+    blind index columns, dialect) falls back to a full run.
+    With `shards`, `max_rows_per_shard` or `max_bytes_per_shard`, the output
+    is written to rotated shard files ('out.part-00000.csv', ...), each with
+    the header, and the metadata lists every shard with its output row range,
+    size and checksum.
+    The input dialect is detected once from the first block ('auto') or
+    given explicitly ('csv', 'tsv', 'pipe', 'semicolon' or a delimiter), and
+    the output uses the same one. With `fixed_width_spec`, the input is read
+    with that fixed-width layout; encrypted columns are widened in the output
+    and its layout is saved to '<output>.layout.json' for decryption.
+    With `profile_memory`, tracemalloc samples, the top allocation growth and
+    the peak RSS are recorded under `memory_profile` in the metadata.
+    `cipher_backend` selects the AES-GCM implementation ('pycryptodome',
+    'cryptography' or 'auto' for the fastest available one).
+    With `packed`, the fields of each key group ('key_group' in the provider
+    config, 'default' otherwise) are sealed together per row, as one JSON
+    object in a 'packed:<key group>' column, instead of one AES-GCM
+    operation per cell. Their own cells are left empty.
+    With `index` or `index_id_column`, a row index sidecar
+    ('<output>.index.sqlite') maps the 0-based input row number of each
+    written row, and the value of `index_id_column` if given, to the file,
+    byte offset and length of its record, for `decrypt_csv_rows`. The ID
+    column must not be encrypted.
+    Fields configured with 'blind_index' get a '<column>_bidx' column holding
+    '<version>:<truncated HMAC of the normalized value>', keyed from the
+    field's key, for `search_csv_file`.
     """
+    if block_size < 1:
+        logger.error("block_size must be a positive integer.")
+        raise ValueError("block_size must be a positive integer.")
+    sharded = bool(shards or max_rows_per_shard or max_bytes_per_shard)
+    if sharded and incremental:
+        logger.error("Sharded output cannot be combined with incremental runs.")
+        raise ValueError("Sharded output cannot be combined with incremental runs.")
+    if packed and fixed_width_spec:
+        logger.error("The packed layout is not supported for fixed-width files.")
+        raise ValueError("The packed layout is not supported for fixed-width files.")
     logger.info(f"Starting Encryption process for {input_file} to {output_file}")
     key_manager = KeyManager(mode, key_provider_config)
     keys = key_manager.load_keys()
     logger.info(f"Loaded keys for mode: {mode}, from {key_provider_config}")
-    fields_to_encrypt = key_manager.fields_to_encrypt
-    fields_to_alias = key_manager.field_to_alias
-    validation_model = None
+    nonce_source = create_nonce_source(nonce_scheme)
+    backend = get_cipher_backend(cipher_backend)
+    logger.info(f"Using cipher backend: {backend.name}")
+    validator = None
     if validate_json:
-        validation_model = create_dynamic_model(validate_json)
+        validator = CompiledRowValidator(validate_json)
         logger.info(f"Validation model created from {validate_json}")
-    with open(input_file, "r") as infile, open(output_file, "w") as outfile:
-        reader = csv.DictReader(infile)
-        fieldnames = reader.fieldnames + ["row_iv"]
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
-        encrypted_fields = set()
-        for row_num, row in enumerate(reader):
-            if validation_model:
-                logger.info(f"Validating row {row_num}")
-                if not validate_row(row, validation_model):
-                    logger.warning(f"Skipping row {row_num} due to validation errors")
-                    continue
-                logger.info(f"Row {row_num} validated successfully")
-            logger.info(f"Processing row {row_num}")
-            nonce = generate_nonce()
-            for field in reader.fieldnames:
-                if not row[field] or skip_id_column(row_num, row[field], field):
-                    logger.info(f"Skipping field: {field} in row {row_num}")
-                    continue
-                field_alias = (
-                    find_best_match(field, fields_to_alias)
-                    if fields_to_alias
-                    else field
+    profiler = MemoryProfiler() if profile_memory else None
+    with ExitStack() as stack:
+        if profiler:
+            stack.enter_context(profiler)
+        raw_input = stack.enter_context(open(input_file, "rb"))
+        input_dialect = resolve_dialect(raw_input, dialect, fixed_width_spec)
+        lines = TrackedLineReader(raw_input, complete_lines_only=incremental)
+        header_line, input_fieldnames = read_header(lines, input_dialect)
+        if header_line is None:
+            logger.error(f"Input file {input_file} has no header.")
+            raise ValueError(f"Input file {input_file} has no header.")
+        packed_groups = []
+        if packed:
+            packed_groups = resolve_packed_groups(input_fieldnames, key_manager, keys)
+            columns = {}
+        else:
+            columns = resolve_encrypted_columns(input_fieldnames, key_manager, keys)
+        blind_indexes = resolve_blind_index_columns(input_fieldnames, key_manager, keys)
+        blind_index_widths = {
+            blind_index_column(name): len(version) + 1 + BLIND_INDEX_WIDTH
+            for name, (version, _) in blind_indexes.items()
+        }
+        fieldnames = (
+            input_fieldnames
+            + list(blind_index_widths)
+            + [group.column for group in packed_groups]
+            + ["row_iv"]
+        )
+        if index_id_column and (
+            index_id_column not in input_fieldnames
+            or index_id_column in columns
+            or any(index_id_column in group.members for group in packed_groups)
+        ):
+            logger.error(f"Index ID column '{index_id_column}' must be a plain column.")
+            raise ValueError(
+                f"Index ID column '{index_id_column}' must be a plain column."
+            )
+        output_dialect = input_dialect
+        if isinstance(input_dialect, FixedWidthSpec):
+            output_dialect = input_dialect.encrypted(columns, blind_index_widths)
+        output_layout = {
+            "fieldnames": fieldnames,
+            "dialect": describe_dialect(output_dialect),
+        }
+        watermark = (
+            resume_watermark(input_file, output_file, header_line, output_layout)
+            if incremental
+            else None
+        )
+        if watermark:
+            lines.seek(watermark["input_offset"])
+        first_row = watermark["row_count"] if watermark else 0
+        reader = row_reader(lines, input_fieldnames, input_dialect)
+        row_index = None
+        if index or index_id_column:
+            row_index = stack.enter_context(
+                RowIndexWriter(
+                    index_path(output_file), index_id_column, append=bool(watermark)
+                )
+            )
+        if isinstance(output_dialect, FixedWidthSpec):
+            output_dialect.save(f"{output_file}.layout.json")
+            logger.info(f"Output layout saved to {output_file}.layout.json")
+        if sharded:
+            outfile = stack.enter_context(
+                ShardedWriter(
+                    output_file,
+                    fieldnames,
+                    shards=shards,
+                    max_rows=max_rows_per_shard,
+                    max_bytes=max_bytes_per_shard,
+                    input_bytes=os.path.getsize(input_file),
+                    dialect=output_dialect,
+                )
+            )
+        else:
+            # a resumed run hashes the whole output, as its decryption will
+            outfile = HashingWriter(
+                stack.enter_context(open(output_file, "ab" if watermark else "wb")),
+                hash_existing=bool(watermark),
+            )
+            if not watermark:
+                row_writer(outfile, fieldnames, output_dialect).writeheader()
+        context = RowEncryptionContext(
+            fieldnames=input_fieldnames,
+            columns=columns,
+            nonce_source=nonce_source,
+            stats=ColumnStats(input_fieldnames),
+            validator=validator,
+            cipher_backend=backend.name,
+            packed_groups=packed_groups,
+            blind_indexes=blind_indexes,
+        )
+        if validator and quarantine_file:
+            context.quarantine = stack.enter_context(
+                QuarantineWriter(
+                    quarantine_file,
+                    input_fieldnames,
+                    append=bool(watermark),
+                    include_rows=quarantine_rows,
                 )
-                if field_alias not in fields_to_encrypt:
-                    logger.info(f"Skipping field: {field_alias} in row {row_num}")
-                    continue
-                if field_alias in keys:
-                    version, key_material = keys[field_alias]
-                    row[field] = f"{version}:" + encrypt_data(
-                        key_material, row[field], nonce
+            )
+        if sharded:
+            # each row travels with the input offset just past it, for rotation
+            blocks = iter_blocks(
+                ((pair, lines.offset) for pair in enumerate(reader, first_row)),
+                block_size,
+            )
+
+            def transform(block):
+                input_offsets = {pair[0]: offset for pair, offset in block}
+                pairs = encrypt_block([pair for pair, _ in block], context)
+                if profiler:
+                    profiler.sample(context.rows_read)
+                return pairs, [input_offsets[row_num] for row_num, _ in pairs]
+
+            def sink(item):
+                pairs, input_offsets = item
+                locations = outfile.write_block(
+                    [row for _, row in pairs], input_offsets
+                )
+                if row_index:
+                    row_index.add(
+                        [
+                            (row_num, row, *location)
+                            for (row_num, row), location in zip(pairs, locations)
+                        ]
                     )
-                    encrypted_fields.add(field)
-                    logger.info(f"Encrypted field: {field} in row {row_num}")
-            row["row_iv"] = base64.b64encode(nonce).decode()
-            logger.info(f"Processing completed for row {row_num}, writing to output")
-            writer.writerow(row)
-    if create_metadata:
+
+        else:
+            blocks = iter_blocks(enumerate(reader, first_row), block_size)
+
+            def transform(block):
+                pairs = encrypt_block(block, context)
+                if profiler:
+                    profiler.sample(context.rows_read)
+                return pairs
+
+            def sink(pairs):
+                if row_index:
+                    _write_indexed_block(
+                        outfile,
+                        fieldnames,
+                        pairs,
+                        output_dialect,
+                        row_index,
+                        output_file,
+                    )
+                else:
+                    _write_block(
+                        outfile, fieldnames, [row for _, row in pairs], output_dialect
+                    )
+
+        if pipeline:
+            logger.info(
+                f"Running pipelined encryption with block size {block_size} "
+                f"and queue depth {queue_depth}"
+            )
+            run_pipeline(blocks, transform, sink, queue_depth=queue_depth)
+        else:
+            for block in blocks:
+                sink(transform(block))
+    if create_metadata or incremental or sharded or profile_memory:
+        previous = load_metadata(output_file) if watermark else {}
+        extra = {
+            "nonce_scheme": nonce_source.describe(),
+            "dialect": describe_dialect(input_dialect),
+            "cipher_backend": backend.name,
+            "layout": "packed" if packed else "cell",
+            "integrity": {"input": lines.describe()},
+            "stats": context.stats.describe(previous.get("stats")),
+        }
+        if sharded:
+            extra["shards"] = outfile.describe()
+            extra["integrity"]["output"] = {
+                "shards": [
+                    {
+                        "file": shard["file"],
+                        "sha256": shard["sha256"],
+                        "bytes": shard["bytes"],
+                        "rows": shard["rows"],
+                    }
+                    for shard in extra["shards"]
+                ]
+            }
+        else:
+            extra["integrity"]["output"] = outfile.describe()
+        if profiler:
+            extra["memory_profile"] = profiler.describe()
+        if row_index:
+            extra["row_index"] = row_index.describe()
+        if blind_indexes:
+            extra["blind_indexes"] = list(blind_index_widths)
+        if context.quarantine:
+            extra["quarantine"] = context.quarantine.summary()
+        operation_fields = set(context.encrypted_fields)
+        operation_fields.update(previous.get("operation_fields", []))
+        if incremental:
+            extra["watermark"] = build_watermark(
+                input_file,
+                lines.offset,
+                first_row + context.rows_read,
+                header_line,
+                output_layout,
+            )
+            extra["incremental_run"] = {
+                "resumed": bool(watermark),
+                "rows_read": context.rows_read,
+                "skipped_bytes": lines.skipped_bytes,
+            }
+            logger.info(
+                f"Incremental run read {context.rows_read} rows, "
+                f"watermark at byte {lines.offset}"
+            )
         metadata = generate_metadata(
             out_file=output_file,
             mode=mode,
             operation="encrypt",
-            operation_fields=encrypted_fields,
+            operation_fields=operation_fields,
+            extra=extra,
         )
         with open(f"{output_file}.metadata.json", "w") as meta_file:
             json.dump(metadata, meta_file, indent=4)
@@ -0,0 +1,246 @@
+import base64
+import json
+from contextlib import ExitStack
+from typing import Dict, List
+
+from piicrypto.helpers.cipher_backend import get_cipher_backend
+from piicrypto.helpers.integrity import ColumnStats
+from piicrypto.helpers.json_paths import PathMatcher
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.helpers.nonce_source import create_nonce_source
+from piicrypto.helpers.stream_io import HashingWriter, TrackedLineReader
+from piicrypto.helpers.utils import generate_metadata
+from piicrypto.key_provider.key_manager import KeyManager
+
+logger = setup_logger(name=__name__)
+
+NONCE_SIZE = 12
+
+
+def resolve_field_paths(key_manager: KeyManager) -> Dict[str, str]:
+    """
+    Map every path configured for an encrypted field to the field name.
+    A field's name and each of its aliases are read as dotted or
+    JSONPath-like paths ('ssn', 'user.ssn', '$.orders[*].card').
+    """
+    paths = {}
+    for field_name in key_manager.fields_to_encrypt:
+        aliases = key_manager.field_to_alias.get(field_name) or []
+        if isinstance(aliases, str):
+            aliases = [aliases]
+        for path in [field_name, *aliases]:
+            paths[path] = field_name
+    return paths
+
+
+def _select_paths(field_paths: Dict[str, str], paths: List[str]) -> Dict[str, str]:
+    if not paths:
+        return field_paths
+    unknown = [path for path in paths if path not in field_paths]
+    if unknown:
+        logger.error(f"Paths not configured for encryption: {unknown}")
+        raise ValueError(f"Paths not configured for encryption: {unknown}")
+    return {path: field_paths[path] for path in paths}
+
+
+def encrypt_value(key: bytes, value, nonce: bytes, backend: str = "auto") -> str:
+    """
+    Encrypt a JSON value of any type. The nonce is stored with the
+    ciphertext since several values of a document (e.g. array elements)
+    share the same key.
+    """
+    sealed = get_cipher_backend(backend).encrypt(key, nonce, json.dumps(value).encode())
+    return base64.b64encode(nonce + sealed).decode()
+
+
+def decrypt_value(key: bytes, data: str, backend: str = "auto"):
+    """
+    Decrypt a value produced by `encrypt_value`, restoring its JSON type.
+    """
+    data = base64.b64decode(data)
+    plaintext = get_cipher_backend(backend).decrypt(
+        key, data[:NONCE_SIZE], data[NONCE_SIZE:]
+    )
+    return json.loads(plaintext)
+
+
+def _documents(lines: TrackedLineReader, input_file: str):
+    for line_num, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON on line {line_num} of {input_file}: {e}")
+            raise ValueError(
+                f"Invalid JSON on line {line_num} of {input_file}: {e}"
+            ) from e
+
+
+def _save_metadata(
+    output_file: str,
+    mode: str,
+    operation: str,
+    fields: set,
+    lines: TrackedLineReader,
+    outfile: HashingWriter,
+    stats: ColumnStats,
+    extra: dict = None,
+):
+    metadata = generate_metadata(
+        out_file=output_file,
+        mode=mode,
+        operation=operation,
+        operation_fields=fields,
+        extra={
+            **(extra or {}),
+            "integrity": {"input": lines.describe(), "output": outfile.describe()},
+            "stats": stats.describe(),
+        },
+    )
+    with open(f"{output_file}.metadata.json", "w") as meta_file:
+        json.dump(metadata, meta_file, indent=4)
+    logger.info(f"Metadata saved to {output_file}.metadata.json")
+
+
+def encrypt_jsonl_file(
+    input_file: str,
+    output_file: str,
+    mode: str,
+    key_provider_config: str,
+    create_metadata: bool = False,
+    nonce_scheme: str = "random",
+    paths: List[str] = None,
+    cipher_backend: str = "auto",
+):
+    """
+    Encrypt the values at the configured paths of every document in a JSON
+    Lines file, one line at a time. Paths are compiled once per run; see
+    `resolve_field_paths`. `paths` restricts the run to some of them.
+    Each encrypted value is replaced by '<version>:<base64 nonce+tag+ct>'.
+    `cipher_backend` selects the AES-GCM implementation, as for
+    `encrypt_csv_file`.
+    """
+    logger.info(f"Starting JSONL encryption of {input_file} to {output_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    backend = get_cipher_backend(cipher_backend)
+    logger.info(f"Using cipher backend: {backend.name}")
+    keys = key_manager.load_keys()
+    field_paths = _select_paths(resolve_field_paths(key_manager), paths)
+    field_keys = {}
+    for path, field_name in list(field_paths.items()):
+        if field_name not in keys:
+            logger.info(f"Skipping path without key: {path}")
+            del field_paths[path]
+            continue
+        version, key = keys[field_name]
+        field_keys[field_name] = (version, base64.b64decode(key))
+    matcher = PathMatcher({path: path for path in field_paths})
+    nonce_source = create_nonce_source(nonce_scheme)
+    stats = ColumnStats(list(field_paths))
+    encrypted_fields = set()
+
+    def encrypt(value, path):
+        field_name = field_paths[path]
+        version, key = field_keys[field_name]
+        encrypted_fields.add(field_name)
+        stats.count_processed(path, version)
+        return f"{version}:" + encrypt_value(
+            key, value, nonce_source.next_nonce(), backend.name
+        )
+
+    with ExitStack() as stack:
+        lines = TrackedLineReader(stack.enter_context(open(input_file, "rb")))
+        outfile = HashingWriter(stack.enter_context(open(output_file, "wb")))
+        for line_num, document in _documents(lines, input_file):
+            stats.count_row()
+            document = matcher.apply(document, encrypt)
+            outfile.write(json.dumps(document, ensure_ascii=False) + "\n")
+            logger.info(f"Encrypted document on line {line_num}")
+    if create_metadata:
+        _save_metadata(
+            output_file,
+            mode,
+            "encrypt",
+            encrypted_fields,
+            lines,
+            outfile,
+            stats,
+            extra={
+                "nonce_scheme": nonce_source.describe(),
+                "cipher_backend": backend.name,
+            },
+        )
+    logger.info(f"JSONL file encrypted successfully at {output_file}.")
+
+
+def decrypt_jsonl_file(
+    input_file: str,
+    output_file: str,
+    mode: str,
+    key_provider_config: str,
+    create_metadata: bool = False,
+    paths: List[str] = None,
+    cipher_backend: str = "auto",
+):
+    """
+    Decrypt the values at the configured paths of every document in a JSON
+    Lines file produced by `encrypt_jsonl_file`. Values that fail to decrypt
+    are left as they are and counted as errors. Values without a known key
+    version prefix (plaintext such as 'a: b') are left as they are.
+    """
+    logger.info(f"Starting JSONL decryption of {input_file} to {output_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    backend = get_cipher_backend(cipher_backend)
+    logger.info(f"Using cipher backend: {backend.name}")
+    field_paths = _select_paths(resolve_field_paths(key_manager), paths)
+    matcher = PathMatcher({path: path for path in field_paths})
+    version_keys = {}
+    stats = ColumnStats(list(field_paths))
+    decrypted_fields = set()
+
+    def decrypt(value, path):
+        if not isinstance(value, str) or ":" not in value:
+            return value
+        field_name = field_paths[path]
+        version, data = value.split(":", 1)
+        if version not in version_keys:
+            try:
+                version_keys[version] = key_manager.get_keys_by_version(version) or {}
+            except ValueError:
+                version_keys[version] = {}
+            if not version_keys[version]:
+                logger.info(f"Leaving value at '{path}' without key version as is")
+        if field_name not in version_keys[version]:
+            return value
+        try:
+            key = base64.b64decode(version_keys[version][field_name])
+            value = decrypt_value(key, data, backend.name)
+        except (ValueError, KeyError) as e:
+            logger.error(f"Error decrypting path '{path}': {e}")
+            stats.count_error()
+            return value
+        decrypted_fields.add(field_name)
+        stats.count_processed(path, version)
+        return value
+
+    with ExitStack() as stack:
+        lines = TrackedLineReader(stack.enter_context(open(input_file, "rb")))
+        outfile = HashingWriter(stack.enter_context(open(output_file, "wb")))
+        for line_num, document in _documents(lines, input_file):
+            stats.count_row()
+            document = matcher.apply(document, decrypt)
+            outfile.write(json.dumps(document, ensure_ascii=False) + "\n")
+            logger.info(f"Decrypted document on line {line_num}")
+    if create_metadata:
+        _save_metadata(
+            output_file,
+            mode,
+            "decrypt",
+            decrypted_fields,
+            lines,
+            outfile,
+            stats,
+            extra={"cipher_backend": backend.name},
+        )
+    logger.info(f"JSONL file decrypted successfully at {output_file}.")
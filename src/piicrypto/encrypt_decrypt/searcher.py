@@ -0,0 +1,115 @@
+import csv
+from contextlib import ExitStack
+from typing import List
+
+from piicrypto.encrypt_decrypt.decryptor import RowDecryptionContext, decrypt_row
+from piicrypto.helpers.blind_index import blind_index, blind_index_column
+from piicrypto.helpers.cipher_backend import get_cipher_backend
+from piicrypto.helpers.dialects import (
+    FixedWidthSpec,
+    read_header,
+    resolve_dialect,
+    row_reader,
+    row_writer,
+)
+from piicrypto.helpers.integrity import ColumnStats
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.helpers.stream_io import HashingWriter, TrackedLineReader
+from piicrypto.helpers.utils import find_best_match
+from piicrypto.key_provider.key_manager import KeyManager
+
+logger = setup_logger(name=__name__)
+
+
+def search_csv_file(
+    input_file: str,
+    mode: str,
+    key_provider_config: str,
+    column: str,
+    value: str,
+    output_file: str = None,
+    dialect: str = "auto",
+    fixed_width_spec: str = None,
+    cipher_backend: str = "auto",
+) -> List[int]:
+    """
+    Find the rows of an encrypted file whose `column` holds `value`, using
+    the blind index column '<column>_bidx' written by `encrypt_csv_file`.
+
+    The query is hashed once per key version found in the column and each
+    row costs a string comparison; nothing is decrypted while scanning.
+    With `output_file`, only the matching rows are decrypted and written.
+    Blind indexes are truncated, so a match is a candidate with a
+    negligible false positive rate rather than a proof.
+
+    :return: 0-based positions of the matching rows in the file.
+    """
+    logger.info(f"Searching {input_file} for {column}")
+    key_manager = KeyManager(mode, key_provider_config)
+    fields_to_alias = key_manager.field_to_alias
+    field_alias = (
+        find_best_match(column, fields_to_alias) if fields_to_alias else column
+    )
+    if field_alias not in key_manager.blind_index_fields:
+        logger.error(f"Column '{column}' has no blind index configured.")
+        raise ValueError(f"Column '{column}' has no blind index configured.")
+    backend = get_cipher_backend(cipher_backend)
+    queries = {}
+    matches = []
+    with ExitStack() as stack:
+        infile = stack.enter_context(open(input_file, "rb"))
+        input_dialect = resolve_dialect(infile, dialect, fixed_width_spec)
+        lines = TrackedLineReader(infile)
+        _, fieldnames = read_header(lines, input_dialect)
+        index_column = blind_index_column(column)
+        if index_column not in fieldnames:
+            logger.error(f"Input file {input_file} has no {index_column} column.")
+            raise ValueError(f"Input file {input_file} has no {index_column} column.")
+        position = fieldnames.index(index_column)
+        if isinstance(input_dialect, FixedWidthSpec):
+            records = (
+                [row[name] for name in fieldnames]
+                for row in row_reader(lines, fieldnames, input_dialect)
+            )
+        else:
+            records = csv.reader(lines, input_dialect)
+        writer = None
+        if output_file:
+            outfile = HashingWriter(stack.enter_context(open(output_file, "wb")))
+            output_dialect = input_dialect
+            if isinstance(input_dialect, FixedWidthSpec):
+                output_dialect = input_dialect.decrypted()
+            writer = row_writer(outfile, fieldnames, output_dialect)
+            writer.writeheader()
+            context = RowDecryptionContext(
+                fieldnames=fieldnames,
+                key_manager=key_manager,
+                stats=ColumnStats(fieldnames),
+                cipher_backend=backend.name,
+            )
+        for row_num, record in enumerate(records):
+            cell = record[position] if position < len(record) else ""
+            if not cell:
+                continue
+            version, tag = cell.split(":", 1)
+            if version not in queries:
+                try:
+                    keys = key_manager.get_keys_by_version(version) or {}
+                except ValueError:
+                    keys = {}
+                queries[version] = (
+                    blind_index(keys[field_alias], value)
+                    if field_alias in keys
+                    else None
+                )
+                if queries[version] is None:
+                    logger.warning(f"No key for {field_alias} in version {version}")
+            if tag != queries[version]:
+                continue
+            matches.append(row_num)
+            if writer:
+                row = dict(zip(fieldnames, record))
+                decrypt_row(row, context)
+                writer.writerow(row)
+    logger.info(f"Found {len(matches)} rows matching {column} in {input_file}")
+    return matches
@@ -0,0 +1,418 @@
+import base64
+import json
+import sqlite3
+from typing import List
+
+from piicrypto.encrypt_decrypt.encryptor import resolve_encrypted_columns
+from piicrypto.helpers.cipher_backend import decode_key, get_cipher_backend
+from piicrypto.helpers.integrity import ColumnStats
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.helpers.nonce_source import create_nonce_source
+from piicrypto.helpers.utils import find_best_match, generate_metadata
+from piicrypto.key_provider.key_manager import KeyManager
+
+logger = setup_logger(name=__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+NONCE_COLUMN = "row_iv"
+
+# Plaintexts carry a one-byte type tag so decryption restores SQLite types.
+_TYPE_TAGS = {int: b"i", float: b"f", str: b"s", bytes: b"b"}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _pack_value(value) -> bytes:
+    tag = _TYPE_TAGS[type(value)]
+    if isinstance(value, bytes):
+        return tag + value
+    return tag + str(value if not isinstance(value, float) else repr(value)).encode()
+
+
+def _unpack_value(data: bytes):
+    tag, payload = data[:1], data[1:]
+    if tag == b"i":
+        return int(payload)
+    if tag == b"f":
+        return float(payload)
+    if tag == b"b":
+        return payload
+    return payload.decode()
+
+
+def _table_info(connection: sqlite3.Connection, table: str):
+    """
+    Return the columns of a table with their declared types and the key
+    used for keyset pagination (the single-column primary key, or rowid).
+    """
+    info = connection.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+    if not info:
+        logger.error(f"Table {table} not found.")
+        raise ValueError(f"Table {table} not found.")
+    columns = [(row[1], row[2]) for row in info]
+    primary_key = [row[1] for row in sorted(info, key=lambda r: r[5]) if row[5]]
+    if len(primary_key) > 1:
+        logger.error(f"Table {table} has a composite primary key.")
+        raise ValueError(f"Table {table} has a composite primary key.")
+    return columns, primary_key[0] if primary_key else "rowid"
+
+
+def _batches(
+    connection: sqlite3.Connection,
+    table: str,
+    key: str,
+    columns: List[str],
+    batch_size: int,
+    start_key=None,
+    where: str = None,
+):
+    """
+    Yield batches of (key, *columns) rows ordered by `key`, each query
+    starting after the last key of the previous batch.
+    """
+    selected = ", ".join(_quote(c) for c in [key, *columns])
+    conditions = [where] if where else []
+    last_key = start_key
+    while True:
+        clauses = conditions + ([f"{_quote(key)} > ?"] if last_key is not None else [])
+        query = f"SELECT {selected} FROM {_quote(table)}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY {_quote(key)} LIMIT ?"
+        params = ([last_key] if last_key is not None else []) + [batch_size]
+        rows = connection.execute(query, params).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_key = rows[-1][0]
+
+
+def _create_output_table(
+    connection: sqlite3.Connection,
+    output_table: str,
+    columns: list,
+    key: str,
+    with_nonce: bool,
+):
+    definitions = [
+        f"{_quote(name)} {declared_type}".strip() for name, declared_type in columns
+    ]
+    if with_nonce:
+        definitions.append(f"{_quote(NONCE_COLUMN)} TEXT")
+    if key != "rowid":
+        definitions.append(f"PRIMARY KEY ({_quote(key)})")
+    connection.execute(
+        f"CREATE TABLE IF NOT EXISTS {_quote(output_table)} ({', '.join(definitions)})"
+    )
+
+
+def _insert_statement(output_table: str, columns: List[str]) -> str:
+    placeholders = ", ".join("?" for _ in columns)
+    return (
+        f"INSERT INTO {_quote(output_table)} "
+        f"({', '.join(_quote(c) for c in columns)}) VALUES ({placeholders})"
+    )
+
+
+def _update_statement(table: str, key: str, assignments: List[str]) -> str:
+    return (
+        f"UPDATE {_quote(table)} SET {', '.join(assignments)} "
+        f"WHERE {_quote(key)} = ?"
+    )
+
+
+def _resume_key(connection: sqlite3.Connection, output_table: str, key: str):
+    row = connection.execute(
+        f"SELECT MAX({_quote(key)}) FROM {_quote(output_table)}"
+    ).fetchone()
+    return row[0]
+
+
+def _save_metadata(database: str, table: str, mode: str, operation: str, fields, extra):
+    metadata = generate_metadata(
+        out_file=database,
+        mode=mode,
+        operation=operation,
+        operation_fields=fields,
+        extra=extra,
+    )
+    path = f"{database}.{table}.metadata.json"
+    with open(path, "w") as meta_file:
+        json.dump(metadata, meta_file, indent=4)
+    logger.info(f"Metadata saved to {path}")
+
+
+def encrypt_sqlite_table(
+    database: str,
+    table: str,
+    mode: str,
+    key_provider_config: str,
+    output_table: str = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    create_metadata: bool = False,
+    nonce_scheme: str = "random",
+    cipher_backend: str = "auto",
+):
+    """
+    Encrypt the configured columns of a SQLite table, in place or into
+    `output_table`, in keyset-paginated batches of `batch_size` rows.
+    Each batch is written with `executemany` and committed in its own
+    transaction. The per-row nonce is stored in a 'row_iv' column and values
+    keep their SQLite type through a type tag inside the ciphertext.
+
+    The run is resumable: in place, rows that already have a nonce are
+    skipped; into `output_table`, reading restarts after its largest key.
+    """
+    logger.info(f"Starting encryption of table {table} in {database}")
+    key_manager = KeyManager(mode, key_provider_config)
+    keys = key_manager.load_keys()
+    nonce_source = create_nonce_source(nonce_scheme)
+    backend = get_cipher_backend(cipher_backend)
+    connection = sqlite3.connect(database)
+    try:
+        columns, key = _table_info(connection, table)
+        has_nonce = any(name == NONCE_COLUMN for name, _ in columns)
+        columns = [column for column in columns if column[0] != NONCE_COLUMN]
+        names = [name for name, _ in columns]
+        plan = resolve_encrypted_columns(
+            [name for name in names if name != key], key_manager, keys
+        )
+        plan = {
+            name: (version, decode_key(material))
+            for name, (version, material) in plan.items()
+        }
+        encrypted = list(plan)
+        stats = ColumnStats(encrypted)
+        start_key = None
+        where = None
+        if output_table:
+            with connection:
+                _create_output_table(connection, output_table, columns, key, True)
+            start_key = _resume_key(connection, output_table, key)
+            selected = names
+            # rowid tables keep their rowids so the output can be resumed
+            keep_key = key not in names
+            statement = _insert_statement(
+                output_table, [key] * keep_key + [*names, NONCE_COLUMN]
+            )
+        else:
+            if not has_nonce:
+                with connection:
+                    connection.execute(
+                        f"ALTER TABLE {_quote(table)} "
+                        f"ADD COLUMN {_quote(NONCE_COLUMN)} TEXT"
+                    )
+            where = f"{_quote(NONCE_COLUMN)} IS NULL"
+            selected = encrypted
+            statement = _update_statement(
+                table, key, [f"{_quote(c)} = ?" for c in [*encrypted, NONCE_COLUMN]]
+            )
+        if start_key is not None:
+            logger.info(f"Resuming after {key} {start_key}")
+
+        batches = 0
+        for rows in _batches(
+            connection, table, key, selected, batch_size, start_key, where
+        ):
+            params = []
+            for row in rows:
+                stats.count_row()
+                nonce = nonce_source.next_nonce()
+                values = dict(zip(selected, row[1:]))
+                for name in encrypted:
+                    value = values[name]
+                    if value is None:
+                        stats.count_empty(name)
+                        continue
+                    version, material = plan[name]
+                    sealed = backend.encrypt(material, nonce, _pack_value(value))
+                    values[name] = f"{version}:" + base64.b64encode(sealed).decode()
+                    stats.count_processed(name, version)
+                row_iv = base64.b64encode(nonce).decode()
+                if output_table:
+                    params.append(
+                        [row[0]] * keep_key + [*(values[n] for n in names), row_iv]
+                    )
+                else:
+                    params.append(
+                        [*(values[name] for name in encrypted), row_iv, row[0]]
+                    )
+            with connection:
+                connection.executemany(statement, params)
+            batches += 1
+            logger.info(f"Encrypted batch {batches} ending at {key} {rows[-1][0]}")
+    finally:
+        connection.close()
+    if create_metadata:
+        _save_metadata(
+            database,
+            output_table or table,
+            mode,
+            "encrypt",
+            set(encrypted),
+            {
+                "table": table,
+                "output_table": output_table or table,
+                "key_column": key,
+                "resumed_after": start_key,
+                "batches": batches,
+                "nonce_scheme": nonce_source.describe(),
+                "cipher_backend": backend.name,
+                "stats": stats.describe(),
+            },
+        )
+    logger.info(f"Table {table} encrypted successfully in {database}.")
+
+
+def decrypt_sqlite_table(
+    database: str,
+    table: str,
+    mode: str,
+    key_provider_config: str,
+    output_table: str = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    create_metadata: bool = False,
+    cipher_backend: str = "auto",
+):
+    """
+    Decrypt a table encrypted by `encrypt_sqlite_table`, in place or into
+    `output_table` (without the nonce column), restoring the original
+    SQLite types. Batching and resuming work as for encryption: in place,
+    decrypted rows have their nonce cleared and are skipped on a rerun.
+    A row with a cell that cannot be decrypted (missing key, failed tag) is
+    left untouched in place, nonce included, so it can be retried.
+    """
+    logger.info(f"Starting decryption of table {table} in {database}")
+    key_manager = KeyManager(mode, key_provider_config)
+    fields_to_alias = key_manager.field_to_alias
+    backend = get_cipher_backend(cipher_backend)
+    version_keys = {}
+    connection = sqlite3.connect(database)
+    try:
+        columns, key = _table_info(connection, table)
+        names = [name for name, _ in columns if name != NONCE_COLUMN]
+        if NONCE_COLUMN not in [name for name, _ in columns]:
+            logger.error(f"Table {table} has no {NONCE_COLUMN} column.")
+            raise ValueError(f"Table {table} has no {NONCE_COLUMN} column.")
+        candidates = list(
+            resolve_encrypted_columns(
+                [name for name in names if name != key],
+                key_manager,
+                key_manager.load_keys(),
+            )
+        )
+        aliases = {
+            name: find_best_match(name, fields_to_alias) if fields_to_alias else name
+            for name in candidates
+        }
+        stats = ColumnStats(candidates)
+        decrypted_fields = set()
+        start_key = None
+        where = f"{_quote(NONCE_COLUMN)} IS NOT NULL"
+        if output_table:
+            with connection:
+                _create_output_table(
+                    connection,
+                    output_table,
+                    [c for c in columns if c[0] != NONCE_COLUMN],
+                    key,
+                    False,
+                )
+            start_key = _resume_key(connection, output_table, key)
+            where = None
+            keep_key = key not in names
+            statement = _insert_statement(output_table, [key] * keep_key + names)
+        else:
+            statement = _update_statement(
+                table,
+                key,
+                [f"{_quote(c)} = ?" for c in [*candidates, NONCE_COLUMN]],
+            )
+        selected = [*names, NONCE_COLUMN]
+
+        batches = 0
+        for rows in _batches(
+            connection, table, key, selected, batch_size, start_key, where
+        ):
+            params = []
+            for row in rows:
+                stats.count_row()
+                values = dict(zip(selected, row[1:]))
+                nonce = values[NONCE_COLUMN]
+                failed = False
+                for name in candidates:
+                    value = values[name]
+                    if value is None:
+                        stats.count_empty(name)
+                    if not nonce or not isinstance(value, str) or ":" not in value:
+                        continue
+                    version, data = value.split(":", 1)
+                    if version not in version_keys:
+                        try:
+                            version_keys[version] = (
+                                key_manager.get_keys_by_version(version) or {}
+                            )
+                        except ValueError:
+                            version_keys[version] = {}
+                    if not version_keys[version]:
+                        # not a key version: a plaintext value holding ':'
+                        continue
+                    material = version_keys[version].get(aliases[name])
+                    if material is None:
+                        logger.error(f"No key for column '{name}' in {version}")
+                        stats.count_error()
+                        failed = True
+                        continue
+                    try:
+                        values[name] = _unpack_value(
+                            backend.decrypt(
+                                decode_key(material),
+                                base64.b64decode(nonce),
+                                base64.b64decode(data),
+                            )
+                        )
+                    except ValueError as e:
+                        logger.error(f"Error decrypting column '{name}': {e}")
+                        stats.count_error()
+                        failed = True
+                        continue
+                    decrypted_fields.add(name)
+                    stats.count_processed(name, version)
+                if output_table:
+                    params.append([row[0]] * keep_key + [values[n] for n in names])
+                elif failed:
+                    logger.warning(f"Keeping {key} {row[0]} encrypted for a rerun")
+                    original = dict(zip(selected, row[1:]))
+                    params.append(
+                        [*(original[name] for name in candidates), nonce, row[0]]
+                    )
+                else:
+                    params.append(
+                        [*(values[name] for name in candidates), None, row[0]]
+                    )
+            with connection:
+                connection.executemany(statement, params)
+            batches += 1
+            logger.info(f"Decrypted batch {batches} ending at {key} {rows[-1][0]}")
+    finally:
+        connection.close()
+    if create_metadata:
+        _save_metadata(
+            database,
+            output_table or table,
+            mode,
+            "decrypt",
+            decrypted_fields,
+            {
+                "table": table,
+                "output_table": output_table or table,
+                "key_column": key,
+                "resumed_after": start_key,
+                "batches": batches,
+                "cipher_backend": backend.name,
+                "stats": stats.describe(),
+            },
+        )
+    logger.info(f"Table {table} decrypted successfully in {database}.")
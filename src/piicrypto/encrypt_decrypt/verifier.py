@@ -0,0 +1,184 @@
+import base64
+import csv
+from collections import Counter, deque
+from contextlib import ExitStack
+from multiprocessing import get_context
+
+from piicrypto.helpers.blind_index import blind_index_columns
+from piicrypto.helpers.cipher_backend import get_cipher_backend
+from piicrypto.helpers.dialects import read_header, resolve_dialect, row_reader
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.helpers.stream_io import TrackedLineReader
+from piicrypto.helpers.utils import (
+    PACKED_COLUMN_PREFIX,
+    find_best_match,
+    iter_blocks,
+    packed_key_field,
+)
+from piicrypto.key_provider.key_manager import KeyManager
+
+logger = setup_logger(name=__name__)
+
+REPORT_FIELDS = ["row_number", "column", "key_version", "error"]
+
+
+def _verify_task(task: tuple) -> list:
+    """
+    Authenticate every cell of a block, returning the failures.
+    A task is (cells, keys, backend) where cells are
+    (row number, column, version, alias, ciphertext, nonce) tuples, keys
+    maps (version, alias) to raw key bytes and backend names the cipher
+    backend.
+    """
+    cells, keys, backend = task
+    backend = get_cipher_backend(backend)
+    failures = []
+    for row_num, column, version, alias, encrypted_data, nonce in cells:
+        key = keys.get((version, alias))
+        if key is None:
+            failures.append((row_num, column, version, "No key for version"))
+            continue
+        try:
+            backend.decrypt(
+                key, base64.b64decode(nonce), base64.b64decode(encrypted_data)
+            )
+        except (ValueError, KeyError) as e:
+            failures.append((row_num, column, version, str(e)))
+    return failures
+
+
+class _KeyCache:
+    """
+    Raw key bytes per (version, alias), loading each version once.
+    """
+
+    def __init__(self, key_manager: KeyManager):
+        self.key_manager = key_manager
+        self.keys = {}
+        self.versions = set()
+
+    def for_cells(self, cells: list) -> dict:
+        needed = {(version, alias) for _, _, version, alias, _, _ in cells}
+        for version in {version for version, _ in needed} - self.versions:
+            self.versions.add(version)
+            try:
+                version_keys = self.key_manager.get_keys_by_version(version) or {}
+            except ValueError:
+                logger.error(f"No keys found for version {version}")
+                version_keys = {}
+            for alias, key in version_keys.items():
+                self.keys[(version, alias)] = base64.b64decode(key)
+        return {pair: self.keys[pair] for pair in needed if pair in self.keys}
+
+
+def _iter_tasks(
+    reader, aliases: dict, key_cache: _KeyCache, block_size: int, backend: str
+):
+    for block in iter_blocks(enumerate(reader), block_size):
+        cells = []
+        for row_num, row in block:
+            for column, alias in aliases.items():
+                value = row[column]
+                if not value or ":" not in value:
+                    continue
+                version, encrypted_data = value.split(":", 1)
+                cells.append(
+                    (row_num, column, version, alias, encrypted_data, row["row_iv"])
+                )
+        yield len(block), (cells, key_cache.for_cells(cells), backend)
+
+
+def verify_csv_file(
+    input_file: str,
+    mode: str,
+    key_provider_config: str,
+    report_file: str = None,
+    workers: int = 1,
+    block_size: int = 1024,
+    dialect: str = "auto",
+    fixed_width_spec: str = None,
+    cipher_backend: str = "auto",
+) -> dict:
+    """
+    Authenticate every encrypted cell of a CSV file without writing any
+    plaintext. Each cell's AES-GCM tag is verified with keys cached per
+    version; failures are written to `report_file` (row, column, key
+    version, error) if given. Blocks of `block_size` rows are spread over
+    `workers` processes. The dialect is detected or given as for
+    `decrypt_csv_file`. `cipher_backend` selects the AES-GCM implementation.
+
+    :return: summary with the number of rows, verified cells and failures,
+        plus failure counts per key version.
+    """
+    if block_size < 1:
+        logger.error("block_size must be a positive integer.")
+        raise ValueError("block_size must be a positive integer.")
+    logger.info(f"Starting verification of {input_file}")
+    key_manager = KeyManager(mode, key_provider_config)
+    fields_to_alias = key_manager.field_to_alias
+    key_cache = _KeyCache(key_manager)
+    backend = get_cipher_backend(cipher_backend).name
+    summary = {"rows": 0, "cells": 0, "failures": 0}
+    failures_by_version = Counter()
+    with ExitStack() as stack:
+        infile = stack.enter_context(open(input_file, "rb"))
+        report_writer = None
+        if report_file:
+            report_writer = csv.writer(stack.enter_context(open(report_file, "w")))
+            report_writer.writerow(REPORT_FIELDS)
+        input_dialect = resolve_dialect(infile, dialect, fixed_width_spec)
+        lines = TrackedLineReader(infile)
+        _, fieldnames = read_header(lines, input_dialect)
+        reader = row_reader(lines, fieldnames, input_dialect)
+        if "row_iv" not in fieldnames:
+            logger.error(f"Input file {input_file} has no row_iv column.")
+            raise ValueError(f"Input file {input_file} has no row_iv column.")
+        aliases = {}
+        skipped = blind_index_columns(
+            fieldnames, fields_to_alias, key_manager.blind_index_fields
+        )
+        skipped.add("row_iv")
+        for column in fieldnames:
+            if column in skipped:
+                continue
+            alias = packed_key_field(column, key_manager.key_groups) or (
+                find_best_match(column, fields_to_alias) if fields_to_alias else column
+            )
+            if column.startswith(PACKED_COLUMN_PREFIX) or (
+                alias in key_manager.fields_to_encrypt
+            ):
+                aliases[column] = alias
+        tasks = _iter_tasks(reader, aliases, key_cache, block_size, backend)
+
+        def collect(rows: int, task: tuple, failures: list):
+            summary["rows"] += rows
+            summary["cells"] += len(task[0])
+            summary["failures"] += len(failures)
+            failures_by_version.update(version for _, _, version, _ in failures)
+            if report_writer:
+                report_writer.writerows(failures)
+
+        if workers > 1:
+            with get_context("spawn").Pool(workers) as pool:
+                pending = deque()
+                for rows, task in tasks:
+                    pending.append(
+                        (rows, task, pool.apply_async(_verify_task, (task,)))
+                    )
+                    if len(pending) >= 2 * workers:
+                        rows, task, result = pending.popleft()
+                        collect(rows, task, result.get())
+                while pending:
+                    rows, task, result = pending.popleft()
+                    collect(rows, task, result.get())
+        else:
+            for rows, task in tasks:
+                collect(rows, task, _verify_task(task))
+    summary["failures_by_version"] = dict(failures_by_version)
+    if report_file:
+        logger.info(f"Verification report saved to {report_file}")
+    logger.info(
+        f"Verified {summary['cells']} cells in {summary['rows']} rows of "
+        f"{input_file}: {summary['failures']} failures"
+    )
+    return summary
@@ -0,0 +1,69 @@
+import base64
+import hashlib
+import hmac
+import math
+import unicodedata
+from functools import lru_cache
+from typing import List, Set
+
+from piicrypto.helpers.cipher_backend import decode_key
+from piicrypto.helpers.utils import find_best_match
+
+BLIND_INDEX_SUFFIX = "_bidx"
+BLIND_INDEX_BYTES = 8
+# Base64 length of a truncated tag
+BLIND_INDEX_WIDTH = 4 * math.ceil(BLIND_INDEX_BYTES / 3)
+DERIVATION_LABEL = b"piicrypto blind index v1"
+
+
+def blind_index_column(column: str) -> str:
+    """
+    Name of the blind index column of an encrypted column.
+    """
+    return f"{column}{BLIND_INDEX_SUFFIX}"
+
+
+def blind_index_columns(
+    fieldnames: List[str], fields_to_alias: dict, blind_index_fields: List[str]
+) -> Set[str]:
+    """
+    Columns of a file holding the blind indexes the provider config generates:
+    '<column>_bidx' for each column whose field has 'blind_index'. Other
+    columns ending in '_bidx' are regular columns.
+    """
+    columns = set()
+    for name in fieldnames:
+        field_alias = (
+            find_best_match(name, fields_to_alias) if fields_to_alias else name
+        )
+        if field_alias in blind_index_fields:
+            columns.add(blind_index_column(name))
+    return columns.intersection(fieldnames)
+
+
+def normalize(value: str) -> str:
+    """
+    Normalize a value before hashing, so lookups ignore case, Unicode
+    compatibility forms and surrounding or repeated whitespace.
+    """
+    return " ".join(unicodedata.normalize("NFKC", value).casefold().split())
+
+
+@lru_cache(maxsize=256)
+def derive_blind_index_key(key: str) -> bytes:
+    """
+    HMAC key of a blind index, derived from the field's AES key of the same
+    version so it is rotated with it but never used for both purposes.
+    """
+    return hmac.new(decode_key(key), DERIVATION_LABEL, hashlib.sha256).digest()
+
+
+def blind_index(key: str, value: str) -> str:
+    """
+    Truncated HMAC-SHA256 of the normalized value under the blind index key
+    derived from `key`, Base64-encoded.
+    """
+    tag = hmac.new(
+        derive_blind_index_key(key), normalize(value).encode(), hashlib.sha256
+    ).digest()
+    return base64.b64encode(tag[:BLIND_INDEX_BYTES]).decode()
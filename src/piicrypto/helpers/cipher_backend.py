@@ -0,0 +1,218 @@
+import base64
+import json
+import os
+import platform
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+
+from Crypto.Cipher import AES
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # pragma: no cover - optional dependency
+    AESGCM = None
+
+logger = setup_logger(name=__name__)
+
+TAG_SIZE = 16
+BENCHMARK_MESSAGES = 200
+BENCHMARK_ROUNDS = 3
+CACHE_FILE = "cipher_backend.json"
+
+
+@lru_cache(maxsize=256)
+def decode_key(key: str) -> bytes:
+    """
+    Decode a Base64 key, once per distinct key.
+    """
+    return base64.b64decode(key.encode())
+
+
+class BaseCipherBackend(ABC):
+    """
+    AES-GCM implementation used for every cell.
+    Ciphertexts are tag || ciphertext, whichever backend produced them.
+    """
+
+    name = None
+
+    @abstractmethod
+    def encrypt(self, key: bytes, nonce: bytes, plaintext: bytes) -> bytes:
+        """
+        Encrypt and authenticate, returning tag || ciphertext.
+        """
+        pass
+
+    @abstractmethod
+    def decrypt(self, key: bytes, nonce: bytes, data: bytes) -> bytes:
+        """
+        Verify and decrypt tag || ciphertext, raising ValueError if the tag
+        does not match.
+        """
+        pass
+
+
+class PycryptodomeBackend(BaseCipherBackend):
+    """
+    pycryptodome's AES GCM mode; a cipher object is created per message.
+    """
+
+    name = "pycryptodome"
+
+    def encrypt(self, key: bytes, nonce: bytes, plaintext: bytes) -> bytes:
+        ciphertext, tag = AES.new(key, AES.MODE_GCM, nonce=nonce).encrypt_and_digest(
+            plaintext
+        )
+        return tag + ciphertext
+
+    def decrypt(self, key: bytes, nonce: bytes, data: bytes) -> bytes:
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        return cipher.decrypt_and_verify(data[TAG_SIZE:], data[:TAG_SIZE])
+
+
+class CryptographyBackend(BaseCipherBackend):
+    """
+    `cryptography`'s OpenSSL-backed AESGCM, with one reusable object per key.
+    AESGCM produces ciphertext || tag, which is reordered to tag || ciphertext.
+    """
+
+    name = "cryptography"
+
+    def __init__(self):
+        if AESGCM is None:
+            logger.error("The 'cryptography' cipher backend is not installed.")
+            raise ValueError("The 'cryptography' cipher backend is not installed.")
+        self._ciphers = {}
+
+    def _cipher(self, key: bytes):
+        cipher = self._ciphers.get(key)
+        if cipher is None:
+            cipher = self._ciphers[key] = AESGCM(key)
+        return cipher
+
+    def encrypt(self, key: bytes, nonce: bytes, plaintext: bytes) -> bytes:
+        sealed = self._cipher(key).encrypt(nonce, plaintext, None)
+        return sealed[-TAG_SIZE:] + sealed[:-TAG_SIZE]
+
+    def decrypt(self, key: bytes, nonce: bytes, data: bytes) -> bytes:
+        try:
+            return self._cipher(key).decrypt(
+                nonce, data[TAG_SIZE:] + data[:TAG_SIZE], None
+            )
+        except InvalidTag as e:
+            raise ValueError("MAC check failed") from e
+
+
+CIPHER_BACKENDS = {
+    PycryptodomeBackend.name: PycryptodomeBackend,
+    CryptographyBackend.name: CryptographyBackend,
+}
+
+
+def available_backends() -> list:
+    """
+    Names of the backends that can be used in this environment.
+    """
+    return [
+        name for name in CIPHER_BACKENDS if name != "cryptography" or AESGCM is not None
+    ]
+
+
+def _benchmark(backend: BaseCipherBackend) -> float:
+    key, nonce = bytes(32), bytes(12)
+    message = b"123-45-6789 Ada Lovelace, London"
+    best = None
+    for _ in range(BENCHMARK_ROUNDS):
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_MESSAGES):
+            backend.decrypt(key, nonce, backend.encrypt(key, nonce, message))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _environment_key() -> str:
+    versions = []
+    for package in ("pycryptodome", "cryptography"):
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}=missing")
+    return "|".join(
+        [platform.python_version(), platform.machine(), platform.system(), *versions]
+    )
+
+
+def _cache_path() -> str:
+    cache_dir = os.environ.get(
+        "PIICRYPTO_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "piicrypto"),
+    )
+    return os.path.join(cache_dir, CACHE_FILE)
+
+
+def _read_cached_choice(environment: str):
+    try:
+        with open(_cache_path(), "r") as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if cached.get("environment") != environment:
+        return None
+    return cached.get("backend")
+
+
+def _write_cached_choice(environment: str, backend: str, timings: dict):
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {"environment": environment, "backend": backend, "timings": timings},
+                f,
+                indent=4,
+            )
+    except OSError as e:
+        logger.warning(f"Could not cache the cipher backend choice in {path}: {e}")
+
+
+@lru_cache(maxsize=1)
+def select_cipher_backend() -> str:
+    """
+    Pick the fastest available backend. The choice is cached per
+    environment (Python, platform and library versions) in
+    '~/.cache/piicrypto' (or $PIICRYPTO_CACHE_DIR), so the short
+    micro-benchmark only runs when the environment changes.
+    """
+    candidates = available_backends()
+    if len(candidates) == 1:
+        return candidates[0]
+    environment = _environment_key()
+    cached = _read_cached_choice(environment)
+    if cached in candidates:
+        logger.info(f"Using cached cipher backend choice: {cached}")
+        return cached
+    timings = {name: _benchmark(CIPHER_BACKENDS[name]()) for name in candidates}
+    choice = min(timings, key=timings.get)
+    logger.info(f"Cipher backend benchmark {timings}, selected {choice}")
+    _write_cached_choice(environment, choice, timings)
+    return choice
+
+
+@lru_cache(maxsize=None)
+def get_cipher_backend(name: str = "auto") -> BaseCipherBackend:
+    """
+    Return the shared instance of a backend: 'pycryptodome', 'cryptography'
+    or 'auto' for the fastest available one.
+    """
+    if name == "auto":
+        name = select_cipher_backend()
+    if name not in CIPHER_BACKENDS:
+        logger.error(f"Unknown cipher backend: {name}")
+        raise ValueError(f"Unknown cipher backend: {name}")
+    return CIPHER_BACKENDS[name]()
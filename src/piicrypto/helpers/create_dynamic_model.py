@@ -73,6 +73,8 @@ def create_dynamic_model(config_json: str) -> type:
             fmt = field_config.get("format", "%Y-%m-%d")
 
             def _parse_date(v, fmt=fmt):
+                if v is None:
+                    return v
                 try:
                     datetime.strptime(v, fmt).date()
                     return v
@@ -87,7 +89,7 @@ def create_dynamic_model(config_json: str) -> type:
             allowed = set(field_config.get("values", []))
 
             def _enum_validator(v, allowed=allowed):
-                if v not in allowed:
+                if v is not None and v not in allowed:
                     raise ValueError(f"Value '{v}' not in allowed list: {allowed}")
                 return v
 
@@ -97,7 +99,5 @@ def create_dynamic_model(config_json: str) -> type:
 
         # Not using Annotations like, fields[field_name] = Annotated[ field_type, *validators, Field(default, **validation_rules), ] due to error cannot use star expression in index
 
-    model = create_model(
-        "RowValidationModel", **fields, __pydantic_validator__=validators
-    )
+    model = create_model("RowValidationModel", **fields, __validators__=validators)
     return model
@@ -0,0 +1,282 @@
+import csv
+import io
+import json
+import math
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple, Union
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+SNIFF_BYTES = 64 * 1024
+SNIFF_DELIMITERS = ",\t|;"
+TAG_SIZE = 16
+ROW_IV_WIDTH = 16
+# UTF-8 needs up to 4 bytes per character
+MAX_BYTES_PER_CHAR = 4
+
+DELIMITERS = {"csv": ",", "tsv": "\t", "pipe": "|", "semicolon": ";"}
+
+
+def delimited_dialect(delimiter: str) -> type:
+    """
+    The default (excel) dialect with another delimiter.
+    """
+    if delimiter == ",":
+        return csv.excel
+    return type(f"delimited_{ord(delimiter)}", (csv.excel,), {"delimiter": delimiter})
+
+
+def sniff_dialect(sample: str) -> type:
+    """
+    Detect the delimiter of a sample of a delimited file.
+    Only the delimiter is taken from the sniffer, so quoting and line
+    endings of the output stay the default ones.
+    """
+    sample = sample[: sample.rfind("\n") + 1] or sample
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=SNIFF_DELIMITERS).delimiter
+    except csv.Error:
+        logger.warning("Could not detect the delimiter, using ','")
+        delimiter = ","
+    logger.info(f"Detected delimiter {delimiter!r}")
+    return delimited_dialect(delimiter)
+
+
+@dataclass
+class FixedWidthColumn:
+    """
+    A column of a fixed-width layout.
+    `source_width` is the width before encryption, for encrypted layouts.
+    """
+
+    name: str
+    width: int
+    source_width: Optional[int] = None
+
+
+@dataclass
+class FixedWidthSpec:
+    """
+    Column layout of a fixed-width file, loaded from a JSON spec:
+    {"columns": [{"name": "id", "width": 8}, ...]}.
+    """
+
+    columns: List[FixedWidthColumn] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, spec_file: str) -> "FixedWidthSpec":
+        try:
+            with open(spec_file, "r") as f:
+                raw = json.load(f)
+            columns = [FixedWidthColumn(**column) for column in raw["columns"]]
+        except FileNotFoundError as e:
+            logger.error(f"Fixed-width spec {spec_file} not found.")
+            raise FileNotFoundError(f"Fixed-width spec {spec_file} not found.") from e
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Invalid fixed-width spec {spec_file}: {e}")
+            raise ValueError(f"Invalid fixed-width spec {spec_file}: {e}") from e
+        if not columns or any(column.width <= 0 for column in columns):
+            logger.error(f"Fixed-width spec {spec_file} needs positive widths.")
+            raise ValueError(f"Fixed-width spec {spec_file} needs positive widths.")
+        return cls(columns)
+
+    def save(self, spec_file: str):
+        with open(spec_file, "w") as f:
+            json.dump(
+                {
+                    "columns": [
+                        {k: v for k, v in vars(column).items() if v is not None}
+                        for column in self.columns
+                    ]
+                },
+                f,
+                indent=4,
+            )
+
+    @property
+    def fieldnames(self) -> List[str]:
+        return [column.name for column in self.columns]
+
+    def describe(self) -> str:
+        """
+        A stable text form of the layout, used in place of a header line.
+        """
+        return json.dumps([[c.name, c.width] for c in self.columns])
+
+    def encrypted(
+        self,
+        columns: Dict[str, Tuple[str, str]],
+        extra_columns: Dict[str, int] = None,
+    ) -> "FixedWidthSpec":
+        """
+        Layout of the encrypted output: encrypted columns are widened to fit
+        '<version>:<base64 tag+ciphertext>' of a value of up to `width`
+        characters in UTF-8, then `extra_columns` (name: width) and a row_iv
+        column are added.
+        """
+        widened = []
+        for column in self.columns:
+            if column.name in columns:
+                version = columns[column.name][0]
+                plaintext_bytes = MAX_BYTES_PER_CHAR * column.width
+                width = (
+                    len(version) + 1 + 4 * math.ceil((TAG_SIZE + plaintext_bytes) / 3)
+                )
+                column = replace(column, width=width, source_width=column.width)
+            widened.append(column)
+        for name, width in (extra_columns or {}).items():
+            widened.append(FixedWidthColumn(name, width))
+        widened.append(FixedWidthColumn("row_iv", ROW_IV_WIDTH))
+        return FixedWidthSpec(widened)
+
+    def decrypted(self) -> "FixedWidthSpec":
+        """
+        Layout of the decrypted output of an encrypted layout.
+        """
+        return FixedWidthSpec(
+            [
+                FixedWidthColumn(column.name, column.source_width or column.width)
+                for column in self.columns
+            ]
+        )
+
+
+class FixedWidthReader:
+    """
+    Parse lines of a fixed-width file into dicts, like `csv.DictReader`.
+    Values are stripped of their trailing padding.
+    """
+
+    def __init__(self, lines, spec: FixedWidthSpec):
+        self.lines = lines
+        self.fieldnames = spec.fieldnames
+        self.slices = []
+        start = 0
+        for column in spec.columns:
+            self.slices.append((column.name, start, start + column.width))
+            start += column.width
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        line = next(self.lines).rstrip("\r\n")
+        while not line:
+            line = next(self.lines).rstrip("\r\n")
+        return {name: line[start:end].rstrip() for name, start, end in self.slices}
+
+
+class FixedWidthWriter:
+    """
+    Write dicts as padded fixed-width lines, like `csv.DictWriter`.
+    A fixed-width file has no header, so `writeheader` writes nothing.
+    """
+
+    def __init__(self, f, spec: FixedWidthSpec):
+        self.f = f
+        self.columns = [(column.name, column.width) for column in spec.columns]
+
+    def writeheader(self):
+        pass
+
+    def _format(self, row: dict) -> str:
+        cells = []
+        for name, width in self.columns:
+            value = row.get(name) or ""
+            if len(value) > width:
+                logger.error(f"Value of column '{name}' exceeds its width {width}")
+                raise ValueError(f"Value of column '{name}' exceeds its width {width}")
+            cells.append(value.ljust(width))
+        return "".join(cells) + "\n"
+
+    def writerow(self, row: dict):
+        self.f.write(self._format(row))
+
+    def writerows(self, rows: list):
+        self.f.write("".join(self._format(row) for row in rows))
+
+
+Dialect = Union[type, FixedWidthSpec]
+
+
+def resolve_dialect(
+    raw, dialect: str = "auto", fixed_width_spec: str = None
+) -> Dialect:
+    """
+    Resolve the dialect of an input once per file: a fixed-width layout, a
+    named delimiter ('csv', 'tsv', 'pipe', 'semicolon'), a single delimiter
+    character, or 'auto' to sniff the first block of the binary file `raw`
+    (its position is restored).
+    """
+    if fixed_width_spec:
+        return FixedWidthSpec.load(fixed_width_spec)
+    if dialect in DELIMITERS:
+        return delimited_dialect(DELIMITERS[dialect])
+    if dialect != "auto":
+        if len(dialect) != 1:
+            logger.error(f"Unknown dialect: {dialect}")
+            raise ValueError(f"Unknown dialect: {dialect}")
+        return delimited_dialect(dialect)
+    position = raw.tell()
+    sample = raw.read(SNIFF_BYTES).decode("utf-8", errors="ignore")
+    raw.seek(position)
+    return sniff_dialect(sample)
+
+
+def describe_dialect(dialect: Dialect) -> dict:
+    """
+    Describe a dialect for the metadata file.
+    """
+    if isinstance(dialect, FixedWidthSpec):
+        return {"fixed_width": [[c.name, c.width] for c in dialect.columns]}
+    return {"delimiter": dialect.delimiter}
+
+
+def read_header(lines, dialect: Dialect) -> Tuple[Optional[str], List[str]]:
+    """
+    Read the header of a delimited file, returning the raw line and the
+    field names. Fixed-width files have no header; their layout is used.
+    """
+    if isinstance(dialect, FixedWidthSpec):
+        return dialect.describe(), dialect.fieldnames
+    header_line = next(lines, None)
+    if header_line is None:
+        return None, []
+    return header_line, next(csv.reader([header_line], dialect))
+
+
+def row_reader(lines, fieldnames: List[str], dialect: Dialect):
+    """
+    Reader yielding row dicts for a dialect.
+    """
+    if isinstance(dialect, FixedWidthSpec):
+        return FixedWidthReader(lines, dialect)
+    return csv.DictReader(lines, fieldnames=fieldnames, dialect=dialect)
+
+
+def row_writer(f, fieldnames: List[str], dialect: Dialect):
+    """
+    Writer of row dicts for a dialect.
+    """
+    if isinstance(dialect, FixedWidthSpec):
+        return FixedWidthWriter(f, dialect)
+    return csv.DictWriter(f, fieldnames=fieldnames, dialect=dialect)
+
+
+def format_rows(
+    rows: list, fieldnames: List[str], dialect: Dialect, encoding: str = "utf-8"
+) -> List[bytes]:
+    """
+    Format rows with a dialect, returning each encoded record separately.
+    """
+    buffer = io.StringIO()
+    writer = row_writer(buffer, fieldnames, dialect)
+    records = []
+    for row in rows:
+        writer.writerow(row)
+        records.append(buffer.getvalue().encode(encoding))
+        buffer.seek(0)
+        buffer.truncate()
+    return records
@@ -0,0 +1,192 @@
+import json
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+
+class ColumnStats:
+    """
+    Row, cell and per-column counters collected while a file streams through
+    the encrypt or decrypt loop. `processed` counts encrypted cells when
+    encrypting and decrypted cells when decrypting.
+    """
+
+    def __init__(self, fieldnames: List[str]):
+        self.rows = 0
+        self.cells = 0
+        self.errors = 0
+        self.columns = {
+            name: {"processed": 0, "empty": 0, "key_versions": Counter()}
+            for name in fieldnames
+        }
+
+    def count_row(self):
+        self.rows += 1
+        self.cells += len(self.columns)
+
+    def count_empty(self, column: str):
+        self.columns[column]["empty"] += 1
+
+    def count_processed(self, column: str, version: str):
+        stats = self.columns[column]
+        stats["processed"] += 1
+        stats["key_versions"][version] += 1
+
+    def count_error(self):
+        self.errors += 1
+
+    def describe(self, previous: dict = None) -> dict:
+        """
+        Describe the counters for the metadata file, adding them to the
+        `previous` stats of an incremental run when given.
+        """
+        stats = {
+            "rows": self.rows,
+            "cells": self.cells,
+            "errors": self.errors,
+            "columns": {
+                name: {
+                    "processed": column["processed"],
+                    "empty": column["empty"],
+                    "key_versions": dict(column["key_versions"]),
+                }
+                for name, column in self.columns.items()
+            },
+        }
+        if previous:
+            for key in ("rows", "cells", "errors"):
+                stats[key] += previous.get(key, 0)
+            for name, column in previous.get("columns", {}).items():
+                merged = stats["columns"].setdefault(
+                    name, {"processed": 0, "empty": 0, "key_versions": {}}
+                )
+                merged["processed"] += column["processed"]
+                merged["empty"] += column["empty"]
+                merged["key_versions"] = dict(
+                    Counter(merged["key_versions"]) + Counter(column["key_versions"])
+                )
+        return stats
+
+
+def _load(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError as e:
+        logger.error(f"Metadata file {path} not found.")
+        raise FileNotFoundError(f"Metadata file {path} not found.") from e
+
+
+def _compare_checksums(
+    expected: dict, actual: dict, first_label: str, second_label: str
+) -> List[str]:
+    if expected.get("start_offset", 0) != actual.get("start_offset", 0):
+        return [
+            f"{first_label} covers bytes from {expected.get('start_offset', 0)}, "
+            f"{second_label} from {actual.get('start_offset', 0)}"
+        ]
+    return [
+        f"{key} of {first_label} ({expected[key]}) does not match "
+        f"{second_label} ({actual[key]})"
+        for key in ("sha256", "bytes")
+        if expected[key] != actual[key]
+    ]
+
+
+def _compare_shards(
+    shards: List[dict], actual: dict, second_side: str
+) -> Tuple[List[str], Optional[dict]]:
+    """
+    Compare the shard checksums of a sharded output with a sharded output
+    (shard by shard) or with a single file, which must be one of the shards.
+    Return the mismatches and the shard matched by a single file.
+    """
+    if "shards" in actual:
+        if len(shards) != len(actual["shards"]):
+            return [
+                f"First output has {len(shards)} shards, second "
+                f"{second_side} has {len(actual['shards'])}"
+            ], None
+        mismatches = []
+        for number, (expected, other) in enumerate(zip(shards, actual["shards"])):
+            mismatches.extend(
+                _compare_checksums(
+                    expected,
+                    other,
+                    f"first output shard {number}",
+                    f"second {second_side} shard {number}",
+                )
+            )
+        return mismatches, None
+    for shard in shards:
+        if (shard["sha256"], shard["bytes"]) == (actual["sha256"], actual["bytes"]):
+            return [], shard
+    return [
+        f"sha256 of second {second_side} ({actual['sha256']}) matches no shard "
+        f"of first output"
+    ], None
+
+
+def compare_metadata(first_file: str, second_file: str) -> List[str]:
+    """
+    Compare two metadata files without rescanning the data and return the
+    mismatches found (an empty list means they agree).
+
+    When the second run consumed the output of the first (e.g. encrypt then
+    decrypt after a transfer), the first run's output checksum must equal the
+    second run's input checksum. Otherwise, both runs must have produced
+    identical output. Row counts and per-column processed counts must match.
+
+    A sharded first output is compared shard by shard with a sharded second
+    run, or must contain the single file the second run consumed, whose row
+    count is then checked against that shard.
+    """
+    first, second = _load(first_file), _load(second_file)
+    mismatches = []
+    first_integrity = first.get("integrity", {})
+    second_integrity = second.get("integrity", {})
+    chained = first.get("operation") != second.get("operation")
+    second_side = "input" if chained else "output"
+    expected = first_integrity.get("output")
+    actual = second_integrity.get(second_side)
+    shard = None
+    if not expected or not actual:
+        mismatches.append("Missing integrity checksums in metadata")
+    elif "shards" in expected:
+        shard_mismatches, shard = _compare_shards(
+            expected["shards"], actual, second_side
+        )
+        mismatches.extend(shard_mismatches)
+    elif "shards" in actual:
+        mismatches.append(f"Second {second_side} is sharded, first output is not")
+    else:
+        mismatches.extend(
+            _compare_checksums(
+                expected, actual, "first output", f"second {second_side}"
+            )
+        )
+
+    first_stats, second_stats = first.get("stats", {}), second.get("stats", {})
+    first_rows = shard["rows"] if shard else first_stats.get("rows")
+    if first_rows != second_stats.get("rows"):
+        mismatches.append(
+            f"Row count {first_rows} does not match {second_stats.get('rows')}"
+        )
+    second_columns = second_stats.get("columns", {})
+    # per-column counts cover the whole file, not a single shard
+    first_columns = {} if shard else first_stats.get("columns", {})
+    for name, column in first_columns.items():
+        other = second_columns.get(name, {})
+        if column["processed"] != other.get("processed"):
+            mismatches.append(
+                f"Column '{name}' processed {column['processed']} cells, "
+                f"second run processed {other.get('processed')}"
+            )
+    if second_stats.get("errors"):
+        mismatches.append(f"Second run reported {second_stats['errors']} errors")
+    for mismatch in mismatches:
+        logger.warning(f"Metadata mismatch: {mismatch}")
+    return mismatches
@@ -0,0 +1,109 @@
+import re
+from typing import Callable, Dict, List
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+_SEGMENT = re.compile(r"\.?([^.\[\]]+)|\['([^']*)'\]|\[(\*|\d+)\]")
+
+ANY = "*"
+
+
+def parse_path(path: str) -> List[tuple]:
+    """
+    Split a dotted or JSONPath-like path into ('key', name) and
+    ('index', position) segments, e.g. '$.user.emails[*]' or
+    "orders[0]['ship.to']". '*' matches any key or any array index.
+    """
+    text = path[1:] if path.startswith("$") else path
+    segments, position = [], 0
+    while position < len(text):
+        match = _SEGMENT.match(text, position)
+        if not match or match.end() == position:
+            logger.error(f"Invalid path '{path}' at position {position}")
+            raise ValueError(f"Invalid path '{path}' at position {position}")
+        key, quoted, index = match.groups()
+        if index is not None:
+            segments.append(("index", ANY if index == ANY else int(index)))
+        else:
+            segments.append(("key", quoted if quoted is not None else key))
+        position = match.end()
+    if not segments:
+        logger.error(f"Empty path '{path}'")
+        raise ValueError(f"Empty path '{path}'")
+    return segments
+
+
+class _Node:
+    __slots__ = ("keys", "indices", "target")
+
+    def __init__(self):
+        self.keys: Dict[str, "_Node"] = {}
+        self.indices: Dict[object, "_Node"] = {}
+        self.target = None
+
+
+class PathMatcher:
+    """
+    Trie of compiled paths, each mapped to a target (e.g. a field name).
+
+    Paths are parsed once per run; applying the matcher to a document only
+    descends into the keys and indices that some path can still match, so
+    the cost per document depends on the configured paths rather than on
+    the size of the document. Arrays met by a key segment are traversed
+    element by element, so 'user.emails' covers every email in a list.
+    A matched value is transformed as a whole (objects included) and is not
+    descended into further. An explicit key or index takes precedence over
+    a '*' at the same level.
+    """
+
+    def __init__(self, paths: Dict[str, object]):
+        self.root = _Node()
+        self.paths = dict(paths)
+        for path, target in paths.items():
+            node = self.root
+            for kind, value in parse_path(path):
+                children = node.keys if kind == "key" else node.indices
+                node = children.setdefault(value, _Node())
+            if node.target is not None and node.target != target:
+                logger.error(f"Path '{path}' maps to both {node.target} and {target}")
+                raise ValueError(
+                    f"Path '{path}' maps to both {node.target} and {target}"
+                )
+            node.target = target
+
+    def apply(self, document, transform: Callable):
+        """
+        Replace every value matched by a path with
+        `transform(value, target)` and return the updated document.
+        """
+        return self._apply(document, self.root, transform)
+
+    def _apply(self, value, node: _Node, transform: Callable):
+        if isinstance(value, list):
+            if node.indices:
+                wildcard = node.indices.get(ANY)
+                for index, item in enumerate(value):
+                    child = node.indices.get(index, wildcard)
+                    if child is not None:
+                        value[index] = self._visit(item, child, transform)
+                return value
+            if node.keys:
+                for index, item in enumerate(value):
+                    value[index] = self._apply(item, node, transform)
+            return value
+        if isinstance(value, dict) and node.keys:
+            wildcard = node.keys.get(ANY)
+            for key, item in value.items():
+                child = node.keys.get(key, wildcard)
+                if child is not None:
+                    value[key] = self._visit(item, child, transform)
+        return value
+
+    def _visit(self, value, node: _Node, transform: Callable):
+        if node.target is None:
+            return self._apply(value, node, transform)
+        if isinstance(value, list):
+            return [self._visit(item, node, transform) for item in value]
+        return value if value is None else transform(value, node.target)
@@ -0,0 +1,96 @@
+import sys
+import tracemalloc
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = setup_logger(name=__name__)
+
+MAX_SAMPLES = 64
+TOP_ALLOCATIONS = 10
+
+
+def peak_rss_bytes() -> int:
+    """
+    Peak resident set size of the process, or None where unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryProfiler:
+    """
+    Record memory use while a file is processed, for the metadata file.
+
+    tracemalloc is started for the duration of the run and the traced
+    memory is sampled as rows go by. Samples are thinned out as the run
+    grows so at most `max_samples` are kept. On exit, the peak traced memory,
+    the peak RSS of the process and the allocations that grew the most
+    between the start and end snapshots are kept.
+    """
+
+    def __init__(self, sample_every: int = 1024, max_samples: int = MAX_SAMPLES):
+        self.sample_every = sample_every
+        self.max_samples = max_samples
+        self.samples = []
+        self._next_sample = 0
+        self._started_tracing = False
+        self._start_snapshot = None
+        self.summary = {}
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._start_snapshot = tracemalloc.take_snapshot()
+        self._start_traced = tracemalloc.get_traced_memory()[0]
+        logger.info("Memory profiling started")
+        return self
+
+    def sample(self, rows: int):
+        """
+        Record the traced memory after `rows` rows, if a sample is due.
+        """
+        if rows < self._next_sample:
+            return
+        self.samples.append([rows, tracemalloc.get_traced_memory()[0]])
+        if len(self.samples) >= self.max_samples:
+            self.samples = self.samples[::2]
+            self.sample_every *= 2
+        self._next_sample = rows + self.sample_every
+
+    def __exit__(self, exc_type, exc, tb):
+        current, peak = tracemalloc.get_traced_memory()
+        end_snapshot = tracemalloc.take_snapshot()
+        growth = end_snapshot.compare_to(self._start_snapshot, "lineno")
+        if self._started_tracing:
+            tracemalloc.stop()
+        self.summary = {
+            "traced_start_bytes": self._start_traced,
+            "traced_end_bytes": current,
+            "traced_peak_bytes": peak,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "samples": self.samples,
+            "top_growth": [
+                {"location": str(stat.traceback), "size_diff_bytes": stat.size_diff}
+                for stat in growth[:TOP_ALLOCATIONS]
+            ],
+        }
+        logger.info(
+            f"Memory profile: traced peak {peak} bytes, "
+            f"peak RSS {self.summary['peak_rss_bytes']} bytes"
+        )
+
+    def describe(self) -> dict:
+        """
+        Describe the memory profile for the metadata file.
+        """
+        return self.summary
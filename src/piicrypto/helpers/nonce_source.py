@@ -0,0 +1,147 @@
+import base64
+from abc import ABC, abstractmethod
+
+from Crypto.Random import get_random_bytes
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+NONCE_SIZE = 12
+
+
+class BaseNonceSource(ABC):
+    """
+    Abstract base class for sources of 12-byte AES-GCM nonces.
+    A single source must be used for every nonce generated under a key.
+    """
+
+    scheme: str = None
+
+    @abstractmethod
+    def next_nonce(self) -> bytes:
+        """
+        Return the next unique nonce.
+        """
+        pass
+
+    def take(self, count: int) -> list:
+        """
+        Return `count` nonces at once.
+        """
+        return [self.next_nonce() for _ in range(count)]
+
+    def describe(self) -> dict:
+        """
+        Describe the scheme for the metadata file.
+        """
+        return {"scheme": self.scheme}
+
+
+class RandomNonceSource(BaseNonceSource):
+    """
+    Random nonces sliced out of large blocks of random bytes, so the RNG is
+    called once per `block_size` nonces instead of once per row.
+    """
+
+    scheme = "random"
+
+    def __init__(self, block_size: int = 4096):
+        if block_size < 1:
+            raise ValueError("block_size must be a positive integer.")
+        self.block_size = block_size
+        self._buffer = b""
+        self._position = 0
+
+    def _refill(self, count: int):
+        self._buffer = get_random_bytes(NONCE_SIZE * max(count, self.block_size))
+        self._position = 0
+
+    def next_nonce(self) -> bytes:
+        if self._position >= len(self._buffer):
+            self._refill(self.block_size)
+        start = self._position
+        self._position += NONCE_SIZE
+        return self._buffer[start : self._position]
+
+    def take(self, count: int) -> list:
+        if len(self._buffer) - self._position < NONCE_SIZE * count:
+            self._refill(count)
+        start = self._position
+        self._position += NONCE_SIZE * count
+        buffer = self._buffer
+        return [
+            buffer[offset : offset + NONCE_SIZE]
+            for offset in range(start, self._position, NONCE_SIZE)
+        ]
+
+
+class CounterNonceSource(BaseNonceSource):
+    """
+    Deterministic nonces made of a random 8-byte per-file prefix followed by
+    a 4-byte big-endian counter. Nonces are unique within a file by
+    construction and cost no RNG call per row.
+
+    Parallel workers share the prefix and take interleaved counters via
+    `partition`, so their nonces never overlap.
+    """
+
+    scheme = "counter"
+    PREFIX_SIZE = 8
+    COUNTER_LIMIT = 2 ** (8 * (NONCE_SIZE - PREFIX_SIZE))
+
+    def __init__(self, prefix: bytes = None, start: int = 0, stride: int = 1):
+        self.prefix = (
+            prefix if prefix is not None else get_random_bytes(self.PREFIX_SIZE)
+        )
+        if len(self.prefix) != self.PREFIX_SIZE:
+            raise ValueError(f"Counter nonce prefix must be {self.PREFIX_SIZE} bytes.")
+        if start < 0 or stride < 1:
+            raise ValueError("start must be >= 0 and stride must be >= 1.")
+        self.start = start
+        self.stride = stride
+        self._counter = start
+
+    def next_nonce(self) -> bytes:
+        if self._counter >= self.COUNTER_LIMIT:
+            logger.error("Counter nonce space exhausted for this file.")
+            raise OverflowError("Counter nonce space exhausted for this file.")
+        nonce = self.prefix + self._counter.to_bytes(
+            NONCE_SIZE - self.PREFIX_SIZE, "big"
+        )
+        self._counter += self.stride
+        return nonce
+
+    def partition(self, worker_index: int, worker_count: int) -> "CounterNonceSource":
+        """
+        Return the nonce source for one of `worker_count` parallel workers.
+        """
+        if not 0 <= worker_index < worker_count:
+            raise ValueError("worker_index must be in range(worker_count).")
+        return CounterNonceSource(
+            prefix=self.prefix,
+            start=self.start + worker_index * self.stride,
+            stride=self.stride * worker_count,
+        )
+
+    def describe(self) -> dict:
+        return {
+            "scheme": self.scheme,
+            "prefix": base64.b64encode(self.prefix).decode(),
+        }
+
+
+NONCE_SOURCES = {
+    RandomNonceSource.scheme: RandomNonceSource,
+    CounterNonceSource.scheme: CounterNonceSource,
+}
+
+
+def create_nonce_source(scheme: str = "random") -> BaseNonceSource:
+    """
+    Create a nonce source for the given scheme ('random' or 'counter').
+    """
+    if scheme not in NONCE_SOURCES:
+        logger.error(f"Unknown nonce scheme: {scheme}")
+        raise ValueError(f"Unknown nonce scheme: {scheme}")
+    return NONCE_SOURCES[scheme]()
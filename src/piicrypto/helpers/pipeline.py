@@ -0,0 +1,106 @@
+import queue
+import threading
+from typing import Callable, Iterable
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+_END = object()
+
+
+class _StageError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """
+    Put an item on a bounded queue, giving up if the pipeline is stopping.
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run_pipeline(
+    blocks: Iterable,
+    transform: Callable,
+    sink: Callable,
+    queue_depth: int = 4,
+):
+    """
+    Run a reader -> transform -> writer pipeline over blocks of items.
+
+    The reader stage pulls blocks from `blocks` and the writer stage passes
+    transformed blocks to `sink`, each in its own thread, while `transform`
+    runs in the calling thread. Stages are connected by queues holding at
+    most `queue_depth` blocks, so a slow stage applies backpressure instead
+    of buffering the whole file. The first error raised by any stage stops
+    the pipeline and is re-raised here.
+    """
+    if queue_depth < 1:
+        raise ValueError("queue_depth must be a positive integer.")
+    read_queue = queue.Queue(maxsize=queue_depth)
+    write_queue = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        try:
+            for block in blocks:
+                if not _put(read_queue, block, stop):
+                    return
+            _put(read_queue, _END, stop)
+        except BaseException as e:
+            _put(read_queue, _StageError(e), stop)
+
+    def writer():
+        try:
+            while not stop.is_set():
+                try:
+                    block = write_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if block is _END:
+                    return
+                sink(block)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    threads = [
+        threading.Thread(target=reader, name="piicrypto-reader", daemon=True),
+        threading.Thread(target=writer, name="piicrypto-writer", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while not stop.is_set():
+            try:
+                block = read_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if isinstance(block, _StageError):
+                raise block.error
+            if block is _END:
+                break
+            if not _put(write_queue, transform(block), stop):
+                break
+        _put(write_queue, _END, stop)
+    except BaseException as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        if not errors:
+            threads[1].join()
+        stop.set()
+        for thread in threads:
+            thread.join()
+    if errors:
+        logger.error(f"Pipeline stopped: {errors[0]}")
+        raise errors[0]
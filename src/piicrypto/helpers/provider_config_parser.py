@@ -1,11 +1,13 @@
 import json
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from piicrypto.helpers.logger_helper import setup_logger
 
 logger = setup_logger(name=__name__)
 
+DEFAULT_KEY_GROUP = "default"
+
 
 @dataclass
 class FieldConfig:
@@ -17,6 +19,8 @@ class FieldConfig:
     alias: Optional[str] = None
     encrypt: bool = True
     key_id: Optional[str] = None
+    key_group: str = DEFAULT_KEY_GROUP
+    blind_index: bool = False
 
     def __post__init__(self):
         self.alias = self.alias or self.field
@@ -82,8 +86,15 @@ class ProviderConfigParser:
             alias = config.get("alias", field)
             encrypt = config.get("encrypt", True)
             key_id = config.get("key_id")
+            key_group = config.get("key_group", DEFAULT_KEY_GROUP)
+            blind_index = config.get("blind_index", False)
             self.fields[field] = FieldConfig(
-                field=field, alias=alias, encrypt=encrypt, key_id=key_id
+                field=field,
+                alias=alias,
+                encrypt=encrypt,
+                key_id=key_id,
+                key_group=key_group,
+                blind_index=blind_index,
             )
 
     def get_field_to_alias(self) -> Dict[str, str]:
@@ -107,3 +118,23 @@ class ProviderConfigParser:
             for field, config in self.fields.items()
             if config.key_id and config.encrypt
         }
+
+    def get_key_groups(self) -> Dict[str, List[str]]:
+        """
+        Get a mapping of key groups to their encrypted fields, in config order.
+        """
+        groups = {}
+        for field, config in self.fields.items():
+            if config.encrypt:
+                groups.setdefault(config.key_group, []).append(field)
+        return groups
+
+    def get_blind_index_fields(self) -> list:
+        """
+        Get the encrypted fields that also get a blind index column.
+        """
+        return [
+            field
+            for field, config in self.fields.items()
+            if config.blind_index and config.encrypt
+        ]
@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+import os
+from collections import Counter
+from typing import List, Tuple
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+QUARANTINE_FORMATS = ("csv", "jsonl")
+
+
+class QuarantineWriter:
+    """
+    Buffered sidecar for rows rejected by validation.
+
+    Each record holds the input row number and compact 'field:code' error
+    codes. The original row is only included with `include_rows`: it is
+    written unencrypted, so the sidecar then holds plaintext PII and must be
+    protected like the input file.
+    Records are buffered and written in bulk instead of one log line per
+    error. The format is inferred from the file extension ('.jsonl'/'.json'
+    for JSON Lines, CSV otherwise) unless given explicitly. With `append`,
+    records are added to an existing sidecar.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fieldnames: List[str],
+        fmt: str = None,
+        buffer_rows: int = 10000,
+        append: bool = False,
+        include_rows: bool = False,
+    ):
+        self.path = path
+        self.include_rows = include_rows
+        self.fieldnames = list(fieldnames)
+        self.fmt = fmt or (
+            "jsonl" if path.lower().endswith((".jsonl", ".json")) else "csv"
+        )
+        if self.fmt not in QUARANTINE_FORMATS:
+            logger.error(f"Unknown quarantine format: {self.fmt}")
+            raise ValueError(f"Unknown quarantine format: {self.fmt}")
+        self.buffer_rows = buffer_rows
+        self.rejected_rows = 0
+        self.error_counts = Counter()
+        self._buffer = []
+        has_records = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "a" if append else "w")
+        if self.fmt == "csv" and not has_records:
+            header = ["row_number", "errors"]
+            if include_rows:
+                header.extend(fieldnames)
+            self._file.write(self._format_csv([header]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _format_csv(self, records) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        return buffer.getvalue()
+
+    def add(self, row_number: int, errors: List[Tuple[str, str]], row: dict):
+        """
+        Buffer a rejected row with its (field, error code) pairs.
+        """
+        codes = [f"{field}:{code}" for field, code in errors]
+        self.error_counts.update(codes)
+        self.rejected_rows += 1
+        if self.fmt == "csv":
+            record = [row_number, ";".join(codes)]
+            if self.include_rows:
+                record.extend(row.get(f) for f in self.fieldnames)
+            self._buffer.append(record)
+        else:
+            record = {"row_number": row_number, "errors": codes}
+            if self.include_rows:
+                record["row"] = row
+            self._buffer.append(json.dumps(record))
+        if len(self._buffer) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered records in a single call.
+        """
+        if not self._buffer:
+            return
+        if self.fmt == "csv":
+            self._file.write(self._format_csv(self._buffer))
+        else:
+            self._file.write("\n".join(self._buffer) + "\n")
+        self._buffer = []
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        if self.rejected_rows:
+            logger.warning(
+                f"Quarantined {self.rejected_rows} rows to {self.path}: "
+                f"{dict(self.error_counts)}"
+            )
+
+    def summary(self) -> dict:
+        """
+        Summarise the quarantine for the metadata file.
+        """
+        return {
+            "file": self.path,
+            "format": self.fmt,
+            "include_rows": self.include_rows,
+            "rejected_rows": self.rejected_rows,
+            "error_counts": dict(self.error_counts),
+        }
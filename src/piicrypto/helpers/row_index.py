@@ -0,0 +1,174 @@
+import os
+import sqlite3
+from typing import Iterable, List, Tuple
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+INDEX_SUFFIX = ".index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (file_id INTEGER PRIMARY KEY, path TEXT UNIQUE);
+CREATE TABLE IF NOT EXISTS rows (
+    row INTEGER PRIMARY KEY, file_id INTEGER, offset INTEGER, length INTEGER
+);
+CREATE TABLE IF NOT EXISTS ids (id TEXT, row INTEGER);
+CREATE INDEX IF NOT EXISTS ids_by_id ON ids (id);
+"""
+
+Location = Tuple[int, str, int, int]
+
+
+def index_path(output_file: str) -> str:
+    """
+    Default path of the row index of an output file.
+    """
+    return f"{output_file}{INDEX_SUFFIX}"
+
+
+class RowIndexWriter:
+    """
+    Sidecar SQLite index of an encrypted output, mapping the input row number
+    of each written record, and optionally the value of an ID column, to the
+    file, byte offset and length of the record.
+
+    File paths are stored relative to the index, so the output and its index
+    can be moved together. With `append`, entries are added to an existing
+    index (incremental runs); otherwise it is recreated.
+    """
+
+    def __init__(self, path: str, id_column: str = None, append: bool = False):
+        if not append and os.path.exists(path):
+            os.remove(path)
+        self.path = path
+        self.id_column = id_column
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.rows = 0
+        # rows are added from the writer stage when pipelined
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            stored = self.connection.execute(
+                "SELECT value FROM settings WHERE name = 'id_column'"
+            ).fetchone()
+            if stored and stored[0] != (id_column or ""):
+                self.connection.close()
+                logger.error(f"Row index {path} is keyed by ID column '{stored[0]}'.")
+                raise ValueError(
+                    f"Row index {path} is keyed by ID column '{stored[0]}'."
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO settings VALUES ('id_column', ?)",
+                (id_column or "",),
+            )
+        self._file_ids = dict(
+            self.connection.execute("SELECT path, file_id FROM files").fetchall()
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _file_id(self, path: str) -> int:
+        relative = os.path.relpath(os.path.abspath(path), self.directory)
+        if relative not in self._file_ids:
+            cursor = self.connection.execute(
+                "INSERT INTO files (path) VALUES (?)", (relative,)
+            )
+            self._file_ids[relative] = cursor.lastrowid
+        return self._file_ids[relative]
+
+    def add(self, entries: List[Tuple[int, dict, str, int, int]]):
+        """
+        Index a block of written records, given as
+        (row number, row, file, byte offset, length), in one transaction.
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?)",
+                [
+                    (row_num, self._file_id(path), offset, length)
+                    for row_num, _, path, offset, length in entries
+                ],
+            )
+            if self.id_column:
+                self.connection.executemany(
+                    "INSERT INTO ids VALUES (?, ?)",
+                    [(row[self.id_column], row_num) for row_num, row, *_ in entries],
+                )
+        self.rows += len(entries)
+
+    def close(self):
+        self.connection.close()
+        logger.info(f"Indexed {self.rows} rows in {self.path}")
+
+    def describe(self) -> dict:
+        """
+        Describe the index for the metadata file.
+        """
+        return {"file": self.path, "rows": self.rows, "id_column": self.id_column}
+
+
+class RowIndex:
+    """
+    Read side of a row index: locate records by row number or ID value.
+    """
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            logger.error(f"Row index {path} not found.")
+            raise FileNotFoundError(f"Row index {path} not found.")
+        self.path = path
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        stored = self.connection.execute(
+            "SELECT value FROM settings WHERE name = 'id_column'"
+        ).fetchone()
+        self.id_column = stored[0] if stored and stored[0] else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.close()
+
+    def _locate(self, query: str, keys: Iterable) -> List[Location]:
+        locations = []
+        for key in keys:
+            found = self.connection.execute(query, (key,)).fetchall()
+            if not found:
+                logger.warning(f"{key!r} is not in row index {self.path}")
+            for row_num, path, offset, length in found:
+                locations.append(
+                    (row_num, os.path.join(self.directory, path), offset, length)
+                )
+        return locations
+
+    def locate_rows(self, rows: Iterable[int]) -> List[Location]:
+        """
+        (row number, file, byte offset, length) of each indexed row, in the
+        order requested.
+        """
+        return self._locate(
+            "SELECT row, path, offset, length FROM rows "
+            "JOIN files USING (file_id) WHERE row = ?",
+            rows,
+        )
+
+    def locate_ids(self, ids: Iterable[str]) -> List[Location]:
+        """
+        Locations of the rows holding each ID value, in the order requested.
+        """
+        if not self.id_column:
+            logger.error(f"Row index {self.path} has no ID column.")
+            raise ValueError(f"Row index {self.path} has no ID column.")
+        return self._locate(
+            "SELECT row, path, offset, length FROM ids "
+            "JOIN rows USING (row) JOIN files USING (file_id) "
+            "WHERE id = ? ORDER BY row",
+            ids,
+        )
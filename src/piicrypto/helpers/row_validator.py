@@ -0,0 +1,130 @@
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from piicrypto.helpers.create_dynamic_model import create_dynamic_model
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.helpers.utils import validate_row
+
+logger = setup_logger(name=__name__)
+
+_INT_PATTERN = re.compile(r"\s*[+-]?[0-9]+\s*", re.ASCII)
+
+
+@lru_cache(maxsize=65536)
+def _is_valid_date(value: str, fmt: str) -> bool:
+    """
+    Check a date string against a format, caching results for repeated values.
+    """
+    try:
+        datetime.strptime(value, fmt)
+        return True
+    except ValueError:
+        return False
+
+
+def _compile_field_check(field_config: dict):
+    """
+    Compile the rules of a single validation config entry into a function
+    returning an error code for a non-empty value, or None when it is valid.
+    """
+    field_type = field_config["type"]
+    gt = field_config.get("gt")
+    min_length = field_config.get("min_length")
+    max_length = field_config.get("max_length")
+    pattern = re.compile(field_config["regex"]) if "regex" in field_config else None
+    date_format = field_config.get("format", "%Y-%m-%d")
+    allowed = frozenset(field_config.get("values", []))
+
+    def check(value: str) -> Optional[str]:
+        if field_type == "int":
+            if not _INT_PATTERN.fullmatch(value):
+                return "int_parsing"
+            if gt is not None and int(value) <= gt:
+                return "greater_than"
+            return None
+        if min_length is not None and len(value) < min_length:
+            return "string_too_short"
+        if max_length is not None and len(value) > max_length:
+            return "string_too_long"
+        if pattern is not None and not pattern.search(value):
+            return "string_pattern_mismatch"
+        if field_type == "date" and not _is_valid_date(value, date_format):
+            return "date_format"
+        if field_type == "enum" and value not in allowed:
+            return "enum_value"
+        return None
+
+    return check
+
+
+class CompiledRowValidator:
+    """
+    Fast-path validator compiled from a validation config JSON.
+
+    Blocks of rows are checked column by column with precompiled regexes,
+    int parsing, set membership for enums and cached date checks. Rows the
+    fast path rejects are re-validated with the pydantic model from
+    `create_dynamic_model`, which logs the detailed error messages and has
+    the final say on edge cases such as '1_000' for an int field.
+    """
+
+    def __init__(self, config_json: str):
+        with open(config_json, "r") as file:
+            config_dict = json.load(file)
+        self.checks = [
+            (
+                field_name,
+                field_config.get("required", True),
+                _compile_field_check(field_config),
+            )
+            for field_name, field_config in config_dict.items()
+        ]
+        self.model = create_dynamic_model(config_json)
+
+    def check_block(self, rows: List[dict]) -> Dict[int, List[Tuple[str, str]]]:
+        """
+        Check a block of rows and return {row index: [(field, error code)]}
+        for the rows that fail the fast path.
+        """
+        failures = {}
+        for field_name, required, check in self.checks:
+            for index, row in enumerate(rows):
+                if field_name not in row:
+                    code = "missing" if required else None
+                else:
+                    value = row[field_name]
+                    if value is None or value == "":
+                        code = "required" if required else None
+                    else:
+                        code = check(value)
+                if code:
+                    failures.setdefault(index, []).append((field_name, code))
+        return failures
+
+    def validate_block(self, rows: List[dict]) -> List[bool]:
+        """
+        Validate a block of rows, returning one flag per row.
+        """
+        results = [True] * len(rows)
+        for index in self.check_block(rows):
+            results[index] = validate_row(rows[index], self.model)
+        return results
+
+    def reject_block(self, rows: List[dict]) -> Dict[int, List[Tuple[str, str]]]:
+        """
+        Like `check_block`, but confirms each rejection with the pydantic
+        model without logging, so only truly invalid rows are returned.
+        """
+        failures = self.check_block(rows)
+        for index in list(failures):
+            try:
+                self.model(**rows[index])
+                del failures[index]
+            except ValidationError:
+                pass
+        return failures
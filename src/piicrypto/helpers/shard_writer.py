@@ -0,0 +1,168 @@
+import csv
+import hashlib
+import io
+import os
+from typing import List, Tuple
+
+from piicrypto.helpers.dialects import format_rows, row_writer
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+
+def shard_path(output_file: str, index: int) -> str:
+    """
+    Name of the `index`-th shard of an output file,
+    e.g. 'out.csv' -> 'out.part-00000.csv'.
+    """
+    root, ext = os.path.splitext(output_file)
+    return f"{root}.part-{index:05d}{ext}"
+
+
+class ShardedWriter:
+    """
+    Write CSV rows to rotated shard files, each starting with the header
+    (fixed-width dialects have none).
+
+    A new shard is started once the current one holds `max_rows` rows or
+    another row would take it past `max_bytes`. With `shards`, the input is
+    split into exactly that many shards of roughly equal input size: a shard
+    is rotated once the input byte offset of the record being written passes
+    its share of `input_bytes`, and shards left unused by a short input are
+    written with only the header on close.
+
+    The checksum, size and output row range of each shard are collected for
+    the metadata manifest.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        fieldnames: List[str],
+        shards: int = None,
+        max_rows: int = None,
+        max_bytes: int = None,
+        input_bytes: int = None,
+        dialect=csv.excel,
+        encoding: str = "utf-8",
+    ):
+        if not (shards or max_rows or max_bytes):
+            logger.error("A shard count or a shard size limit is required.")
+            raise ValueError("A shard count or a shard size limit is required.")
+        if shards and input_bytes is None:
+            logger.error("The input size is required to split into shards.")
+            raise ValueError("The input size is required to split into shards.")
+        self.output_file = output_file
+        self.fieldnames = fieldnames
+        self.shards = shards
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.input_bytes = input_bytes
+        self.encoding = encoding
+        self.dialect = dialect
+        buffer = io.StringIO()
+        row_writer(buffer, fieldnames, dialect).writeheader()
+        self.header = buffer.getvalue().encode(encoding)
+        self.manifest = []
+        self.total_rows = 0
+        self._file = None
+        self._shard = None
+        self._open_shard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open_shard(self):
+        self._close_shard()
+        path = shard_path(self.output_file, len(self.manifest))
+        self._file = open(path, "wb")
+        self._shard = {
+            "file": path,
+            "first_row": self.total_rows,
+            "rows": 0,
+            "bytes": 0,
+            "sha256": hashlib.sha256(),
+        }
+        self.manifest.append(self._shard)
+        self._write(self.header)
+        logger.info(f"Writing shard {path}")
+
+    def _close_shard(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._shard["sha256"] = self._shard["sha256"].hexdigest()
+        self._file = None
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._shard["sha256"].update(data)
+        self._shard["bytes"] += len(data)
+
+    def _input_shard(self, input_offset: int) -> int:
+        if not self.shards or input_offset is None or not self.input_bytes:
+            return len(self.manifest) - 1
+        return min(
+            self.shards - 1, (input_offset - 1) * self.shards // self.input_bytes
+        )
+
+    def _is_full(self, row_bytes: int) -> bool:
+        if not self._shard["rows"]:
+            return False
+        if self.max_rows and self._shard["rows"] >= self.max_rows:
+            return True
+        return bool(
+            self.max_bytes and self._shard["bytes"] + row_bytes > self.max_bytes
+        )
+
+    def write_block(
+        self, rows: list, input_offsets: List[int] = None
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Write a block of rows, rotating shards as the limits are reached.
+        `input_offsets` are the input byte offsets just past each row.
+        Returns the (shard file, byte offset, length) of each record.
+        """
+        locations = []
+        records = format_rows(rows, self.fieldnames, self.dialect, self.encoding)
+        for index, data in enumerate(records):
+            input_offset = input_offsets[index] if input_offsets else None
+            while self._shard["rows"] and self._input_shard(input_offset) >= len(
+                self.manifest
+            ):
+                self._open_shard()
+            if self._is_full(len(data)):
+                self._open_shard()
+            locations.append((self._shard["file"], self._shard["bytes"], len(data)))
+            self._write(data)
+            self._shard["rows"] += 1
+            self.total_rows += 1
+        return locations
+
+    def close(self):
+        while self.shards and len(self.manifest) < self.shards:
+            self._open_shard()
+        self._close_shard()
+        logger.info(
+            f"Wrote {self.total_rows} rows to {len(self.manifest)} shards "
+            f"of {self.output_file}"
+        )
+
+    def describe(self) -> List[dict]:
+        """
+        Describe the shards for the metadata manifest.
+        """
+        return [
+            {
+                "file": shard["file"],
+                "first_row": shard["first_row"],
+                "last_row": shard["first_row"] + shard["rows"] - 1,
+                "rows": shard["rows"],
+                "bytes": shard["bytes"],
+                "sha256": shard["sha256"],
+            }
+            for shard in self.manifest
+        ]
@@ -0,0 +1,126 @@
+import hashlib
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+
+class TrackedLineReader:
+    """
+    Iterate the decoded lines of a binary file while tracking the byte
+    offset just past the last line handed out. Suitable as the line source
+    of `csv.reader`/`csv.DictReader`, which pull one line at a time, so the
+    offset always sits at the end of the last parsed record.
+
+    With `complete_lines_only`, a trailing line without a newline is only
+    handed out when it ends the input; if more bytes were appended while it
+    was read (a record still being written), it is left unread and its size
+    kept in `skipped_bytes`.
+
+    The SHA-256 of the bytes handed out since the start (or the last `seek`)
+    is computed as the lines stream through.
+    """
+
+    def __init__(self, raw, encoding: str = "utf-8", complete_lines_only=False):
+        self.raw = raw
+        self.encoding = encoding
+        self.complete_lines_only = complete_lines_only
+        self.offset = raw.tell()
+        self.start_offset = self.offset
+        self.sha256 = hashlib.sha256()
+        self.skipped_bytes = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.raw.readline()
+        if not line:
+            raise StopIteration
+        if self.complete_lines_only and not line.endswith(b"\n") and self.raw.read(1):
+            self.raw.seek(self.offset)
+            self.skipped_bytes = len(line)
+            logger.warning(
+                f"Leaving {len(line)} bytes of an incomplete line "
+                f"at byte {self.offset} unread"
+            )
+            raise StopIteration
+        self.offset += len(line)
+        self.sha256.update(line)
+        return line.decode(self.encoding)
+
+    def seek(self, offset: int):
+        """
+        Continue reading from a byte offset, restarting the checksum there.
+        """
+        self.raw.seek(offset)
+        self.offset = offset
+        self.start_offset = offset
+        self.sha256 = hashlib.sha256()
+
+    def describe(self) -> dict:
+        """
+        Describe the bytes read for the metadata file.
+        """
+        return {
+            "sha256": self.sha256.hexdigest(),
+            "bytes": self.offset - self.start_offset,
+            "start_offset": self.start_offset,
+        }
+
+
+class HashingWriter:
+    """
+    Text writer over a binary file that computes the SHA-256 and size of
+    everything written, for use as the output of `csv.writer`.
+
+    With `hash_existing`, the bytes already in the file (when appending) are
+    hashed first, so the checksum covers the whole file.
+    """
+
+    def __init__(self, raw, encoding: str = "utf-8", hash_existing: bool = False):
+        self.raw = raw
+        self.encoding = encoding
+        self.start_offset = raw.tell()
+        self.bytes_written = 0
+        self.sha256 = hashlib.sha256()
+        self.hashed_from = self.start_offset
+        if hash_existing:
+            self._hash_existing()
+
+    def _hash_existing(self, chunk_size: int = 1 << 20):
+        with open(self.raw.name, "rb") as f:
+            remaining = self.start_offset
+            while remaining:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                self.sha256.update(chunk)
+                remaining -= len(chunk)
+        self.hashed_from = 0
+
+    def write(self, text: str) -> int:
+        self.write_bytes(text.encode(self.encoding))
+        return len(text)
+
+    def write_bytes(self, data: bytes):
+        self.sha256.update(data)
+        self.bytes_written += len(data)
+        self.raw.write(data)
+
+    @property
+    def offset(self) -> int:
+        """
+        Byte offset in the file of the next write.
+        """
+        return self.start_offset + self.bytes_written
+
+    def describe(self) -> dict:
+        """
+        Describe the bytes written for the metadata file.
+        """
+        return {
+            "sha256": self.sha256.hexdigest(),
+            "bytes": self.offset - self.hashed_from,
+            "start_offset": self.hashed_from,
+        }
@@ -1,6 +1,7 @@
 import base64
 from datetime import datetime
 from importlib.metadata import version
+from itertools import islice
 
 from Crypto.Random import get_random_bytes
 from pydantic import BaseModel, ValidationError
@@ -11,6 +12,8 @@ from piicrypto.helpers.logger_helper import setup_logger
 
 logger = setup_logger(name=__name__)
 
+PACKED_COLUMN_PREFIX = "packed:"
+
 
 def generate_aes_key():
     key_bytes = get_random_bytes(32)
@@ -24,6 +27,15 @@ def generate_nonce() -> bytes:
     return get_random_bytes(12)
 
 
+def iter_blocks(iterable, block_size: int):
+    """
+    Yield lists of up to `block_size` consecutive items from an iterable.
+    """
+    iterator = iter(iterable)
+    while block := list(islice(iterator, block_size)):
+        yield block
+
+
 def find_best_match(query: str, field_to_alias: dict) -> str:
     """
     Find the best match for a query string in a field to alias dict using fuzzy matching.
@@ -38,6 +50,17 @@ def find_best_match(query: str, field_to_alias: dict) -> str:
     return reverse_lookup[match] if similarity >= 95 else query
 
 
+def packed_key_field(column: str, key_groups: dict):
+    """
+    Field whose key seals a packed column ('packed:<key group>'): the first
+    field of the key group. None for other columns or unknown groups.
+    """
+    if not column.startswith(PACKED_COLUMN_PREFIX):
+        return None
+    fields = key_groups.get(column[len(PACKED_COLUMN_PREFIX) :])
+    return fields[0] if fields else None
+
+
 def skip_id_column(row_number: int, value: str, field_name: str) -> bool:
     """
     Skip the ID column in the first row of a CSV file.
@@ -52,10 +75,15 @@ def skip_id_column(row_number: int, value: str, field_name: str) -> bool:
 
 
 def generate_metadata(
-    out_file: str, mode: str, operation: str, operation_fields: set
+    out_file: str,
+    mode: str,
+    operation: str,
+    operation_fields: set,
+    extra: dict = None,
 ) -> dict:
     """
     Generate metadata for the keys.
+    Any `extra` entries are merged into the metadata as-is.
     """
     metadata = {
         "key_provider_mode": mode,
@@ -65,6 +93,8 @@ def generate_metadata(
         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "package_version": version("pii-crypto"),
     }
+    if extra:
+        metadata.update(extra)
     return metadata
 
 
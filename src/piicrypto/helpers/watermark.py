@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+from piicrypto.helpers.logger_helper import setup_logger
+
+logger = setup_logger(name=__name__)
+
+TAIL_FINGERPRINT_SIZE = 4096
+
+
+def _tail_fingerprint(input_file: str, offset: int) -> str:
+    """
+    Hash the bytes just before `offset` to detect a rewritten input.
+    """
+    start = max(0, offset - TAIL_FINGERPRINT_SIZE)
+    with open(input_file, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _extends_last_line(input_file: str, offset: int) -> bool:
+    """
+    Whether bytes were appended to a last line that had no newline when the
+    watermark was taken, instead of starting a new line.
+    """
+    if offset == 0:
+        return False
+    with open(input_file, "rb") as f:
+        f.seek(offset - 1)
+        last, following = f.read(1), f.read(1)
+    return last != b"\n" and following not in (b"", b"\r", b"\n")
+
+
+def header_fingerprint(header_line: str) -> str:
+    return hashlib.sha256(header_line.encode()).hexdigest()
+
+
+def build_watermark(
+    input_file: str,
+    input_offset: int,
+    row_count: int,
+    header_line: str,
+    output_layout: dict,
+) -> dict:
+    """
+    Build the watermark stored in the metadata after an incremental run.
+    `output_layout` describes the columns and dialect of the output, which
+    appended rows must match.
+    """
+    return {
+        "input_offset": input_offset,
+        "row_count": row_count,
+        "header_sha256": header_fingerprint(header_line),
+        "tail_sha256": _tail_fingerprint(input_file, input_offset),
+        "output_layout": output_layout,
+    }
+
+
+def load_metadata(output_file: str) -> Optional[dict]:
+    """
+    Load `<output>.metadata.json` if it exists.
+    """
+    path = f"{output_file}.metadata.json"
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        logger.warning(f"Ignoring unreadable metadata file {path}")
+        return None
+
+
+def resume_watermark(
+    input_file: str, output_file: str, header_line: str, output_layout: dict
+) -> Optional[dict]:
+    """
+    Return the stored watermark if the output can be appended to, or None
+    when a full run is needed: no previous run, missing output, truncated
+    or rewritten input, an extended last row, a changed header, or an output
+    layout (columns, packed or blind index columns, dialect) differing from
+    `output_layout`.
+    """
+    metadata = load_metadata(output_file)
+    watermark = (metadata or {}).get("watermark")
+    if not watermark:
+        logger.info("No watermark found, running a full encryption")
+        return None
+    if not os.path.exists(output_file):
+        logger.warning(f"Output {output_file} is missing, running a full encryption")
+        return None
+    if os.path.getsize(input_file) < watermark["input_offset"]:
+        logger.warning(f"Input {input_file} was truncated, running a full encryption")
+        return None
+    if header_fingerprint(header_line) != watermark["header_sha256"]:
+        logger.warning(f"Header of {input_file} changed, running a full encryption")
+        return None
+    if watermark.get("output_layout") != output_layout:
+        logger.warning(
+            f"Output layout of {output_file} changed, running a full encryption"
+        )
+        return None
+    if (
+        _tail_fingerprint(input_file, watermark["input_offset"])
+        != watermark["tail_sha256"]
+    ):
+        logger.warning(f"Input {input_file} was rewritten, running a full encryption")
+        return None
+    if _extends_last_line(input_file, watermark["input_offset"]):
+        logger.warning(
+            f"Last row of {input_file} was extended, running a full encryption"
+        )
+        return None
+    logger.info(
+        f"Resuming from byte {watermark['input_offset']} "
+        f"after {watermark['row_count']} rows"
+    )
+    return watermark
@@ -13,6 +13,8 @@ class BaseKeyProvider(ABC):
         provider_config = ProviderConfigParser(config_file)
         self.fields_to_encrypt = provider_config.get_fields_to_encrypt()
         self.field_to_alias = provider_config.get_field_to_alias()
+        self.key_groups = provider_config.get_key_groups()
+        self.blind_index_fields = provider_config.get_blind_index_fields()
 
     @abstractmethod
     def generate_keys(self):
@@ -0,0 +1,62 @@
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.key_provider.base_key_provider import BaseKeyProvider
+
+logger = setup_logger(name=__name__)
+
+
+class CachingKeyProvider(BaseKeyProvider):
+    """
+    Memoizing layer in front of any key provider.
+    The current keys and the keys of each version are fetched from the
+    wrapped provider once; generating or rotating keys clears the cache.
+    """
+
+    def __init__(self, provider: BaseKeyProvider):
+        """
+        :param provider: The key provider to cache.
+        """
+        self.provider = provider
+        self.fields_to_encrypt = provider.fields_to_encrypt
+        self.field_to_alias = provider.field_to_alias
+        self.key_groups = provider.key_groups
+        self.blind_index_fields = provider.blind_index_fields
+        self._current_keys = None
+        self._keys_by_version = {}
+
+    def clear(self):
+        """
+        Drop every cached key.
+        """
+        self._current_keys = None
+        self._keys_by_version = {}
+
+    def generate_keys(self):
+        """
+        Generate keys with the wrapped provider and clear the cache.
+        """
+        self.provider.generate_keys()
+        self.clear()
+
+    def rotate_keys(self):
+        """
+        Rotate keys with the wrapped provider and clear the cache.
+        """
+        self.provider.rotate_keys()
+        self.clear()
+
+    def load_keys(self):
+        """
+        Load the current keys, fetching them from the wrapped provider once.
+        """
+        if self._current_keys is None:
+            self._current_keys = self.provider.load_keys()
+        return self._current_keys
+
+    def get_keys_by_version(self, version: str):
+        """
+        Load the keys of a version, fetching them from the wrapped provider once.
+        """
+        if version not in self._keys_by_version:
+            logger.info(f"Caching keys for version {version}")
+            self._keys_by_version[version] = self.provider.get_keys_by_version(version)
+        return self._keys_by_version[version]
@@ -0,0 +1,63 @@
+from typing import List
+
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.key_provider.base_key_provider import BaseKeyProvider
+
+logger = setup_logger(name=__name__)
+
+
+class ChainKeyProvider(BaseKeyProvider):
+    """
+    Key provider that consults a list of providers in order.
+    New keys are generated, rotated and loaded with the first provider, while
+    keys of a given version are looked up in each provider until one has
+    them, e.g. a KMS in front of a local key file holding older versions.
+    """
+
+    def __init__(self, providers: List[BaseKeyProvider]):
+        """
+        :param providers: Key providers in lookup order.
+        """
+        if not providers:
+            logger.error("A provider chain needs at least one provider.")
+            raise ValueError("A provider chain needs at least one provider.")
+        self.providers = providers
+        self.fields_to_encrypt = providers[0].fields_to_encrypt
+        self.field_to_alias = providers[0].field_to_alias
+        self.key_groups = providers[0].key_groups
+        self.blind_index_fields = providers[0].blind_index_fields
+
+    def generate_keys(self):
+        """
+        Generate keys with the first provider.
+        """
+        self.providers[0].generate_keys()
+
+    def rotate_keys(self):
+        """
+        Rotate keys with the first provider.
+        """
+        self.providers[0].rotate_keys()
+
+    def load_keys(self):
+        """
+        Load the current keys from the first provider.
+        """
+        return self.providers[0].load_keys()
+
+    def get_keys_by_version(self, version: str):
+        """
+        Load the keys of a version from the first provider that has them.
+        """
+        for provider in self.providers:
+            try:
+                keys = provider.get_keys_by_version(version)
+            except (ValueError, KeyError) as e:
+                logger.info(
+                    f"{type(provider).__name__} has no keys for version {version}: {e}"
+                )
+                continue
+            if keys:
+                return keys
+        logger.error(f"Version {version} not found in any key provider")
+        raise ValueError(f"Version {version} not found in any key provider")
@@ -10,7 +10,8 @@ class KeyManager:
     def __init__(self, provider_type: str, config_file: str):
         """
         Initialize the KeyManager with a specified provider type and arguments.
-        :param provider_type: 'local' or 'vault'
+        :param provider_type: 'local', 'vault', a registered or entry point
+            provider, optionally wrapped ('cached:local', 'chain:kms,local')
         param config_file: Path to a JSON config file with provider configuration.
         """
         self.provider: BaseKeyProvider = KeyProviderFactory.create_key_provider(
@@ -18,6 +19,8 @@ class KeyManager:
         )
         self.fields_to_encrypt = self.provider.fields_to_encrypt
         self.field_to_alias = self.provider.field_to_alias
+        self.key_groups = getattr(self.provider, "key_groups", {})
+        self.blind_index_fields = getattr(self.provider, "blind_index_fields", [])
 
     def generate_keys(self):
         """
@@ -1,5 +1,66 @@
-from piicrypto.key_provider.local_key_provider import LocalKeyProvider
-from piicrypto.key_provider.vault_key_provider import VaultKeyProvider
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Dict, Type, Union
+
+from piicrypto.helpers.logger_helper import setup_logger
+from piicrypto.key_provider.base_key_provider import BaseKeyProvider
+
+logger = setup_logger(name=__name__)
+
+ENTRY_POINT_GROUP = "piicrypto.key_providers"
+
+# Providers are referenced as "module:Class" and only imported when selected,
+# so a command does not pay for the dependencies of providers it never uses.
+_REGISTRY: Dict[str, Union[str, Type[BaseKeyProvider]]] = {
+    "local": "piicrypto.key_provider.local_key_provider:LocalKeyProvider",
+    "vault": "piicrypto.key_provider.vault_key_provider:VaultKeyProvider",
+}
+
+_WRAPPERS = {
+    "cached": "piicrypto.key_provider.caching_key_provider:CachingKeyProvider",
+    "chain": "piicrypto.key_provider.chain_key_provider:ChainKeyProvider",
+}
+
+
+def register_key_provider(name: str, provider: Union[str, Type[BaseKeyProvider]]):
+    """
+    Register a key provider under `name`, either as a class or as a
+    "module:Class" reference that is imported on first use.
+    """
+    _REGISTRY[name] = provider
+    logger.info(f"Registered key provider: {name}")
+
+
+def _load_class(reference: str):
+    module_name, _, class_name = reference.partition(":")
+    return getattr(import_module(module_name), class_name)
+
+
+def _entry_point(name: str):
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name == name:
+            return entry_point
+    return None
+
+
+def get_key_provider_class(provider_type: str) -> Type[BaseKeyProvider]:
+    """
+    Resolve a provider name to its class, importing it on first use.
+    Registered providers take precedence over installed entry points in the
+    'piicrypto.key_providers' group.
+    """
+    provider = _REGISTRY.get(provider_type)
+    if provider is None:
+        entry_point = _entry_point(provider_type)
+        if entry_point is None:
+            logger.error(f"Unknown key provider type: {provider_type}")
+            raise ValueError(f"Unknown key provider type: {provider_type}")
+        provider = entry_point.load()
+        logger.info(f"Loaded key provider '{provider_type}' from {entry_point.value}")
+    elif isinstance(provider, str):
+        provider = _load_class(provider)
+    _REGISTRY[provider_type] = provider
+    return provider
 
 
 class KeyProviderFactory:
@@ -11,13 +72,24 @@ class KeyProviderFactory:
     def create_key_provider(provider_type: str, config_file: str):
         """
         Create a key provider instance based on the provider type.
+        A type may be prefixed with a wrapper: 'cached:<type>' memoizes the
+        keys of the wrapped provider and 'chain:<type>,<type>,...' looks keys
+        up in each provider in turn. Wrappers can be nested, e.g.
+        'cached:chain:kms,local'.
         :param provider_type: Type of the key provider ('local', 'vault', etc).
         :param config_file: Path to a JSON config file with provider configuration.
         :return: An instance of the specified key provider.
         """
-        if provider_type == "local":
-            return LocalKeyProvider(config_file)
-        elif provider_type == "vault":
-            return VaultKeyProvider(config_file)
-        else:
-            raise ValueError(f"Unknown key provider type: {provider_type}")
+        wrapper, _, inner = provider_type.partition(":")
+        if inner and wrapper in _WRAPPERS:
+            wrapper_class = _load_class(_WRAPPERS[wrapper])
+            if wrapper == "chain":
+                providers = [
+                    KeyProviderFactory.create_key_provider(name, config_file)
+                    for name in inner.split(",")
+                ]
+                return wrapper_class(providers)
+            return wrapper_class(
+                KeyProviderFactory.create_key_provider(inner, config_file)
+            )
+        return get_key_provider_class(provider_type)(config_file)
@@ -28,6 +28,8 @@ class LocalKeyProvider(BaseKeyProvider):
         self.json_file = provider_config.key_source
         self.fields_to_encrypt = provider_config.get_fields_to_encrypt()
         self.field_to_alias = provider_config.get_field_to_alias()
+        self.key_groups = provider_config.get_key_groups()
+        self.blind_index_fields = provider_config.get_blind_index_fields()
         self.field_to_key_ids = provider_config.get_fields_to_key_ids()
         if not os.path.exists(self.json_file):
             logger.info(
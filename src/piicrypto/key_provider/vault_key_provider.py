@@ -24,6 +24,8 @@ class VaultKeyProvider(BaseKeyProvider):
 
         self.fields = list(provider_config.fields.keys())
         self.field_to_alias = provider_config.get_field_to_alias()
+        self.key_groups = provider_config.get_key_groups()
+        self.blind_index_fields = provider_config.get_blind_index_fields()
         self.vault_url = provider_config.vault_url
         self.generate_keys()
 
@@ -5,6 +5,20 @@ import pytest
 from piicrypto.key_provider.key_manager import KeyManager
 
 
+@pytest.fixture(scope="session")
+def cipher_cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("cache")
+
+
+@pytest.fixture(autouse=True)
+def isolated_cipher_cache(cipher_cache_dir, monkeypatch):
+    """
+    Keep the cipher backend choice cached by `cipher_backend="auto"` out of
+    the user's home directory.
+    """
+    monkeypatch.setenv("PIICRYPTO_CACHE_DIR", str(cipher_cache_dir))
+
+
 @pytest.fixture(scope="session")
 def provider_config(tmp_path_factory):
     """
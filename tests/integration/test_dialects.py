@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.encrypt_decrypt.verifier import verify_csv_file
+
+ROWS = [
+    ["id", "Name", "Social Security Number", "Address"],
+    ["1", "Ada Lovelace", "123-45-6789", "London, UK"],
+    ["2", "Alan Turing", "987-65-4321", "Wilmslow"],
+]
+# values filling their columns with multi-byte characters
+WIDE_ROWS = ROWS[:1] + [["3", "Zoë Éclå Ørstëdß", "987-65-4321", "Zürich"]]
+
+
+@pytest.mark.parametrize("delimiter,dialect", [("\t", "auto"), ("|", "pipe")])
+def test_delimited_round_trip(tmp_path, provider_config, delimiter, dialect):
+    src = tmp_path / "in.txt"
+    src.write_text("".join(delimiter.join(row) + "\n" for row in ROWS))
+    enc = tmp_path / "enc.txt"
+    dec = tmp_path / "dec.txt"
+
+    encrypt_csv_file(
+        str(src), str(enc), "local", provider_config, True, dialect=dialect
+    )
+    metadata = json.loads(open(f"{enc}.metadata.json").read())
+    assert metadata["dialect"] == {"delimiter": delimiter}
+    header = enc.read_text().splitlines()[0]
+    assert header.split(delimiter)[-1] == "row_iv"
+
+    decrypt_csv_file(str(enc), str(dec), "local", provider_config, dialect=dialect)
+    lines = dec.read_text().splitlines()
+    assert [line.split(delimiter)[:4] for line in lines] == ROWS
+
+
+@pytest.mark.parametrize("rows", [ROWS, WIDE_ROWS])
+def test_fixed_width_round_trip(tmp_path, provider_config, rows):
+    spec = tmp_path / "spec.json"
+    widths = [4, 16, 11, 12]
+    spec.write_text(
+        json.dumps(
+            {
+                "columns": [
+                    {"name": name, "width": width}
+                    for name, width in zip(rows[0], widths)
+                ]
+            }
+        )
+    )
+    src = tmp_path / "in.dat"
+    src.write_text(
+        "".join(
+            "".join(value.ljust(width) for value, width in zip(row, widths)) + "\n"
+            for row in rows[1:]
+        ),
+        encoding="utf-8",
+    )
+    enc = tmp_path / "enc.dat"
+    dec = tmp_path / "dec.dat"
+
+    encrypt_csv_file(
+        str(src), str(enc), "local", provider_config, fixed_width_spec=str(spec)
+    )
+    layout = f"{enc}.layout.json"
+    encrypted_widths = [c["width"] for c in json.loads(open(layout).read())["columns"]]
+    assert encrypted_widths[0] == 4 and encrypted_widths[-1] == 16
+    assert all(
+        len(line) == sum(encrypted_widths)
+        for line in enc.read_text(encoding="utf-8").splitlines()
+    )
+
+    summary = verify_csv_file(
+        str(enc), "local", provider_config, fixed_width_spec=layout
+    )
+    assert summary["cells"] == 2 * (len(rows) - 1)
+    assert summary["failures"] == 0
+
+    decrypt_csv_file(
+        str(enc), str(dec), "local", provider_config, fixed_width_spec=layout
+    )
+    lines = dec.read_text(encoding="utf-8").splitlines()
+    assert [line[: sum(widths)] for line in lines] == src.read_text(
+        encoding="utf-8"
+    ).splitlines()
@@ -0,0 +1,94 @@
+import subprocess
+import sys
+
+import pytest
+
+from piicrypto.encrypt_decrypt.arrow_crypto import (
+    decrypt_arrow_file,
+    decrypt_parquet_file,
+    encrypt_arrow_file,
+    encrypt_parquet_file,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def sample_table():
+    return pa.table(
+        {
+            "id": pa.array([1, 2, 3], type=pa.int64()),
+            "Name": ["Ada Lovelace", "Alan Turing", None],
+            "Social Security Number": ["123-45-6789", "111-22-3333", "222-33-4444"],
+            "Address": ["London", "Manchester", "Leeds"],
+        }
+    )
+
+
+def test_roundtrip_parquet(tmp_path, sample_table, provider_config):
+    src = tmp_path / "in.parquet"
+    enc = tmp_path / "out.enc.parquet"
+    dec = tmp_path / "out.dec.parquet"
+    pq.write_table(sample_table, src, row_group_size=2)
+
+    encrypt_parquet_file(str(src), str(enc), "local", provider_config, True)
+    encrypted = pq.ParquetFile(enc)
+    assert encrypted.num_row_groups == 2
+    assert encrypted.schema_arrow.field("row_iv").type == pa.binary()
+    table = encrypted.read()
+    assert table.column("Name")[0].as_py().startswith("v1:")
+    assert table.column("Name")[2].as_py() is None
+    assert table.column("Address").to_pylist() == ["London", "Manchester", "Leeds"]
+    assert (tmp_path / "out.enc.parquet.metadata.json").exists()
+
+    decrypt_parquet_file(str(enc), str(dec), "local", provider_config)
+    decrypted = pq.read_table(dec)
+    assert decrypted.schema == sample_table.schema
+    assert decrypted.equals(sample_table)
+    assert pq.ParquetFile(dec).num_row_groups == 2
+
+
+def test_roundtrip_arrow_ipc(tmp_path, sample_table, provider_config):
+    src = tmp_path / "in.arrow"
+    enc = tmp_path / "out.enc.arrow"
+    dec = tmp_path / "out.dec.arrow"
+    with (
+        pa.OSFile(str(src), "wb") as sink,
+        pa.ipc.new_file(sink, sample_table.schema) as writer,
+    ):
+        writer.write_table(sample_table, max_chunksize=2)
+
+    encrypt_arrow_file(str(src), str(enc), "local", provider_config)
+    with pa.memory_map(str(enc), "r") as source:
+        reader = pa.ipc.open_file(source)
+        assert reader.num_record_batches == 2
+        encrypted = reader.read_all()
+    assert encrypted.column("Social Security Number")[0].as_py().startswith("v1:")
+
+    decrypt_arrow_file(str(enc), str(dec), "local", provider_config)
+    with pa.memory_map(str(dec), "r") as source:
+        assert pa.ipc.open_file(source).read_all().equals(sample_table)
+
+
+def test_decrypt_rejects_plain_parquet(tmp_path, sample_table, provider_config):
+    src = tmp_path / "plain.parquet"
+    pq.write_table(sample_table, src)
+    with pytest.raises(ValueError):
+        decrypt_parquet_file(
+            str(src), str(tmp_path / "x.parquet"), "local", provider_config
+        )
+
+
+def test_cli_import_does_not_load_pyarrow():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, piicrypto.cli; print('pyarrow' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
@@ -1,3 +1,5 @@
+import pytest
+
 from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
 from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
 
@@ -28,3 +30,33 @@ def test_roundtrip_csv(tmp_path, sample_csv, provider_config):
     dec_text = dec.read_text()
     assert "Ada Lovelace" in dec_text
     assert "Alan Turing" in dec_text
+
+
+def test_encrypt_skips_invalid_rows(
+    tmp_path, sample_csv, provider_config, validation_schema_json
+):
+    with open(sample_csv, "a") as f:
+        f.write("3,Grace Hopper,not-an-ssn,New York\n")
+    enc = tmp_path / "out.enc.csv"
+
+    encrypt_csv_file(
+        input_file=str(sample_csv),
+        output_file=str(enc),
+        mode="local",
+        key_provider_config=str(provider_config),
+        validate_json=str(validation_schema_json),
+    )
+    lines = enc.read_text().splitlines()
+    assert len(lines) == 3
+    assert [line.split(",")[0] for line in lines[1:]] == ["1", "2"]
+
+
+def test_encrypt_rejects_empty_blocks(tmp_path, sample_csv, provider_config):
+    with pytest.raises(ValueError, match="block_size"):
+        encrypt_csv_file(
+            str(sample_csv),
+            str(tmp_path / "out.enc.csv"),
+            "local",
+            provider_config,
+            block_size=0,
+        )
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from piicrypto.encrypt_decrypt.json_crypto import (
+    decrypt_jsonl_file,
+    encrypt_jsonl_file,
+)
+from piicrypto.helpers.cipher_backend import available_backends
+
+
+@pytest.fixture
+def jsonl_config(tmp_path):
+    config = {
+        "key_source": str(tmp_path / "keys.json"),
+        "fields": {
+            "ssn": {"alias": ["$.user.ssn", "ssn"], "encrypt": True},
+            "email": {"alias": ["user.emails", "orders[*].email"], "encrypt": True},
+            "age": {"alias": "user.age", "encrypt": True},
+            "city": {"alias": "user.city", "encrypt": False},
+        },
+    }
+    path = tmp_path / "provider_config.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_encrypt_decrypt_jsonl(tmp_path, jsonl_config):
+    documents = [
+        {
+            "id": 1,
+            "user": {
+                "ssn": "123-45-6789",
+                "emails": ["a@x.io", "a@y.io"],
+                "age": 36,
+                "city": "London",
+            },
+            "orders": [{"email": "a@x.io", "total": 3}],
+        },
+        {"id": 2, "ssn": "987-65-4321", "user": {"emails": []}},
+    ]
+    src = tmp_path / "events.jsonl"
+    src.write_text("\n".join(json.dumps(d) for d in documents) + "\n\n")
+    enc = tmp_path / "events.enc.jsonl"
+    dec = tmp_path / "events.dec.jsonl"
+
+    encrypt_jsonl_file(str(src), str(enc), "local", jsonl_config, create_metadata=True)
+    encrypted = [json.loads(line) for line in enc.read_text().splitlines()]
+    user = encrypted[0]["user"]
+    assert user["ssn"].startswith("v1:")
+    assert all(email.startswith("v1:") for email in user["emails"])
+    assert user["emails"][0] != encrypted[0]["orders"][0]["email"]
+    assert user["age"].startswith("v1:")
+    assert user["city"] == "London"
+    assert encrypted[1]["ssn"].startswith("v1:")
+    metadata = json.loads(open(f"{enc}.metadata.json").read())
+    assert metadata["stats"]["rows"] == 2
+    assert metadata["stats"]["columns"]["user.emails"]["processed"] == 2
+
+    decrypt_jsonl_file(str(enc), str(dec), "local", jsonl_config)
+    assert [json.loads(line) for line in dec.read_text().splitlines()] == documents
+
+
+def test_encrypt_selected_paths(tmp_path, jsonl_config):
+    src = tmp_path / "events.jsonl"
+    src.write_text(json.dumps({"ssn": "1", "user": {"age": 3}}) + "\n")
+    enc = tmp_path / "events.enc.jsonl"
+    encrypt_jsonl_file(str(src), str(enc), "local", jsonl_config, paths=["ssn"])
+    document = json.loads(enc.read_text())
+    assert document["ssn"].startswith("v1:")
+    assert document["user"]["age"] == 3
+    with pytest.raises(ValueError):
+        encrypt_jsonl_file(str(src), str(enc), "local", jsonl_config, paths=["x"])
+
+
+def test_decrypt_leaves_plaintext_with_colons(tmp_path, jsonl_config):
+    src = tmp_path / "events.jsonl"
+    src.write_text(json.dumps({"ssn": "123-45-6789"}) + "\n")
+    enc = tmp_path / "events.enc.jsonl"
+    dec = tmp_path / "events.dec.jsonl"
+    encrypt_jsonl_file(str(src), str(enc), "local", jsonl_config)
+    mixed = json.loads(enc.read_text())
+    mixed["user"] = {"ssn": "a: b", "age": "12:30"}
+    enc.write_text(json.dumps(mixed) + "\n")
+
+    decrypt_jsonl_file(str(enc), str(dec), "local", jsonl_config)
+    assert json.loads(dec.read_text()) == {
+        "ssn": "123-45-6789",
+        "user": {"ssn": "a: b", "age": "12:30"},
+    }
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_jsonl_cipher_backend(tmp_path, jsonl_config, backend):
+    src = tmp_path / "events.jsonl"
+    src.write_text(json.dumps({"ssn": "123-45-6789"}) + "\n")
+    enc = tmp_path / "events.enc.jsonl"
+    dec = tmp_path / "events.dec.jsonl"
+    encrypt_jsonl_file(
+        str(src), str(enc), "local", jsonl_config, True, cipher_backend=backend
+    )
+    metadata = json.loads(open(f"{enc}.metadata.json").read())
+    assert metadata["cipher_backend"] == backend
+    decrypt_jsonl_file(
+        str(enc), str(dec), "local", jsonl_config, cipher_backend="pycryptodome"
+    )
+    assert json.loads(dec.read_text()) == {"ssn": "123-45-6789"}
@@ -0,0 +1,124 @@
+import sqlite3
+
+import pytest
+
+from piicrypto.encrypt_decrypt.sqlite_crypto import (
+    decrypt_sqlite_table,
+    encrypt_sqlite_table,
+)
+
+ROWS = [
+    (1, "Ada Lovelace", "123-45-6789", "London", 36.5),
+    (2, "Alan Turing", "111-22-3333", None, 41.0),
+    (3, "Grace Hopper", "222-33-4444", "New York", 85.25),
+]
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "people.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            'CREATE TABLE people (id INTEGER PRIMARY KEY, "Name" TEXT, '
+            '"Social Security Number" TEXT, "Address" TEXT, score REAL)'
+        )
+        connection.executemany("INSERT INTO people VALUES (?, ?, ?, ?, ?)", ROWS)
+    connection.close()
+    return str(path)
+
+
+def _rows(database, table, columns="*"):
+    connection = sqlite3.connect(database)
+    try:
+        return connection.execute(
+            f"SELECT {columns} FROM {table} ORDER BY id"
+        ).fetchall()
+    finally:
+        connection.close()
+
+
+def test_encrypt_decrypt_in_place(database, provider_config):
+    encrypt_sqlite_table(database, "people", "local", provider_config, batch_size=2)
+    encrypted = _rows(database, "people")
+    assert all(
+        row[1].startswith("v1:") and row[2].startswith("v1:") for row in encrypted
+    )
+    assert [row[3] for row in encrypted] == ["London", None, "New York"]
+    assert all(row[5] for row in encrypted)
+
+    # rerunning skips rows that already carry a nonce
+    encrypt_sqlite_table(database, "people", "local", provider_config)
+    assert _rows(database, "people") == encrypted
+
+    decrypt_sqlite_table(database, "people", "local", provider_config, batch_size=2)
+    assert (
+        _rows(database, "people", 'id, Name, "Social Security Number", Address, score')
+        == ROWS
+    )
+    assert all(row[0] is None for row in _rows(database, "people", "row_iv"))
+
+
+def test_encrypt_into_new_table_resumes(database, provider_config):
+    with sqlite3.connect(database) as connection:
+        connection.execute(
+            'CREATE TABLE people_enc (id INTEGER, "Name" TEXT, '
+            '"Social Security Number" TEXT, "Address" TEXT, score REAL, '
+            "row_iv TEXT, PRIMARY KEY (id))"
+        )
+        connection.execute(
+            "INSERT INTO people_enc VALUES (1, 'already', 'done', 'x', 0, 'iv')"
+        )
+    connection.close()
+
+    encrypt_sqlite_table(
+        database,
+        "people",
+        "local",
+        provider_config,
+        output_table="people_enc",
+        create_metadata=True,
+    )
+    encrypted = _rows(database, "people_enc")
+    assert encrypted[0][1] == "already"
+    assert [row[0] for row in encrypted] == [1, 2, 3]
+    assert encrypted[1][1].startswith("v1:")
+    assert _rows(database, "people") == ROWS
+
+    decrypt_sqlite_table(
+        database, "people_enc", "local", provider_config, output_table="people_dec"
+    )
+    assert _rows(database, "people_dec")[1:] == ROWS[1:]
+
+
+def test_failed_rows_keep_their_nonce(database, provider_config):
+    encrypt_sqlite_table(database, "people", "local", provider_config)
+    tampered = _rows(database, "people")[0]
+    version, sealed = tampered[1].split(":")
+    corrupted = f"{version}:{sealed[:-4]}AAA="
+    with sqlite3.connect(database) as connection:
+        connection.execute('UPDATE people SET "Name" = ? WHERE id = 1', (corrupted,))
+    connection.close()
+
+    decrypt_sqlite_table(database, "people", "local", provider_config)
+    rows = _rows(database, "people")
+    assert rows[0][1] == corrupted
+    assert rows[0][2] == tampered[2]
+    assert rows[0][5] == tampered[5]
+    assert rows[1:] == [(*row, None) for row in ROWS[1:]]
+
+
+def test_plaintext_with_colons_is_left_alone(database, provider_config):
+    with sqlite3.connect(database) as connection:
+        connection.execute("UPDATE people SET Address = 'Suite 10: London'")
+    connection.close()
+    encrypt_sqlite_table(database, "people", "local", provider_config)
+    with sqlite3.connect(database) as connection:
+        connection.execute("UPDATE people SET Name = 'Room 4: Ada' WHERE id = 1")
+    connection.close()
+
+    decrypt_sqlite_table(database, "people", "local", provider_config)
+    rows = _rows(database, "people")
+    assert [row[3] for row in rows] == ["Suite 10: London"] * 3
+    assert rows[0][1] == "Room 4: Ada"
+    assert rows[0][2] == ROWS[0][2]
+    assert rows[1][1] == ROWS[1][1]
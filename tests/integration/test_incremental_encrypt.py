@@ -0,0 +1,132 @@
+import hashlib
+import json
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.helpers.integrity import compare_metadata
+
+
+def _encrypt(sample_csv, enc, provider_config):
+    encrypt_csv_file(
+        str(sample_csv), str(enc), "local", provider_config, incremental=True
+    )
+    return json.loads(open(f"{enc}.metadata.json").read())
+
+
+def test_incremental_appends_new_rows(tmp_path, sample_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["watermark"]["row_count"] == 2
+    assert metadata["watermark"]["input_offset"] == sample_csv.stat().st_size
+    first_run = enc.read_text()
+
+    with open(sample_csv, "a") as f:
+        f.write("3,Grace Hopper,222-33-4444,New York\n")
+        f.write("4,Edsger Dijkstra,333-44-5555,Rotterdam")
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["incremental_run"] == {
+        "resumed": True,
+        "rows_read": 2,
+        "skipped_bytes": 0,
+    }
+    assert metadata["watermark"]["row_count"] == 4
+    assert enc.read_text().startswith(first_run)
+    assert len(enc.read_text().splitlines()) == 5
+
+    with open(sample_csv, "a") as f:
+        f.write("\n")
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["incremental_run"] == {
+        "resumed": True,
+        "rows_read": 0,
+        "skipped_bytes": 0,
+    }
+
+    decrypt_csv_file(str(enc), str(dec), "local", provider_config)
+    names = [line.split(",")[1] for line in dec.read_text().splitlines()[1:]]
+    assert names == ["Ada Lovelace", "Alan Turing", "Grace Hopper", "Edsger Dijkstra"]
+
+
+def test_incremental_falls_back_to_full_run(tmp_path, sample_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    _encrypt(sample_csv, enc, provider_config)
+
+    sample_csv.write_text("id,Name,Social Security Number,Address\n")
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["incremental_run"]["resumed"] is False
+    assert len(enc.read_text().splitlines()) == 1
+
+    sample_csv.write_text("id,Name,SSN,Address\n1,Ada,123-45-6789,London\n")
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["incremental_run"]["resumed"] is False
+    assert metadata["incremental_run"]["rows_read"] == 1
+    assert enc.read_text().splitlines()[0] == "id,Name,SSN,Address,row_iv"
+
+
+def test_incremental_extended_last_row_rewrites_output(
+    tmp_path, sample_csv, provider_config
+):
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+    with open(sample_csv, "a") as f:
+        f.write("3,Grace Hopper,222-33-4444,New")
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["watermark"]["row_count"] == 3
+
+    with open(sample_csv, "a") as f:
+        f.write(" York\n")
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["incremental_run"]["resumed"] is False
+    assert metadata["incremental_run"]["rows_read"] == 3
+
+    decrypt_csv_file(str(enc), str(dec), "local", provider_config)
+    assert ",New York," in dec.read_text().splitlines()[-1]
+
+
+def test_incremental_layout_change_rewrites_output(
+    tmp_path, sample_csv, provider_config
+):
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+    _encrypt(sample_csv, enc, provider_config)
+
+    with open(sample_csv, "a") as f:
+        f.write("3,Grace Hopper,222-33-4444,New York\n")
+    encrypt_csv_file(
+        str(sample_csv),
+        str(enc),
+        "local",
+        provider_config,
+        incremental=True,
+        packed=True,
+    )
+    metadata = json.loads(open(f"{enc}.metadata.json").read())
+    assert metadata["incremental_run"]["resumed"] is False
+    assert metadata["incremental_run"]["rows_read"] == 3
+    assert "packed:default" in enc.read_text().splitlines()[0]
+
+    decrypt_csv_file(str(enc), str(dec), "local", provider_config)
+    names = [line.split(",")[1] for line in dec.read_text().splitlines()[1:]]
+    assert names == ["Ada Lovelace", "Alan Turing", "Grace Hopper"]
+
+
+def test_incremental_output_checksum_covers_whole_file(
+    tmp_path, sample_csv, provider_config
+):
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+    _encrypt(sample_csv, enc, provider_config)
+    with open(sample_csv, "a") as f:
+        f.write("3,Grace Hopper,222-33-4444,New York\n")
+    metadata = _encrypt(sample_csv, enc, provider_config)
+    assert metadata["incremental_run"]["resumed"] is True
+    assert metadata["integrity"]["output"] == {
+        "sha256": hashlib.sha256(enc.read_bytes()).hexdigest(),
+        "bytes": enc.stat().st_size,
+        "start_offset": 0,
+    }
+
+    decrypt_csv_file(str(enc), str(dec), "local", provider_config, True)
+    assert compare_metadata(f"{enc}.metadata.json", f"{dec}.metadata.json") == []
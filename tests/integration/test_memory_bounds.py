@@ -0,0 +1,94 @@
+"""
+Bounded-memory checks for encryption, decryption and validation.
+
+Each workload runs alone in a fresh interpreter on a small and a large
+generated input and reports its tracemalloc peak; the large run may only
+exceed the small one by a fixed slack, well below the size of the rows of
+the large input, so keeping rows around fails the check. Set
+PIICRYPTO_MEMORY_TEST_BYTES (e.g. 4000000000) to run them on multi-GB inputs
+and PIICRYPTO_MEMORY_SLACK_BYTES to change the slack.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+
+SMALL_INPUT_BYTES = 32 * 1024
+LARGE_INPUT_BYTES = int(os.environ.get("PIICRYPTO_MEMORY_TEST_BYTES", 256 * 1024))
+SLACK_BYTES = int(os.environ.get("PIICRYPTO_MEMORY_SLACK_BYTES", 1024 * 1024))
+
+WORKLOAD = """
+import sys, tracemalloc
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+
+workload, src, config, schema = sys.argv[1:]
+tracemalloc.start()
+if workload == "decrypt":
+    decrypt_csv_file(src, src + ".dec", "local", config)
+else:
+    encrypt_csv_file(
+        src,
+        src + ".enc",
+        "local",
+        config,
+        validate_json=schema if workload == "validate" else None,
+    )
+print(tracemalloc.get_traced_memory()[1])
+"""
+
+
+def _generate(path, size):
+    with open(path, "w") as f:
+        f.write("id,Name,Social Security Number,Address\n")
+        row = 0
+        while f.tell() < size:
+            row += 1
+            f.write(f"{row},Person {row},123-45-{row % 10000:04d},{row} Main St\n")
+
+
+def _peak_traced(tmp_path, workload, size, provider_config, schema):
+    src = tmp_path / f"{workload}_{size}.csv"
+    _generate(src, size)
+    if workload == "decrypt":
+        encrypt_csv_file(str(src), f"{src}.enc", "local", provider_config)
+        src = src.with_name(f"{src.name}.enc")
+    result = subprocess.run(
+        [sys.executable, "-c", WORKLOAD, workload, str(src), provider_config, schema],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return int(result.stdout)
+
+
+@pytest.mark.parametrize("workload", ["encrypt", "decrypt", "validate"])
+def test_peak_memory_is_bounded(
+    tmp_path, provider_config, validation_schema_json, workload
+):
+    peak = {
+        size: _peak_traced(
+            tmp_path, workload, size, provider_config, str(validation_schema_json)
+        )
+        for size in (SMALL_INPUT_BYTES, LARGE_INPUT_BYTES)
+    }
+    assert peak[LARGE_INPUT_BYTES] - peak[SMALL_INPUT_BYTES] < SLACK_BYTES
+
+
+def test_profile_memory_metadata(tmp_path, sample_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    encrypt_csv_file(
+        str(sample_csv), str(enc), "local", provider_config, profile_memory=True
+    )
+    profile = json.loads(open(f"{enc}.metadata.json").read())["memory_profile"]
+    assert profile["traced_peak_bytes"] >= profile["traced_end_bytes"] > 0
+    assert profile["samples"][0][0] == 2
+    assert len(profile["top_growth"]) <= 10
+    if sys.platform != "win32":
+        assert profile["peak_rss_bytes"] > 0
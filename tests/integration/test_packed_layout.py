@@ -0,0 +1,92 @@
+import csv
+import json
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.encrypt_decrypt.verifier import verify_csv_file
+
+
+def _grouped_config(tmp_path):
+    config = tmp_path / "provider.json"
+    config.write_text(
+        json.dumps(
+            {
+                "key_source": str(tmp_path / "keys.json"),
+                "fields": {
+                    "Name": {"alias": "name", "key_group": "contact"},
+                    "Email": {"alias": "email", "key_group": "contact"},
+                    "Social Security Number": {"alias": "ssn"},
+                    "Address": {"alias": "address", "encrypt": False},
+                },
+            }
+        )
+    )
+    return str(config)
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_packed_roundtrip(tmp_path):
+    config = _grouped_config(tmp_path)
+    src = tmp_path / "in.csv"
+    src.write_text(
+        "id,Name,Email,Social Security Number,Address\n"
+        "1,Ada Lovelace,ada@example.com,123-45-6789,London\n"
+        "2,Alan Turing,,111-22-3333,Manchester\n"
+        "3,,,,Nowhere\n"
+    )
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+
+    encrypt_csv_file(str(src), str(enc), "local", config, packed=True)
+    rows = _read(enc)
+    assert list(rows[0]) == [
+        "id",
+        "Name",
+        "Email",
+        "Social Security Number",
+        "Address",
+        "packed:contact",
+        "packed:default",
+        "row_iv",
+    ]
+    assert rows[0]["Name"] == rows[0]["Email"] == ""
+    assert rows[0]["Address"] == "London"
+    assert rows[0]["packed:contact"].startswith("v1:")
+    assert rows[2]["packed:contact"] == rows[2]["packed:default"] == ""
+
+    assert verify_csv_file(str(enc), "local", config)["failures"] == 0
+
+    decrypt_csv_file(str(enc), str(dec), "local", config, create_metadata=True)
+    original = _read(src)
+    for row, expected in zip(_read(dec), original):
+        assert row["packed:contact"] == row["packed:default"] == ""
+        assert {name: row[name] for name in expected} == expected
+    stats = json.loads(open(f"{dec}.metadata.json").read())["stats"]
+    assert stats["errors"] == 0
+    assert stats["columns"]["Name"]["processed"] == 2
+    assert stats["columns"]["Email"]["processed"] == 1
+
+
+def test_packed_tampered_column_is_flagged(tmp_path):
+    config = _grouped_config(tmp_path)
+    src = tmp_path / "in.csv"
+    src.write_text("Name,Email\nAda Lovelace,ada@example.com\n")
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+    encrypt_csv_file(str(src), str(enc), "local", config, packed=True)
+    rows = _read(enc)
+    version, sealed = rows[0]["packed:contact"].split(":")
+    rows[0]["packed:contact"] = f"{version}:{sealed[:-4]}AAA="
+    with open(enc, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    decrypt_csv_file(str(enc), str(dec), "local", config)
+    row = _read(dec)[0]
+    assert row["Name"] == ""
+    assert row["packed:contact"].endswith("Decryption Error")
@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_rows
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+
+
+@pytest.fixture
+def customers_csv(tmp_path):
+    path = tmp_path / "customers.csv"
+    lines = ["id,Name,Social Security Number,Address"]
+    lines += [f"c{i},Pérson {i},123-45-{i:04d},Street {i}" for i in range(10)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _names(path):
+    with open(path, newline="") as f:
+        return [row["Name"] for row in csv.DictReader(f)]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"pipeline": True, "block_size": 3}, {"max_rows_per_shard": 4}],
+)
+def test_decrypt_indexed_rows(tmp_path, customers_csv, provider_config, options):
+    enc = tmp_path / "out.enc.csv"
+    found = tmp_path / "found.csv"
+    encrypt_csv_file(
+        str(customers_csv),
+        str(enc),
+        "local",
+        provider_config,
+        index_id_column="id",
+        **options,
+    )
+
+    count = decrypt_csv_rows(
+        str(enc), str(found), "local", provider_config, rows=[7, 0], ids=["c4"]
+    )
+    assert count == 3
+    assert _names(found) == ["Pérson 7", "Pérson 0", "Pérson 4"]
+
+    assert (
+        decrypt_csv_rows(
+            str(enc), str(found), "local", provider_config, ids=["missing"]
+        )
+        == 0
+    )
+
+
+def test_index_follows_incremental_runs(tmp_path, customers_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    found = tmp_path / "found.csv"
+    for _ in range(2):
+        encrypt_csv_file(
+            str(customers_csv),
+            str(enc),
+            "local",
+            provider_config,
+            incremental=True,
+            index=True,
+        )
+        with open(customers_csv, "a") as f:
+            f.write("c10,Grace Hopper,222-33-4444,New York\n")
+
+    decrypt_csv_rows(str(enc), str(found), "local", provider_config, rows=[10, 3])
+    assert _names(found) == ["Grace Hopper", "Pérson 3"]
+
+
+def test_index_id_column_must_be_plain(tmp_path, customers_csv, provider_config):
+    with pytest.raises(ValueError, match="must be a plain column"):
+        encrypt_csv_file(
+            str(customers_csv),
+            str(tmp_path / "out.enc.csv"),
+            "local",
+            provider_config,
+            index_id_column="Name",
+        )
@@ -0,0 +1,112 @@
+import csv
+import json
+
+import pytest
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.encrypt_decrypt.searcher import search_csv_file
+from piicrypto.encrypt_decrypt.verifier import verify_csv_file
+
+
+@pytest.fixture
+def indexed_config(tmp_path):
+    config = tmp_path / "provider.json"
+    config.write_text(
+        json.dumps(
+            {
+                "key_source": str(tmp_path / "keys.json"),
+                "fields": {
+                    "Name": {"alias": "name"},
+                    "Email": {"alias": "email", "blind_index": True},
+                },
+            }
+        )
+    )
+    return str(config)
+
+
+@pytest.fixture
+def contacts_csv(tmp_path):
+    path = tmp_path / "contacts.csv"
+    path.write_text(
+        "id,Name,Email\n"
+        "1,Ada Lovelace,ada@example.com\n"
+        "2,Alan Turing,alan@example.com\n"
+        "3,Ada Byron,ADA@example.com \n"
+        "4,Nobody,\n"
+    )
+    return path
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_search_blind_index(tmp_path, contacts_csv, indexed_config, packed):
+    enc = tmp_path / "out.enc.csv"
+    found = tmp_path / "found.csv"
+    encrypt_csv_file(
+        str(contacts_csv), str(enc), "local", indexed_config, packed=packed
+    )
+    with open(enc, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert "Name_bidx" not in rows[0]
+    assert rows[0]["Email_bidx"].startswith("v1:")
+    assert rows[0]["Email_bidx"] == rows[2]["Email_bidx"]
+    assert rows[3]["Email_bidx"] == ""
+
+    matches = search_csv_file(
+        str(enc),
+        "local",
+        indexed_config,
+        "Email",
+        "Ada@Example.com",
+        output_file=str(found),
+    )
+    assert matches == [0, 2]
+    with open(found, newline="") as f:
+        assert [row["Name"] for row in csv.DictReader(f)] == [
+            "Ada Lovelace",
+            "Ada Byron",
+        ]
+    assert search_csv_file(str(enc), "local", indexed_config, "Email", "x") == []
+
+    assert verify_csv_file(str(enc), "local", indexed_config)["failures"] == 0
+    decrypt_csv_file(str(enc), str(tmp_path / "dec.csv"), "local", indexed_config)
+    assert "Decryption Error" not in (tmp_path / "dec.csv").read_text()
+
+
+def test_search_needs_configured_blind_index(tmp_path, contacts_csv, indexed_config):
+    enc = tmp_path / "out.enc.csv"
+    encrypt_csv_file(str(contacts_csv), str(enc), "local", indexed_config)
+    with pytest.raises(ValueError, match="no blind index"):
+        search_csv_file(str(enc), "local", indexed_config, "Name", "Ada Lovelace")
+
+
+def test_columns_named_like_blind_indexes_are_decrypted(tmp_path):
+    config = tmp_path / "provider.json"
+    config.write_text(
+        json.dumps(
+            {
+                "key_source": str(tmp_path / "keys.json"),
+                "fields": {
+                    "Email": {"alias": "email", "blind_index": True},
+                    "Ref_bidx": {"alias": "ref_bidx"},
+                },
+            }
+        )
+    )
+    source = tmp_path / "in.csv"
+    source.write_text("id,Email,Ref_bidx\n1,ada@example.com,R-1\n")
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+    encrypt_csv_file(str(source), str(enc), "local", str(config))
+    with open(enc, newline="") as f:
+        assert next(csv.DictReader(f))["Ref_bidx"].startswith("v1:")
+
+    decrypt_csv_file(str(enc), str(dec), "local", str(config))
+    with open(dec, newline="") as f:
+        row = next(csv.DictReader(f))
+    assert row["Email"] == "ada@example.com"
+    assert row["Ref_bidx"] == "R-1"
+    assert row["Email_bidx"].startswith("v1:")
+    report = verify_csv_file(str(enc), "local", str(config))
+    assert report["failures"] == 0
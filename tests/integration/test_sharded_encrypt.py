@@ -0,0 +1,117 @@
+import hashlib
+import json
+
+import pytest
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.helpers.integrity import compare_metadata
+
+
+@pytest.fixture
+def large_csv(tmp_path):
+    path = tmp_path / "large.csv"
+    lines = ["id,Name,Social Security Number,Address"]
+    lines += [f"{i},Person {i},123-45-{i:04d},Street {i}" for i in range(1, 11)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _manifest(enc):
+    return json.loads(open(f"{enc}.metadata.json").read())["shards"]
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_max_rows_per_shard(tmp_path, large_csv, provider_config, pipeline):
+    enc = tmp_path / "out.enc.csv"
+    encrypt_csv_file(
+        str(large_csv),
+        str(enc),
+        "local",
+        provider_config,
+        pipeline=pipeline,
+        block_size=3,
+        max_rows_per_shard=4,
+    )
+    manifest = _manifest(enc)
+    assert [(s["first_row"], s["last_row"]) for s in manifest] == [
+        (0, 3),
+        (4, 7),
+        (8, 9),
+    ]
+    assert not enc.exists()
+
+    names = []
+    for shard in manifest:
+        data = open(shard["file"], "rb").read()
+        assert hashlib.sha256(data).hexdigest() == shard["sha256"]
+        assert len(data) == shard["bytes"]
+        dec = tmp_path / "dec.csv"
+        decrypt_csv_file(shard["file"], str(dec), "local", provider_config)
+        lines = dec.read_text().splitlines()
+        assert lines[0].startswith("id,Name,Social Security Number,Address")
+        names += [line.split(",")[1] for line in lines[1:]]
+    assert names == [f"Person {i}" for i in range(1, 11)]
+
+
+def test_shard_count_and_byte_limit(tmp_path, large_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    encrypt_csv_file(
+        str(large_csv), str(enc), "local", provider_config, block_size=1, shards=3
+    )
+    manifest = _manifest(enc)
+    assert len(manifest) == 3
+    assert sum(s["rows"] for s in manifest) == 10
+
+    encrypt_csv_file(
+        str(large_csv),
+        str(enc),
+        "local",
+        provider_config,
+        max_bytes_per_shard=600,
+    )
+    manifest = _manifest(enc)
+    assert len(manifest) > 1
+    assert all(s["bytes"] <= 600 for s in manifest)
+    assert sum(s["rows"] for s in manifest) == 10
+
+
+@pytest.mark.parametrize("shards", [3, 4, 12])
+def test_exact_shard_count(tmp_path, large_csv, provider_config, shards):
+    enc = tmp_path / "out.enc.csv"
+    encrypt_csv_file(str(large_csv), str(enc), "local", provider_config, shards=shards)
+    manifest = _manifest(enc)
+    assert len(manifest) == shards
+    assert all(s["rows"] for s in manifest[: min(shards, 10)])
+    assert sum(s["rows"] for s in manifest) == 10
+    assert all(open(s["file"]).readline().startswith("id,") for s in manifest)
+
+
+def test_shards_reject_incremental(tmp_path, sample_csv, provider_config):
+    with pytest.raises(ValueError):
+        encrypt_csv_file(
+            str(sample_csv),
+            str(tmp_path / "out.csv"),
+            "local",
+            provider_config,
+            incremental=True,
+            shards=2,
+        )
+
+
+def test_compare_sharded_metadata(tmp_path, large_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "dec.csv"
+    encrypt_csv_file(str(large_csv), str(enc), "local", provider_config, shards=3)
+    enc_meta = f"{enc}.metadata.json"
+    shards = json.loads(open(enc_meta).read())["integrity"]["output"]["shards"]
+    assert len(shards) == 3
+    assert compare_metadata(enc_meta, enc_meta) == []
+
+    decrypt_csv_file(shards[1]["file"], str(dec), "local", provider_config, True)
+    dec_meta = f"{dec}.metadata.json"
+    assert compare_metadata(enc_meta, dec_meta) == []
+
+    decrypt_csv_file(str(large_csv), str(dec), "local", provider_config, True)
+    mismatches = compare_metadata(enc_meta, dec_meta)
+    assert mismatches[0].endswith("matches no shard of first output")
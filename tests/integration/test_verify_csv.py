@@ -0,0 +1,69 @@
+import csv
+
+import pytest
+
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.encrypt_decrypt.verifier import verify_csv_file
+
+
+@pytest.fixture
+def encrypted_csv(tmp_path, sample_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    encrypt_csv_file(str(sample_csv), str(enc), "local", provider_config)
+    return enc
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_clean_file(tmp_path, encrypted_csv, provider_config, workers):
+    report = tmp_path / "report.csv"
+    summary = verify_csv_file(
+        str(encrypted_csv),
+        "local",
+        provider_config,
+        report_file=str(report),
+        workers=workers,
+        block_size=1,
+    )
+    assert summary == {"rows": 2, "cells": 4, "failures": 0, "failures_by_version": {}}
+    assert report.read_text().splitlines() == ["row_number,column,key_version,error"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "in.csv",
+        "out.enc.csv",
+        "report.csv",
+    ]
+
+
+def test_verify_reports_tampered_cells(tmp_path, encrypted_csv, provider_config):
+    with open(encrypted_csv) as f:
+        rows = list(csv.DictReader(f))
+    version, data = rows[1]["Name"].split(":")
+    rows[1]["Name"] = f"{version}:{data[:-4]}AAA="
+    rows[0]["Social Security Number"] = "v9:" + data
+    with open(encrypted_csv, "w") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    report = tmp_path / "report.csv"
+    summary = verify_csv_file(
+        str(encrypted_csv), "local", provider_config, report_file=str(report)
+    )
+    assert summary["failures"] == 2
+    assert summary["failures_by_version"] == {"v1": 1, "v9": 1}
+    with open(report) as f:
+        failures = {
+            (r["row_number"], r["column"], r["key_version"]) for r in csv.DictReader(f)
+        }
+    assert failures == {("1", "Name", "v1"), ("0", "Social Security Number", "v9")}
+
+
+def test_verify_ignores_plaintext_columns(tmp_path, provider_config):
+    src = tmp_path / "in.csv"
+    src.write_text(
+        "id,Name,Social Security Number,Address\n"
+        '1,Ada Lovelace,123-45-6789,"Suite 10: London"\n'
+    )
+    enc = tmp_path / "out.enc.csv"
+    encrypt_csv_file(str(src), str(enc), "local", provider_config)
+    summary = verify_csv_file(str(enc), "local", provider_config)
+    assert summary == {"rows": 1, "cells": 2, "failures": 0, "failures_by_version": {}}
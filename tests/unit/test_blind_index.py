@@ -0,0 +1,12 @@
+import base64
+
+from piicrypto.helpers.blind_index import BLIND_INDEX_BYTES, blind_index
+from piicrypto.helpers.utils import generate_aes_key
+
+
+def test_blind_index_normalizes_and_truncates():
+    key = generate_aes_key()
+    tag = blind_index(key, "Ada  LOVELACE ")
+    assert tag == blind_index(key, "ada lovelace")
+    assert tag != blind_index(generate_aes_key(), "ada lovelace")
+    assert len(base64.b64decode(tag)) == BLIND_INDEX_BYTES
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+from Crypto.Random import get_random_bytes
+
+from piicrypto.helpers import cipher_backend
+from piicrypto.helpers.cipher_backend import (
+    CIPHER_BACKENDS,
+    available_backends,
+    get_cipher_backend,
+    select_cipher_backend,
+)
+
+
+@pytest.mark.parametrize("writer", available_backends())
+@pytest.mark.parametrize("reader", available_backends())
+def test_backends_are_byte_compatible(writer, reader):
+    key, nonce = get_random_bytes(32), get_random_bytes(12)
+    sealed = get_cipher_backend(writer).encrypt(key, nonce, b"123-45-6789")
+    assert sealed == CIPHER_BACKENDS["pycryptodome"]().encrypt(
+        key, nonce, b"123-45-6789"
+    )
+    assert get_cipher_backend(reader).decrypt(key, nonce, sealed) == b"123-45-6789"
+    tampered = bytes([sealed[0] ^ 1]) + sealed[1:]
+    with pytest.raises(ValueError):
+        get_cipher_backend(reader).decrypt(key, nonce, tampered)
+
+
+def test_auto_selection_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("PIICRYPTO_CACHE_DIR", str(tmp_path))
+    select_cipher_backend.cache_clear()
+    choice = select_cipher_backend()
+    assert choice in available_backends()
+    if len(available_backends()) > 1:
+        cached = json.loads((tmp_path / cipher_backend.CACHE_FILE).read_text())
+        assert cached["backend"] == choice
+        cached["backend"] = "pycryptodome"
+        (tmp_path / cipher_backend.CACHE_FILE).write_text(json.dumps(cached))
+        select_cipher_backend.cache_clear()
+        assert select_cipher_backend() == "pycryptodome"
+    select_cipher_backend.cache_clear()
+    with pytest.raises(ValueError):
+        get_cipher_backend("missing")
@@ -0,0 +1,64 @@
+import hashlib
+import json
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.helpers.integrity import compare_metadata
+
+
+def _roundtrip(tmp_path, sample_csv, provider_config):
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+    encrypt_csv_file(str(sample_csv), str(enc), "local", provider_config, True)
+    decrypt_csv_file(str(enc), str(dec), "local", provider_config, True)
+    return enc, dec
+
+
+def test_checksums_and_stats_in_metadata(tmp_path, sample_csv, provider_config):
+    with open(sample_csv, "a") as f:
+        f.write("3,,333-44-5555,Leeds\n")
+    enc, dec = _roundtrip(tmp_path, sample_csv, provider_config)
+    enc_meta = json.loads((tmp_path / "out.enc.csv.metadata.json").read_text())
+    dec_meta = json.loads((tmp_path / "out.dec.csv.metadata.json").read_text())
+
+    source_bytes = sample_csv.read_bytes()
+    assert enc_meta["integrity"]["input"] == {
+        "sha256": hashlib.sha256(source_bytes).hexdigest(),
+        "bytes": len(source_bytes),
+        "start_offset": 0,
+    }
+    assert (
+        enc_meta["integrity"]["output"]["sha256"]
+        == hashlib.sha256(enc.read_bytes()).hexdigest()
+    )
+    assert (
+        dec_meta["integrity"]["output"]["sha256"]
+        == hashlib.sha256(dec.read_bytes()).hexdigest()
+    )
+
+    stats = enc_meta["stats"]
+    assert stats["rows"] == 3 and stats["cells"] == 12
+    assert stats["columns"]["Name"] == {
+        "processed": 2,
+        "empty": 1,
+        "key_versions": {"v1": 2},
+    }
+    assert stats["columns"]["id"]["processed"] == 0
+    assert dec_meta["stats"]["columns"]["Name"]["processed"] == 2
+
+
+def test_compare_metadata(tmp_path, sample_csv, provider_config):
+    _roundtrip(tmp_path, sample_csv, provider_config)
+    enc_meta = str(tmp_path / "out.enc.csv.metadata.json")
+    dec_meta = str(tmp_path / "out.dec.csv.metadata.json")
+    assert compare_metadata(enc_meta, dec_meta) == []
+    assert compare_metadata(enc_meta, enc_meta) == []
+
+    tampered = json.loads(open(dec_meta).read())
+    tampered["integrity"]["input"]["sha256"] = "0" * 64
+    tampered["stats"]["columns"]["Name"]["processed"] = 1
+    with open(dec_meta, "w") as f:
+        json.dump(tampered, f)
+    mismatches = compare_metadata(enc_meta, dec_meta)
+    assert len(mismatches) == 2
+    assert mismatches[0].startswith("sha256")
@@ -0,0 +1,48 @@
+import pytest
+
+from piicrypto.helpers.json_paths import PathMatcher, parse_path
+
+
+def test_parse_path():
+    assert parse_path("$.user.emails[*]") == [
+        ("key", "user"),
+        ("key", "emails"),
+        ("index", "*"),
+    ]
+    assert parse_path("orders[0]['ship.to']") == [
+        ("key", "orders"),
+        ("index", 0),
+        ("key", "ship.to"),
+    ]
+    with pytest.raises(ValueError):
+        parse_path("user..ssn")
+
+
+def test_matcher_applies_paths():
+    matcher = PathMatcher(
+        {
+            "ssn": "ssn",
+            "user.emails": "emails",
+            "orders[*].card": "card",
+            "contacts[0].phone": "phone",
+            "meta.*.ip": "ip",
+        }
+    )
+    document = {
+        "ssn": "123-45-6789",
+        "user": {"emails": ["a@x.io", "b@x.io"], "name": "Ada"},
+        "orders": [{"card": 4111, "total": 3}, {"total": 4}],
+        "contacts": [{"phone": "1"}, {"phone": "2"}],
+        "meta": {"web": {"ip": "10.0.0.1"}, "app": {"ip": None}},
+        "other": {"ssn": "kept"},
+    }
+    result = matcher.apply(document, lambda value, target: f"<{target}:{value}>")
+    assert result["ssn"] == "<ssn:123-45-6789>"
+    assert result["user"] == {
+        "emails": ["<emails:a@x.io>", "<emails:b@x.io>"],
+        "name": "Ada",
+    }
+    assert result["orders"] == [{"card": "<card:4111>", "total": 3}, {"total": 4}]
+    assert result["contacts"] == [{"phone": "<phone:1>"}, {"phone": "2"}]
+    assert result["meta"] == {"web": {"ip": "<ip:10.0.0.1>"}, "app": {"ip": None}}
+    assert result["other"] == {"ssn": "kept"}
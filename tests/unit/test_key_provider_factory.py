@@ -0,0 +1,72 @@
+import json
+import sys
+
+import pytest
+
+from piicrypto.key_provider.caching_key_provider import CachingKeyProvider
+from piicrypto.key_provider.chain_key_provider import ChainKeyProvider
+from piicrypto.key_provider.key_manager import KeyManager
+from piicrypto.key_provider.key_provider_factory import (
+    KeyProviderFactory,
+    get_key_provider_class,
+    register_key_provider,
+)
+from piicrypto.key_provider.local_key_provider import LocalKeyProvider
+
+
+class CountingKeyProvider(LocalKeyProvider):
+    calls = 0
+
+    def get_keys_by_version(self, version):
+        CountingKeyProvider.calls += 1
+        return super().get_keys_by_version(version)
+
+
+def test_unknown_provider_raises(provider_config):
+    with pytest.raises(ValueError):
+        KeyProviderFactory.create_key_provider("missing", provider_config)
+
+
+def test_providers_are_imported_lazily():
+    sys.modules.pop("piicrypto.key_provider.vault_key_provider", None)
+    get_key_provider_class("local")
+    assert "piicrypto.key_provider.vault_key_provider" not in sys.modules
+    get_key_provider_class("vault")
+    assert "piicrypto.key_provider.vault_key_provider" in sys.modules
+
+
+def test_registered_provider_with_cache(tmp_path):
+    config = tmp_path / "provider_config.json"
+    config.write_text(
+        json.dumps(
+            {
+                "key_source": str(tmp_path / "keys.json"),
+                "fields": {"Name": {"alias": "name", "encrypt": True}},
+            }
+        )
+    )
+    register_key_provider("counting", CountingKeyProvider)
+    CountingKeyProvider.calls = 0
+    key_manager = KeyManager("cached:counting", str(config))
+    assert isinstance(key_manager.provider, CachingKeyProvider)
+    first = key_manager.get_keys_by_version("v1")
+    assert key_manager.get_keys_by_version("v1") is first
+    assert CountingKeyProvider.calls == 1
+
+    key_manager.rotate_keys()
+    assert key_manager.load_keys()["Name"][0] == "v2"
+    key_manager.get_keys_by_version("v1")
+    assert CountingKeyProvider.calls == 2
+
+
+def test_chain_falls_back(provider_config, tmp_path):
+    class EmptyKeyProvider(LocalKeyProvider):
+        def get_keys_by_version(self, version):
+            raise ValueError(f"Version {version} not found")
+
+    register_key_provider("empty", EmptyKeyProvider)
+    key_manager = KeyManager("chain:empty,local", provider_config)
+    assert isinstance(key_manager.provider, ChainKeyProvider)
+    assert "Name" in key_manager.get_keys_by_version("v1")
+    with pytest.raises(ValueError):
+        key_manager.get_keys_by_version("v99")
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.helpers.nonce_source import (
+    CounterNonceSource,
+    RandomNonceSource,
+    create_nonce_source,
+)
+
+
+@pytest.mark.parametrize("scheme", ["random", "counter"])
+def test_no_nonce_repeats(scheme):
+    source = create_nonce_source(scheme)
+    nonces = [source.next_nonce() for _ in range(50_000)] + source.take(50_000)
+    assert all(len(nonce) == 12 for nonce in nonces)
+    assert len(set(nonces)) == len(nonces)
+
+
+def test_random_source_uses_block_rng(monkeypatch):
+    calls = []
+
+    def fake_random_bytes(size):
+        calls.append(size)
+        return bytes(range(256)) * (size // 256) + bytes(size % 256)
+
+    monkeypatch.setattr(
+        "piicrypto.helpers.nonce_source.get_random_bytes", fake_random_bytes
+    )
+    source = RandomNonceSource(block_size=100)
+    for _ in range(250):
+        source.next_nonce()
+    assert calls == [1200, 1200, 1200]
+
+
+def test_counter_partitions_do_not_overlap():
+    source = CounterNonceSource()
+    workers = [source.partition(index, 4) for index in range(4)]
+    nonces = [nonce for worker in workers for nonce in worker.take(10_000)]
+    assert len(set(nonces)) == len(nonces)
+    assert all(nonce[:8] == source.prefix for nonce in nonces)
+
+
+def test_counter_exhaustion_raises():
+    source = CounterNonceSource(start=CounterNonceSource.COUNTER_LIMIT - 1)
+    source.next_nonce()
+    with pytest.raises(OverflowError):
+        source.next_nonce()
+
+
+def test_unknown_scheme():
+    with pytest.raises(ValueError):
+        create_nonce_source("sequential")
+
+
+def test_scheme_recorded_in_metadata(tmp_path, sample_csv, provider_config):
+    out = tmp_path / "out.csv"
+    encrypt_csv_file(
+        str(sample_csv),
+        str(out),
+        "local",
+        provider_config,
+        create_metadata=True,
+        nonce_scheme="counter",
+    )
+    metadata = json.loads((tmp_path / "out.csv.metadata.json").read_text())
+    assert metadata["nonce_scheme"]["scheme"] == "counter"
+    assert "prefix" in metadata["nonce_scheme"]
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from piicrypto.encrypt_decrypt.decryptor import decrypt_csv_file
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.helpers.pipeline import run_pipeline
+
+
+def test_pipeline_preserves_order():
+    written = []
+    run_pipeline(
+        ([i, i + 1] for i in range(0, 100, 2)),
+        lambda block: [x * 10 for x in block],
+        written.extend,
+        queue_depth=2,
+    )
+    assert written == [x * 10 for x in range(100)]
+
+
+def test_pipeline_applies_backpressure():
+    produced = []
+    snapshots = []
+
+    def blocks():
+        for i in range(20):
+            produced.append(i)
+            yield [i]
+
+    def sink(block):
+        if block == [0]:
+            threading.Event().wait(0.3)
+            snapshots.append(len(produced))
+
+    run_pipeline(blocks(), lambda block: block, sink, queue_depth=2)
+    # one block in each stage plus two full queues
+    assert snapshots[0] <= 2 * 2 + 3
+    assert len(produced) == 20
+
+
+@pytest.mark.parametrize("stage", ["reader", "transform", "sink"])
+def test_pipeline_propagates_errors(stage):
+    def blocks():
+        for i in range(10):
+            if stage == "reader" and i == 5:
+                raise RuntimeError("reader failed")
+            yield [i]
+
+    def transform(block):
+        if stage == "transform" and block == [5]:
+            raise RuntimeError("transform failed")
+        return block
+
+    def sink(block):
+        if stage == "sink" and block == [5]:
+            raise RuntimeError("sink failed")
+
+    with pytest.raises(RuntimeError, match=f"{stage} failed"):
+        run_pipeline(blocks(), transform, sink, queue_depth=1)
+
+
+def test_pipeline_roundtrip_csv(tmp_path, sample_csv, provider_config):
+    with open(sample_csv, "a") as f:
+        for i in range(3, 500):
+            f.write(f"{i},Person {i},{i:03d}-00-0000,Street {i}\n")
+    enc = tmp_path / "out.enc.csv"
+    dec = tmp_path / "out.dec.csv"
+
+    encrypt_csv_file(
+        str(sample_csv),
+        str(enc),
+        "local",
+        provider_config,
+        pipeline=True,
+        block_size=64,
+        queue_depth=2,
+    )
+    decrypt_csv_file(str(enc), str(dec), "local", provider_config)
+    assert len(enc.read_text().splitlines()) == 500
+    dec_lines = dec.read_text().splitlines()
+    src_lines = sample_csv.read_text().splitlines()
+    assert dec_lines[0] == src_lines[0] + ",row_iv"
+    assert [line.rsplit(",", 1)[0] for line in dec_lines[1:]] == src_lines[1:]
@@ -20,3 +20,4 @@ def test_provider_config_parser(provider_config):
     assert address_field.alias == "address"
     assert address_field.encrypt is False
     assert address_field.key_id is None
+    assert parser.get_key_groups() == {"default": ["Social Security Number", "Name"]}
@@ -0,0 +1,90 @@
+import csv
+import json
+
+from piicrypto.encrypt_decrypt.encryptor import encrypt_csv_file
+from piicrypto.helpers.quarantine import QuarantineWriter
+
+
+def test_quarantine_writer_csv_buffers(tmp_path):
+    path = tmp_path / "rejected.csv"
+    writer = QuarantineWriter(
+        str(path), ["id", "ssn"], buffer_rows=2, include_rows=True
+    )
+    writer.add(3, [("ssn", "string_pattern_mismatch")], {"id": "3", "ssn": "x"})
+    writer.add(5, [("id", "int_parsing"), ("ssn", "required")], {"id": "a"})
+    writer.close()
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0] == {
+        "row_number": "3",
+        "errors": "ssn:string_pattern_mismatch",
+        "id": "3",
+        "ssn": "x",
+    }
+    assert rows[1]["errors"] == "id:int_parsing;ssn:required"
+    assert writer.summary()["rejected_rows"] == 2
+
+
+def test_quarantine_writer_jsonl(tmp_path):
+    path = tmp_path / "rejected.jsonl"
+    with QuarantineWriter(str(path), ["id"], include_rows=True) as writer:
+        writer.add(1, [("id", "greater_than")], {"id": "0"})
+    record = json.loads(path.read_text())
+    assert record == {
+        "row_number": 1,
+        "errors": ["id:greater_than"],
+        "row": {"id": "0"},
+    }
+
+
+def test_quarantine_writer_omits_rows_by_default(tmp_path):
+    csv_path = tmp_path / "rejected.csv"
+    jsonl_path = tmp_path / "rejected.jsonl"
+    for path in (csv_path, jsonl_path):
+        with QuarantineWriter(str(path), ["id", "ssn"]) as writer:
+            writer.add(2, [("ssn", "required")], {"id": "2", "ssn": "123-45-6789"})
+    assert "123-45-6789" not in csv_path.read_text()
+    with open(csv_path) as f:
+        assert list(csv.DictReader(f)) == [
+            {"row_number": "2", "errors": "ssn:required"}
+        ]
+    assert json.loads(jsonl_path.read_text()) == {
+        "row_number": 2,
+        "errors": ["ssn:required"],
+    }
+
+
+def test_encrypt_quarantines_rejected_rows(
+    tmp_path, sample_csv, provider_config, validation_schema_json, monkeypatch
+):
+    with open(sample_csv, "a") as f:
+        f.write("3,Grace Hopper,not-an-ssn,New York\n")
+        f.write("0,,123-45-6789,Paris\n")
+    monkeypatch.setattr(
+        "piicrypto.helpers.row_validator.validate_row",
+        lambda *args: (_ for _ in ()).throw(AssertionError("logged per error")),
+    )
+    enc = tmp_path / "out.csv"
+    rejected = tmp_path / "rejected.csv"
+
+    encrypt_csv_file(
+        str(sample_csv),
+        str(enc),
+        "local",
+        provider_config,
+        create_metadata=True,
+        validate_json=str(validation_schema_json),
+        quarantine_file=str(rejected),
+        quarantine_rows=True,
+    )
+    assert len(enc.read_text().splitlines()) == 3
+    with open(rejected) as f:
+        rows = list(csv.DictReader(f))
+    assert [row["row_number"] for row in rows] == ["2", "3"]
+    assert rows[0]["errors"] == "Social Security Number:string_pattern_mismatch"
+    assert rows[0]["Name"] == "Grace Hopper"
+    assert set(rows[1]["errors"].split(";")) == {"id:greater_than", "Name:required"}
+
+    metadata = json.loads((tmp_path / "out.csv.metadata.json").read_text())
+    assert metadata["quarantine"]["rejected_rows"] == 2
+    assert metadata["quarantine"]["error_counts"]["id:greater_than"] == 1
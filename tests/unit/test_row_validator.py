@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from piicrypto.helpers.row_validator import CompiledRowValidator
+from piicrypto.helpers.utils import validate_row
+
+
+@pytest.fixture
+def full_schema_json(tmp_path):
+    schema = {
+        "id": {"type": "int", "gt": 0, "required": True},
+        "name": {"type": "str", "min_length": 2, "max_length": 5, "required": False},
+        "ssn": {"type": "str", "regex": "^[0-9]{3}$", "required": True},
+        "dob": {"type": "date", "format": "%Y-%m-%d", "required": False},
+        "country": {"type": "enum", "values": ["US", "CA"], "required": False},
+    }
+    p = tmp_path / "schema.json"
+    p.write_text(json.dumps(schema))
+    return p
+
+
+ROWS = [
+    {"id": "1", "ssn": "123"},
+    {"id": " 7 ", "ssn": "123", "name": "", "dob": "", "country": ""},
+    {"id": "1_000", "ssn": "123"},
+    {"id": "0", "ssn": "123"},
+    {"id": "x", "ssn": "123"},
+    {"id": "٣", "ssn": "123"},
+    {"id": "", "ssn": "123"},
+    {"id": "1", "ssn": "1234"},
+    {"id": "1", "ssn": ""},
+    {"id": "1"},
+    {"id": "1", "ssn": "123", "name": "a"},
+    {"id": "1", "ssn": "123", "name": "abcdef"},
+    {"id": "1", "ssn": "123", "dob": "1990-13-01"},
+    {"id": "1", "ssn": "123", "dob": "1990-12-01"},
+    {"id": "1", "ssn": "123", "country": "UK"},
+    {"id": "1", "ssn": "123", "country": "CA"},
+]
+
+
+def test_block_matches_pydantic(full_schema_json):
+    validator = CompiledRowValidator(str(full_schema_json))
+    expected = [validate_row(row, validator.model) for row in ROWS]
+    assert validator.validate_block(ROWS) == expected
+    assert expected.count(True) == 5
+
+
+def test_check_block_error_codes(full_schema_json):
+    validator = CompiledRowValidator(str(full_schema_json))
+    failures = validator.check_block(ROWS)
+    assert 0 not in failures and 1 not in failures
+    assert failures[3] == [("id", "greater_than")]
+    assert failures[9] == [("ssn", "missing")]
+    assert failures[12] == [("dob", "date_format")]
+    assert failures[14] == [("country", "enum_value")]
+
+
+def test_pydantic_only_runs_for_rejected_rows(full_schema_json, monkeypatch):
+    validator = CompiledRowValidator(str(full_schema_json))
+    seen = []
+    monkeypatch.setattr(
+        "piicrypto.helpers.row_validator.validate_row",
+        lambda row, model: seen.append(row) or False,
+    )
+    validator.validate_block(ROWS[:2] + ROWS[3:4])
+    assert seen == [ROWS[3]]
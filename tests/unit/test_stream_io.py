@@ -0,0 +1,33 @@
+import io
+
+from piicrypto.helpers.stream_io import TrackedLineReader
+
+
+class GrowingFile(io.BytesIO):
+    """
+    File that gets more bytes appended while its last line is being read.
+    """
+
+    def readline(self):
+        line = super().readline()
+        if line and not line.endswith(b"\n"):
+            position = self.tell()
+            self.write(b"d\n")
+            self.seek(position)
+        return line
+
+
+def test_complete_lines_only_reads_final_line_at_end_of_input():
+    lines = TrackedLineReader(io.BytesIO(b"a\nbc"), complete_lines_only=True)
+    assert list(lines) == ["a\n", "bc"]
+    assert lines.offset == 4
+    assert lines.skipped_bytes == 0
+
+
+def test_complete_lines_only_skips_line_still_being_written():
+    raw = GrowingFile(b"a\nbc")
+    lines = TrackedLineReader(raw, complete_lines_only=True)
+    assert list(lines) == ["a\n"]
+    assert lines.offset == 2
+    assert lines.skipped_bytes == 2
+    assert raw.tell() == 2